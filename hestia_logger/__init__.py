@@ -12,9 +12,21 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 """
 
 # Define public API for `hestia_logger`
-__all__ = ["get_logger", "LOG_LEVEL", "ELASTICSEARCH_HOST", "log_execution"]
+__all__ = [
+    "get_logger",
+    "set_level",
+    "reload_config",
+    "shutdown",
+    "LOG_LEVEL",
+    "ELASTICSEARCH_HOST",
+    "log_execution",
+    "stats",
+    "prometheus_text",
+]
 
 # Expose only necessary functions/classes for clean imports
-from .core.custom_logger import get_logger
+from .core.custom_logger import get_logger, set_level, shutdown
+from .core.runtime_config import reload_config
 from .core.config import LOG_LEVEL, ELASTICSEARCH_HOST
 from .decorators.decorators import log_execution
+from .core.metrics import stats, prometheus_text
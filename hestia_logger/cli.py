@@ -0,0 +1,169 @@
+"""
+HESTIA Logger - Command Line Interface.
+
+Usage:
+    hestia-logger cat FILE [FILE ...]    Stream binary logs as JSON lines
+    hestia-logger query FILE [--since TS] [--until TS] [--where KEY=VALUE ...]
+                                         Query a JSON log and its backups
+    hestia-logger flight PATH [-n N]     Recover records from flight recorder(s)
+    hestia-logger loadgen [OPTIONS]      Load test the logging pipeline
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from . import loadgen
+from .core.flight_recorder import read_flight_records
+from .handlers.binary_handler import iter_binary_records
+from .reader import query_logs
+
+__all__ = ["main"]
+
+
+def _open_binary(path):
+    if path == "-":
+        return sys.stdin.buffer
+    return open(path, "rb")
+
+
+def _cmd_cat(args):
+    out = sys.stdout
+    for path in args.files:
+        stream = _open_binary(path)
+        try:
+            for record in iter_binary_records(stream):
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    out.flush()
+    return 0
+
+
+def _cmd_query(args):
+    where = {}
+    for condition in args.where:
+        key, separator, value = condition.partition("=")
+        if not separator:
+            raise SystemExit(
+                f"Invalid --where condition (expected KEY=VALUE): {condition}"
+            )
+        where[key] = value
+    out = sys.stdout
+    for entry in query_logs(
+        args.file, args.since, args.until, where, include_backups=not args.no_backups
+    ):
+        out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    out.flush()
+    return 0
+
+
+def _flight_files(directory):
+    # One ring per process (flight.<pid>.rec) plus the rings they replaced
+    paths = [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith((".rec", ".rec.1"))
+    ]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def _cmd_flight(args):
+    out = sys.stdout
+    if os.path.isdir(args.file):
+        paths = _flight_files(args.file)
+    else:
+        paths = [args.file]
+    for path in paths:
+        try:
+            entries = read_flight_records(path, args.last)
+        except ValueError:
+            if len(paths) == 1:
+                raise
+            continue  # Not a flight recorder file
+        for entry in entries:
+            if len(paths) > 1:
+                entry = {"file": os.path.basename(path), **entry}
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    out.flush()
+    return 0
+
+
+def _cmd_loadgen(args):
+    options = vars(args).copy()
+    del options["command"], options["handler"]
+    report = loadgen.run(options)
+    print(json.dumps(report) if args.json else loadgen.format_report(report))
+    return 1 if report["failed_processes"] else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="hestia-logger", description="HESTIA Logger command line tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cat = commands.add_parser("cat", help="Stream binary log files as JSON lines.")
+    cat.add_argument("files", nargs="+", help="Binary log files ('-' for stdin).")
+    cat.set_defaults(handler=_cmd_cat)
+
+    query = commands.add_parser(
+        "query", help="Query a JSON log file (and its rotated backups)."
+    )
+    query.add_argument("file", help="JSON-lines log file, e.g. logs/app.log.")
+    query.add_argument("--since", help="Earliest ISO-8601 timestamp (prefix).")
+    query.add_argument("--until", help="Latest ISO-8601 timestamp (prefix).")
+    query.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Only records whose KEY equals VALUE (repeatable).",
+    )
+    query.add_argument(
+        "--no-backups", action="store_true", help="Skip rotated backups."
+    )
+    query.set_defaults(handler=_cmd_query)
+
+    flight = commands.add_parser(
+        "flight", help="Recover the records of a flight recorder file."
+    )
+    flight.add_argument(
+        "file",
+        help="Flight recorder file (e.g. logs/flight.4242.rec.1) or a directory "
+        "to read every process's recorder in it.",
+    )
+    flight.add_argument(
+        "-n",
+        "--last",
+        type=int,
+        help="Only the last N records of each file (default: all).",
+    )
+    flight.set_defaults(handler=_cmd_flight)
+
+    load = commands.add_parser(
+        "loadgen", help="Drive the logging pipeline with synthetic load."
+    )
+    loadgen.add_arguments(load)
+    load.set_defaults(handler=_cmd_loadgen)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Output was closed early (e.g. piped into `head`); silence the
+        # interpreter's final flush of stdout
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,11 @@ import logging
 import json
 import queue
 import threading
+import time
 
 from ..internal_logger import hestia_internal_logger
 from ..core.custom_logger import JSONFormatter
+from ..core.metrics import register_sink
 
 __all__ = ["AsyncFileLogger"]
 
@@ -28,6 +30,7 @@ class AsyncFileLogger(logging.Handler):
         self.formatter = JSONFormatter()
         self._queue: queue.Queue[logging.LogRecord | None] = queue.Queue()
         self._stop_event = threading.Event()
+        self.metrics = register_sink(f"async_file:{log_file}", "file", self._queue)
         self._worker = threading.Thread(target=self._process_logs, daemon=True)
         self._worker.start()
 
@@ -42,15 +45,22 @@ class AsyncFileLogger(logging.Handler):
                 self._queue.task_done()
                 break
 
+            self.metrics.observe_queue()
+            started = time.perf_counter()
             try:
                 log_entry = self.format(record)
                 if isinstance(log_entry, str):
                     log_entry = json.loads(log_entry)
-                message = json.dumps(log_entry, ensure_ascii=False)
+                message = json.dumps(log_entry, ensure_ascii=False) + "\n"
                 with open(self.log_file, mode="a", encoding="utf-8") as f:
-                    f.write(message + "\n")
+                    f.write(message)
                     f.flush()
+                self.metrics.record_write(
+                    1, len(message.encode("utf-8")), time.perf_counter() - started
+                )
             except Exception as e:  # pragma: no cover - best effort logging
+                self.metrics.write_errors += 1
+                self.metrics.records_dropped += 1
                 hestia_internal_logger.error(
                     f"ERROR WRITING TO FILE {self.log_file}: {e}"
                 )
@@ -61,6 +71,7 @@ class AsyncFileLogger(logging.Handler):
         try:
             self._queue.put_nowait(record)
         except queue.Full:
+            self.metrics.records_dropped += 1
             hestia_internal_logger.warning(
                 f"AsyncFileLogger queue full, dropping log for {self.log_file}"
             )
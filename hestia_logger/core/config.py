@@ -87,10 +87,15 @@ if not os.access(LOGS_DIR, os.W_OK):
     os.makedirs(LOGS_DIR, exist_ok=True)
 
 LOG_FILE_PATH_APP = os.path.join(LOGS_DIR, "app.log")
+LOG_FILE_PATH_APP_BINARY = os.path.join(LOGS_DIR, "app.hlog")
 LOG_FILE_PATH_INTERNAL = os.path.join(LOGS_DIR, "hestia_logger_internal.log")
 LOG_FILE_ENCODING = os.getenv("LOG_FILE_ENCODING", "utf-8")
 LOG_FILE_ENCODING_ERRORS = os.getenv("LOG_FILE_ENCODING_ERRORS", "backslashreplace")
 
+# Where records go: "file" (app.log + per-service logs) or "stdout" (JSON
+# lines on stdout for container runtimes; file sinks are turned off)
+LOG_OUTPUT = os.getenv("LOG_OUTPUT", "file").strip().lower()
+
 # Safe Conversion of `LOG_LEVEL`
 LOG_LEVEL_STR = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_LEVELS = {
@@ -108,9 +113,155 @@ ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "").strip()
 # Enable or Disable Internal Logging
 ENABLE_INTERNAL_LOGGER = os.getenv("ENABLE_INTERNAL_LOGGER", "false").lower() == "true"
 
+# Reloadable settings (HESTIA_LEVELS, LOG_WRITER_BATCH_SIZE, LOG_FILE_FORMAT,
+# compression, sparse index and Fluent Forward) are parsed by
+# `runtime_config`, which also reads LOG_LEVEL and the rotation size/count
+# below for their defaults
+
 # Log Rotation Settings
 LOG_ROTATION_TYPE = os.getenv("LOG_ROTATION_TYPE", "size")
 LOG_ROTATION_WHEN = os.getenv("LOG_ROTATION_WHEN", "midnight")
 LOG_ROTATION_INTERVAL = int(os.getenv("LOG_ROTATION_INTERVAL", 1))
 LOG_ROTATION_BACKUP_COUNT = int(os.getenv("LOG_ROTATION_BACKUP_COUNT", 5))
 LOG_ROTATION_MAX_BYTES = int(os.getenv("LOG_ROTATION_MAX_BYTES", 10 * 1024 * 1024))
+
+# Serialization Pipeline Settings
+# Where file-sink records are formatted: "worker" (writer thread),
+# "producer" (calling thread) or "pool" (shared formatter threads)
+LOG_SERIALIZATION_MODE = os.getenv("LOG_SERIALIZATION_MODE", "worker").strip().lower()
+LOG_FORMATTER_POOL_SIZE = int(os.getenv("LOG_FORMATTER_POOL_SIZE", 2))
+
+# Deduplication Settings
+# Window (seconds) in which repeated records are collapsed; 0 disables the filter
+LOG_DEDUP_WINDOW = float(os.getenv("LOG_DEDUP_WINDOW", 0))
+LOG_DEDUP_MAX_KEYS = int(os.getenv("LOG_DEDUP_MAX_KEYS", 1024))
+
+# Rate Limiting Settings
+# Records/sec allowed below ERROR across all loggers; 0 disables the global limit
+LOG_GLOBAL_RATE_LIMIT = float(os.getenv("LOG_GLOBAL_RATE_LIMIT", 0))
+LOG_RATE_LIMIT_REPORT_INTERVAL = float(os.getenv("LOG_RATE_LIMIT_REPORT_INTERVAL", 10))
+
+# Tail Sampling Settings
+# Buffer records below the logger level per request (keyed by the middleware
+# `request_id`) and only write them when the request fails or returns a 5xx
+LOG_TAIL_SAMPLING = os.getenv("LOG_TAIL_SAMPLING", "false").lower() == "true"
+LOG_TAIL_SAMPLING_LEVEL = LOG_LEVELS.get(
+    os.getenv("LOG_TAIL_SAMPLING_LEVEL", "DEBUG").upper(), logging.DEBUG
+)
+LOG_TAIL_BUFFER_SIZE = int(os.getenv("LOG_TAIL_BUFFER_SIZE", 200))
+LOG_TAIL_MAX_RECORDS = int(os.getenv("LOG_TAIL_MAX_RECORDS", 10000))
+
+# Runtime Reload Settings (see `hestia_logger.core.runtime_config`)
+# Reload levels, rotation and sink settings on SIGHUP from the environment
+# overlaid with LOG_CONFIG_FILE (default: the nearest `.env`)
+LOG_RELOAD_ON_SIGHUP = os.getenv("LOG_RELOAD_ON_SIGHUP", "false").lower() == "true"
+LOG_CONFIG_FILE = os.getenv("LOG_CONFIG_FILE", "").strip()
+
+# Structured Exception Settings
+# Frames kept per exception (outermost frames are dropped first) and the
+# number of distinct code paths whose rendered frames are cached
+LOG_EXC_MAX_FRAMES = int(os.getenv("LOG_EXC_MAX_FRAMES", 50))
+LOG_EXC_CACHE_SIZE = int(os.getenv("LOG_EXC_CACHE_SIZE", 256))
+
+# Caller Info Settings
+# module/filename/function/line on each record; "false" skips the frame lookup
+LOG_CALLER_INFO = os.getenv("LOG_CALLER_INFO", "true").lower() == "true"
+
+# Redaction Settings
+# Keys whose values are masked (case-insensitive, globs allowed) and value
+# patterns masked inside strings: built-in names (email, bearer, card) or
+# regexes. No patterns by default: only values under sensitive keys are masked
+LOG_REDACT_KEYS = [
+    key.strip()
+    for key in os.getenv(
+        "LOG_REDACT_KEYS",
+        "password,token,secret,apikey,api_key,authorization,cookie,set-cookie",
+    ).split(",")
+    if key.strip()
+]
+LOG_REDACT_PATTERNS = [
+    pattern.strip()
+    for pattern in os.getenv("LOG_REDACT_PATTERNS", "").split(",")
+    if pattern.strip()
+]
+LOG_REDACT_MASK = os.getenv("LOG_REDACT_MASK", "***")
+LOG_REDACT_IN_FORMATTER = os.getenv("LOG_REDACT_IN_FORMATTER", "false").lower() == "true"
+
+# Priority Lane Settings
+# When set (e.g. WARNING), records at or above LOG_PRIORITY_LEVEL skip the
+# queued backlog of lower levels, so they can be written out of order; unset
+# keeps every sink in call order. With LOG_CRITICAL_WRITE_THROUGH the caller
+# of a CRITICAL record waits (up to LOG_WRITE_THROUGH_TIMEOUT seconds) until
+# it is written
+LOG_PRIORITY_LEVEL = LOG_LEVELS.get(os.getenv("LOG_PRIORITY_LEVEL", "").strip().upper())
+LOG_CRITICAL_WRITE_THROUGH = (
+    os.getenv("LOG_CRITICAL_WRITE_THROUGH", "false").lower() == "true"
+)
+LOG_WRITE_THROUGH_TIMEOUT = float(os.getenv("LOG_WRITE_THROUGH_TIMEOUT", 5))
+
+# Shutdown Settings
+# One deadline for draining every sink at exit (or SIGTERM), and the bound on
+# a single handler flush
+LOG_SHUTDOWN_TIMEOUT = float(os.getenv("LOG_SHUTDOWN_TIMEOUT", 5))
+LOG_FLUSH_TIMEOUT = float(os.getenv("LOG_FLUSH_TIMEOUT", 10))
+# LOG_SHUTDOWN_ON_SIGTERM=true replaces the process's SIGTERM handler at import
+# (the previous one is chained); off by default so frameworks keep theirs
+LOG_SHUTDOWN_ON_SIGTERM = (
+    os.getenv("LOG_SHUTDOWN_ON_SIGTERM", "false").lower() == "true"
+)
+
+# Durability Settings
+# When file sinks fsync: "none", "interval" (every LOG_FSYNC_INTERVAL_MS) or
+# "group_commit" (also whenever durable producers wait); per sink with
+# "interval,audit=group_commit"
+LOG_DURABILITY = os.getenv("LOG_DURABILITY", "none").strip()
+LOG_FSYNC_INTERVAL_MS = int(os.getenv("LOG_FSYNC_INTERVAL_MS", 1000))
+
+# Flight Recorder Settings
+# Memory-mapped ring of the latest records at every level, kept for crash
+# forensics, one file per process (`{pid}` in the path, also after fork);
+# a clean exit removes it, and only the newest LOG_FLIGHT_RECORDER_KEEP rings
+# of exited (crashed) processes are kept. LOG_FLIGHT_RECORDER_DUMP_SIGNAL
+# (e.g. SIGUSR2) dumps the last LOG_FLIGHT_RECORDER_DUMP_RECORDS records to a
+# JSON-lines file
+LOG_FLIGHT_RECORDER = os.getenv("LOG_FLIGHT_RECORDER", "false").lower() == "true"
+LOG_FLIGHT_RECORDER_PATH = os.getenv(
+    "LOG_FLIGHT_RECORDER_PATH", os.path.join(LOGS_DIR, "flight.{pid}.rec")
+)
+LOG_FLIGHT_RECORDER_SIZE_KB = int(os.getenv("LOG_FLIGHT_RECORDER_SIZE_KB", 4096))
+LOG_FLIGHT_RECORDER_KEEP = int(os.getenv("LOG_FLIGHT_RECORDER_KEEP", 8))
+LOG_FLIGHT_RECORDER_DUMP_SIGNAL = os.getenv("LOG_FLIGHT_RECORDER_DUMP_SIGNAL", "").strip()
+LOG_FLIGHT_RECORDER_DUMP_RECORDS = int(os.getenv("LOG_FLIGHT_RECORDER_DUMP_RECORDS", 1000))
+
+# HTTP Client Settings
+# Outbound calls made through the instrumented requests adapter / httpx
+# transports always feed the per-host latency histograms; successful (<400)
+# calls are logged to `hestia_requests` at this sample rate
+LOG_HTTP_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_HTTP_SUCCESS_SAMPLE_RATE", 1.0))
+
+# SQL Instrumentation Settings
+# Engines passed to `instrument_engine()` log statements slower than
+# LOG_SQL_SLOW_MS (plus a LOG_SQL_SAMPLE_RATE sample of the rest) and emit
+# per-fingerprint aggregates every LOG_SQL_REPORT_INTERVAL seconds (0: never)
+LOG_SQL_SLOW_MS = float(os.getenv("LOG_SQL_SLOW_MS", 200))
+LOG_SQL_SAMPLE_RATE = float(os.getenv("LOG_SQL_SAMPLE_RATE", 0.0))
+LOG_SQL_REPORT_INTERVAL = float(os.getenv("LOG_SQL_REPORT_INTERVAL", 60))
+LOG_SQL_REPORT_TOP = int(os.getenv("LOG_SQL_REPORT_TOP", 20))
+LOG_SQL_FINGERPRINT_CACHE = int(os.getenv("LOG_SQL_FINGERPRINT_CACHE", 1024))
+
+# Profiling Settings
+# Calls sampled by `log_execution(profile_sample_rate=...,
+# trace_malloc_sample_rate=...)` report their top LOG_PROFILE_TOP functions /
+# allocation sites; per-function aggregates are dumped as .pstats files to
+# LOG_PROFILE_DIR every LOG_PROFILE_DUMP_INTERVAL seconds (0: never)
+LOG_PROFILE_TOP = int(os.getenv("LOG_PROFILE_TOP", 10))
+LOG_PROFILE_DUMP_INTERVAL = float(os.getenv("LOG_PROFILE_DUMP_INTERVAL", 300))
+LOG_PROFILE_DIR = os.getenv("LOG_PROFILE_DIR", os.path.join(LOGS_DIR, "profiles"))
+LOG_TRACEMALLOC_FRAMES = int(os.getenv("LOG_TRACEMALLOC_FRAMES", 1))
+
+# Span Settings
+# `log_execution` links nested calls into traces (trace/span/parent ids);
+# with LOG_SPAN_TREE (or `span_tree=True`) a root call buffers its whole call
+# tree and emits it as one record, keeping at most LOG_SPAN_TREE_MAX_SPANS
+LOG_SPAN_TREE = os.getenv("LOG_SPAN_TREE", "false").lower() == "true"
+LOG_SPAN_TREE_MAX_SPANS = int(os.getenv("LOG_SPAN_TREE_MAX_SPANS", 1000))
@@ -7,15 +7,35 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 """
 
 import os
+import sys
+import copy
+import collections
 import logging
 from logging import LoggerAdapter
 import queue
 import threading
+import time
 import atexit
-from logging.handlers import RotatingFileHandler, QueueHandler
+import signal
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
 
 from ..internal_logger import hestia_internal_logger
 from ..handlers import console_handler
+from ..handlers.batch_file_handler import BatchRotatingFileHandler, DURABILITY_MODES
+from ..handlers.fluent_handler import FluentForwardHandler
+from ..handlers.binary_handler import BinaryLogHandler
+from ..handlers.indexed_handler import IndexedRotatingFileHandler
+from ..handlers.stdout_handler import StdoutJSONHandler
+from ..handlers.compressed_handler import (
+    CompressedRotatingFileHandler,
+    COMPRESSION_SUFFIXES,
+)
+from ..filters.dedup_filter import DeduplicationFilter
+from ..filters.rate_limiter import RateLimiter
+from ..core.metrics import register_sink
+from ..core.tail_sampling import current_buffer
 from ..core.formatters import JSONFormatter
 from ..core.config import (
     LOGS_DIR,
@@ -23,20 +43,49 @@ from ..core.config import (
     LOG_FILE_ENCODING,
     LOG_FILE_ENCODING_ERRORS,
     LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_RELOAD_ON_SIGHUP,
+    LOG_CONFIG_FILE,
     LOG_ROTATION_TYPE,
     LOG_ROTATION_WHEN,
     LOG_ROTATION_INTERVAL,
-    LOG_ROTATION_BACKUP_COUNT,
-    LOG_ROTATION_MAX_BYTES,
     ENVIRONMENT,
     HOSTNAME,
     APP_VERSION,
+    LOG_SERIALIZATION_MODE,
+    LOG_FORMATTER_POOL_SIZE,
+    LOG_DEDUP_WINDOW,
+    LOG_DEDUP_MAX_KEYS,
+    LOG_GLOBAL_RATE_LIMIT,
+    LOG_RATE_LIMIT_REPORT_INTERVAL,
+    LOG_FILE_PATH_APP_BINARY,
+    LOG_OUTPUT,
+    LOG_CALLER_INFO,
+    LOG_PRIORITY_LEVEL,
+    LOG_CRITICAL_WRITE_THROUGH,
+    LOG_WRITE_THROUGH_TIMEOUT,
+    LOG_FLUSH_TIMEOUT,
+    LOG_SHUTDOWN_TIMEOUT,
+    LOG_SHUTDOWN_ON_SIGTERM,
+    LOG_DURABILITY,
+    LOG_FSYNC_INTERVAL_MS,
+    LOG_FLIGHT_RECORDER,
+    LOG_FLIGHT_RECORDER_PATH,
+    LOG_FLIGHT_RECORDER_SIZE_KB,
+    LOG_FLIGHT_RECORDER_KEEP,
+    LOG_FLIGHT_RECORDER_DUMP_SIGNAL,
+    LOG_FLIGHT_RECORDER_DUMP_RECORDS,
 )
+from ..core import runtime_config
+from ..core.level_table import LevelTable
+from ..core.flight_recorder import FlightRecorder, install_dump_signal, prune_rings
 
 ENABLE_INTERNAL_LOGGER = os.getenv("ENABLE_INTERNAL_LOGGER", "true").lower() == "true"
 
 # Ensure previous async workers are stopped if the module is reloaded
-for _queue_ref, _thread_ref, _handler_ref in list(globals().get("_ASYNC_WORKERS", [])):
+for _queue_ref, _thread_ref, _handler_ref, *_ in list(
+    globals().get("_ASYNC_WORKERS", [])
+):
     try:
         _queue_ref.put_nowait(None)
     except Exception:
@@ -51,53 +100,260 @@ for _queue_ref, _thread_ref, _handler_ref in list(globals().get("_ASYNC_WORKERS"
     except Exception:
         pass
 
+if globals().get("_FORMATTER_POOL") is not None:
+    _FORMATTER_POOL.shutdown(wait=False)
+
 _LOGGERS = {}
 _APP_LOG_HANDLER = None
 _RESERVED_APP_NAME = "app"
 _ASYNC_WORKERS = []
 _SERVICE_HANDLERS = {}
+_BASE_LEVELS = {}  # name -> level requested in code (None follows `LOG_LEVEL`)
+_LEVEL_TIMERS = {}  # name -> (timer, level to restore) for temporary levels
+_LEVEL_TABLE = LevelTable(runtime_config.current().HESTIA_LEVELS)
+_OVERRIDDEN_LEVELS = {}  # unmanaged logger name -> level before `HESTIA_LEVELS`
+_FORMATTER_POOL = None
+_SERIALIZATION_MODES = ("worker", "producer", "pool")
+# In stdout mode every record goes to the JSON `app` sink only
+_SERVICE_FILE_SINKS = LOG_OUTPUT != "stdout"
+_DEDUP_FILTER = (
+    DeduplicationFilter(window=LOG_DEDUP_WINDOW, max_keys=LOG_DEDUP_MAX_KEYS)
+    if LOG_DEDUP_WINDOW > 0
+    else None
+)
+_GLOBAL_RATE_LIMITER = (
+    RateLimiter(LOG_GLOBAL_RATE_LIMIT, report_interval=LOG_RATE_LIMIT_REPORT_INTERVAL)
+    if LOG_GLOBAL_RATE_LIMIT > 0
+    else None
+)
 
 
-def _stop_async_workers():
-    for log_queue, worker_thread, handler in _ASYNC_WORKERS:
+def _join_queue(log_queue, timeout):
+    """
+    `Queue.join()` bounded by `timeout` seconds; True if everything was processed.
+    """
+    deadline = time.monotonic() + timeout
+    with log_queue.all_tasks_done:
+        while log_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            log_queue.all_tasks_done.wait(remaining)
+    return True
+
+
+def shutdown(timeout: float = None) -> dict:
+    """
+    Drains and closes every async sink under one deadline.
+
+    All writer threads are signalled at once and drain in parallel; a sink
+    still writing when `timeout` (default `LOG_SHUTDOWN_TIMEOUT`) runs out
+    is abandoned. Returns `{"flushed", "abandoned", "timed_out", "elapsed"}`:
+    the records the sinks wrote during shutdown, the records abandoned sinks
+    never wrote (including the batch in flight), and the names of those sinks.
+    """
+    timeout = LOG_SHUTDOWN_TIMEOUT if timeout is None else timeout
+    started = time.monotonic()
+    deadline = started + timeout
+
+    for timer, _ in list(_LEVEL_TIMERS.values()):
+        timer.cancel()
+    _LEVEL_TIMERS.clear()
+
+    if _DEDUP_FILTER is not None:
+        _DEDUP_FILTER.flush()
+
+    workers = list(_ASYNC_WORKERS)
+    _ASYNC_WORKERS.clear()
+    written = []
+    for log_queue, worker_thread, handler, metrics in workers:
+        written.append(metrics.records_written)
         try:
             log_queue.put_nowait(None)
         except Exception:
             pass
 
-    for log_queue, worker_thread, handler in _ASYNC_WORKERS:
-        try:
-            worker_thread.join(timeout=2)
-        except Exception:
-            pass
+    flushed = abandoned = 0
+    timed_out = []
+    for (log_queue, worker_thread, handler, metrics), before in zip(workers, written):
+        worker_thread.join(max(0.0, deadline - time.monotonic()))
+        flushed += metrics.records_written - before
+        if worker_thread.is_alive():
+            # Queued or taken but unwritten (bar the sentinel): the worker
+            # marks a batch done only once it is written
+            abandoned += max(0, log_queue.unfinished_tasks - 1)
+            timed_out.append(_sink_name(handler))
+            continue
         try:
             handler.flush()
             handler.close()
         except Exception:
             pass
-    _ASYNC_WORKERS.clear()
+
+    global _FORMATTER_POOL
+    if _FORMATTER_POOL is not None:
+        _FORMATTER_POOL.shutdown(wait=not timed_out, cancel_futures=bool(timed_out))
+        _FORMATTER_POOL = None
+
+    report = {
+        "flushed": flushed,
+        "abandoned": abandoned,
+        "timed_out": timed_out,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+    if timed_out:
+        hestia_internal_logger.error(
+            f"Logging shutdown deadline ({timeout}s) hit: {report}"
+        )
+    elif workers:
+        hestia_internal_logger.info(f"Logging shut down: {report}")
+    return report
+
+
+def _stop_async_workers():
+    shutdown()
+
+
+def install_shutdown_signal(signum=None, timeout: float = None):
+    """
+    Drains the sinks (within `timeout`) when the process receives `signum`
+    (SIGTERM by default), then hands the signal to the previous handler, so
+    the default action still terminates the process. Must be called from the
+    main thread.
+    """
+    signum = signum if signum is not None else signal.SIGTERM
+    previous = signal.getsignal(signum)
+
+    def handle(signo, frame):
+        # Drain off the signal frame: the interrupted code may hold queue locks
+        drain = threading.Thread(
+            target=shutdown,
+            kwargs={"timeout": timeout},
+            name="hestia-shutdown",
+            daemon=True,
+        )
+        drain.start()
+        drain.join((LOG_SHUTDOWN_TIMEOUT if timeout is None else timeout) + 1)
+        if callable(previous):
+            previous(signo, frame)
+        elif previous != signal.SIG_IGN:
+            signal.signal(signo, signal.SIG_DFL)
+            os.kill(os.getpid(), signo)
+
+    return signal.signal(signum, handle)
 
 
 atexit.register(_stop_async_workers)
 
 
+def _parse_durability(spec: str):
+    """
+    Parses `mode` / `sink=mode` items (`interval,audit=group_commit`).
+    """
+    modes = {}
+    for item in (spec or "").split(","):
+        sink, _, mode = item.strip().rpartition("=")
+        mode = mode.strip().lower()
+        if not mode:
+            continue
+        if mode not in DURABILITY_MODES:
+            hestia_internal_logger.error(f"Ignoring invalid LOG_DURABILITY: {item!r}")
+            continue
+        modes[sink.strip() or "*"] = mode
+    return modes
+
+
+_DURABILITY = _parse_durability(LOG_DURABILITY)  # sink name ("*": default) -> mode
+
+
+def _durability_kwargs(path: str):
+    """
+    Durability settings for the file sink writing `path`.
+    """
+    name = os.path.basename(path).split(".", 1)[0]
+    return {
+        "durability": _DURABILITY.get(name, _DURABILITY.get("*", "none")),
+        "fsync_interval": LOG_FSYNC_INTERVAL_MS / 1000,
+    }
+
+
+def _create_app_sink(cfg=None):
+    cfg = cfg or runtime_config.current()
+    if LOG_OUTPUT == "stdout":
+        return StdoutJSONHandler()
+    if cfg.FLUENT_FORWARD_HOST or cfg.FLUENT_FORWARD_SOCKET:
+        return FluentForwardHandler(
+            tag=cfg.FLUENT_FORWARD_TAG,
+            host=cfg.FLUENT_FORWARD_HOST or "localhost",
+            port=cfg.FLUENT_FORWARD_PORT,
+            unix_socket=cfg.FLUENT_FORWARD_SOCKET or None,
+            compress=cfg.FLUENT_FORWARD_COMPRESS,
+            require_ack=cfg.FLUENT_FORWARD_ACK,
+            fallback_path=LOG_FILE_PATH_APP,
+            fallback_max_bytes=cfg.LOG_ROTATION_MAX_BYTES,
+            fallback_backup_count=cfg.LOG_ROTATION_BACKUP_COUNT,
+        )
+    if cfg.LOG_FILE_FORMAT == "binary":
+        return BinaryLogHandler(
+            LOG_FILE_PATH_APP_BINARY,
+            maxBytes=cfg.LOG_ROTATION_MAX_BYTES,
+            backupCount=cfg.LOG_ROTATION_BACKUP_COUNT,
+            **_durability_kwargs(LOG_FILE_PATH_APP_BINARY),
+        )
+    if cfg.LOG_INDEX_ENABLED and cfg.LOG_FILE_COMPRESSION not in COMPRESSION_SUFFIXES:
+        return IndexedRotatingFileHandler(
+            LOG_FILE_PATH_APP,
+            interval=cfg.LOG_INDEX_INTERVAL,
+            bloom_keys=cfg.LOG_INDEX_BLOOM_KEYS,
+            maxBytes=cfg.LOG_ROTATION_MAX_BYTES,
+            backupCount=cfg.LOG_ROTATION_BACKUP_COUNT,
+            encoding=LOG_FILE_ENCODING,
+            errors=LOG_FILE_ENCODING_ERRORS,
+            **_durability_kwargs(LOG_FILE_PATH_APP),
+        )
+    return _create_file_sink(LOG_FILE_PATH_APP, cfg)
+
+
+def _create_file_sink(path: str, cfg=None):
+    """
+    Creates the rotating file sink for `path`, compressed when
+    `LOG_FILE_COMPRESSION` is set.
+    """
+    cfg = cfg or runtime_config.current()
+    if cfg.LOG_FILE_COMPRESSION in COMPRESSION_SUFFIXES:
+        return CompressedRotatingFileHandler(
+            path + COMPRESSION_SUFFIXES[cfg.LOG_FILE_COMPRESSION],
+            compression=cfg.LOG_FILE_COMPRESSION,
+            level=cfg.LOG_COMPRESSION_LEVEL,
+            frame_size=cfg.LOG_COMPRESSION_FRAME_KB * 1024,
+            frame_interval=cfg.LOG_COMPRESSION_FRAME_MS / 1000,
+            maxBytes=cfg.LOG_ROTATION_MAX_BYTES,
+            backupCount=cfg.LOG_ROTATION_BACKUP_COUNT,
+            encoding=LOG_FILE_ENCODING,
+            errors=LOG_FILE_ENCODING_ERRORS,
+            **_durability_kwargs(path),
+        )
+    return BatchRotatingFileHandler(
+        path,
+        maxBytes=cfg.LOG_ROTATION_MAX_BYTES,
+        backupCount=cfg.LOG_ROTATION_BACKUP_COUNT,
+        delay=True,
+        encoding=LOG_FILE_ENCODING,
+        errors=LOG_FILE_ENCODING_ERRORS,
+        **_durability_kwargs(path),
+    )
+
+
 def _ensure_app_handler():
     global _APP_LOG_HANDLER
     if _APP_LOG_HANDLER is None:
         json_formatter = JSONFormatter()
         os.makedirs(os.path.dirname(LOG_FILE_PATH_APP), exist_ok=True)
 
-        app_file_handler = RotatingFileHandler(
-            LOG_FILE_PATH_APP,
-            maxBytes=LOG_ROTATION_MAX_BYTES,
-            backupCount=LOG_ROTATION_BACKUP_COUNT,
-            delay=True,
-            encoding=LOG_FILE_ENCODING,
-            errors=LOG_FILE_ENCODING_ERRORS,
-        )
+        app_file_handler = _create_app_sink()
         app_file_handler.setFormatter(json_formatter)
         app_file_handler.setLevel(logging.DEBUG)
-        _APP_LOG_HANDLER = _wrap_with_async_queue(app_file_handler)
+        _APP_LOG_HANDLER = _wrap_with_async_queue(app_file_handler, "app")
 
     app_logger = logging.getLogger("app")
     if _APP_LOG_HANDLER not in app_logger.handlers:
@@ -107,23 +363,29 @@ def _ensure_app_handler():
     return app_logger
 
 
-def _create_service_handler(name: str, log_level):
+def app_log_handler():
+    """
+    Returns the shared async handler of the JSON `app` sink.
+    """
+    _ensure_app_handler()
+    return _APP_LOG_HANDLER
+
+
+def _create_service_sink(name: str, log_level, cfg=None):
     service_log_file = os.path.join(LOGS_DIR, f"{name}.log")
     os.makedirs(os.path.dirname(service_log_file), exist_ok=True)
 
-    service_file_handler = RotatingFileHandler(
-        service_log_file,
-        maxBytes=LOG_ROTATION_MAX_BYTES,
-        backupCount=LOG_ROTATION_BACKUP_COUNT,
-        delay=True,
-        encoding=LOG_FILE_ENCODING,
-        errors=LOG_FILE_ENCODING_ERRORS,
-    )
+    service_file_handler = _create_file_sink(service_log_file, cfg)
     service_file_handler.setFormatter(
         logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
     service_file_handler.setLevel(log_level)
-    queue_handler = _wrap_with_async_queue(service_file_handler)
+    return service_file_handler
+
+
+def _create_service_handler(name: str, log_level):
+    service_file_handler = _create_service_sink(name, log_level)
+    queue_handler = _wrap_with_async_queue(service_file_handler, name)
     return queue_handler, service_file_handler
 
 
@@ -131,8 +393,10 @@ def _initialize_logger(name: str, log_level):
     base_logger = logging.getLogger(name)
     base_logger.setLevel(log_level)
     base_logger.propagate = False
+    if _DEDUP_FILTER is not None:
+        base_logger.addFilter(_DEDUP_FILTER)
 
-    if name == "app":
+    if name == "app" or not _SERVICE_FILE_SINKS:
         _ensure_app_handler()
         if _APP_LOG_HANDLER not in base_logger.handlers:
             base_logger.addHandler(_APP_LOG_HANDLER)
@@ -148,7 +412,7 @@ def _initialize_logger(name: str, log_level):
 
 def _ensure_required_handlers(logger: logging.Logger, name: str):
     logger.propagate = False
-    if name == "app":
+    if name == "app" or not _SERVICE_FILE_SINKS:
         _ensure_app_handler()
         if _APP_LOG_HANDLER not in logger.handlers:
             logger.addHandler(_APP_LOG_HANDLER)
@@ -165,38 +429,435 @@ def _ensure_required_handlers(logger: logging.Logger, name: str):
             logger.addHandler(_APP_LOG_HANDLER)
 
 
+def _make_rate_limiter(rate_limit):
+    if rate_limit is None or isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    if not rate_limit:
+        return None
+    return RateLimiter(rate_limit, report_interval=LOG_RATE_LIMIT_REPORT_INTERVAL)
+
+
+# `LoggerAdapter` convenience methods (`info()`, `exception()`, ...) sit one
+# frame between the caller and `HestiaLoggerAdapter.log`
+_ADAPTER_CODES = frozenset(
+    getattr(LoggerAdapter, name).__code__
+    for name in ("debug", "info", "warning", "error", "exception", "critical")
+)
+
+
+def _caller_frame(frame, stacklevel=1):
+    """
+    The calling frame, given the frame that called `HestiaLoggerAdapter.log`.
+    """
+    if frame.f_code in _ADAPTER_CODES:
+        frame = frame.f_back
+    while stacklevel > 1 and frame.f_back is not None:
+        frame = frame.f_back
+        stacklevel -= 1
+    return frame
+
+
 class HestiaLoggerAdapter(LoggerAdapter):
+    rate_limiter = None
+    caller_info = LOG_CALLER_INFO
+    durable = False
+    flight_recorder = None
+
     def log(self, level, msg, *args, **kwargs):
+        # The flight recorder sees every call, whatever the level
+        if self.flight_recorder is not None:
+            self.flight_recorder.record(self.logger.name, level, msg, args)
+        if not self.isEnabledFor(level):
+            # Below-level records of an in-flight request wait in its tail buffer
+            buffer = current_buffer()
+            if buffer is not None and level >= buffer.level:
+                caller = None
+                if self.caller_info:
+                    frame = _caller_frame(sys._getframe(1), kwargs.get("stacklevel", 1))
+                    code = frame.f_code
+                    caller = (code.co_filename, frame.f_lineno, code.co_name)
+                msg, kwargs = self.process(msg, kwargs)
+                buffer.add(self.logger, level, msg, args, kwargs, caller)
+            return
+        # Rate limits are checked before the record is built or formatted
+        if not self._within_rate(level, self.rate_limiter, "logger"):
+            return
+        if not self._within_rate(level, _GLOBAL_RATE_LIMITER, "global"):
+            return
         _ensure_required_handlers(self.logger, self.logger.name)
-        super().log(level, msg, *args, **kwargs)
+        msg, kwargs = self.process(msg, kwargs)
+        self._log(level, msg, args, **kwargs)
+
+    def _log(
+        self,
+        level,
+        msg,
+        args,
+        exc_info=None,
+        extra=None,
+        stack_info=False,
+        stacklevel=1,
+    ):
+        """
+        Builds and handles the record like `Logger._log`, without the
+        `findCaller` stack walk: the caller's frame is taken directly at the
+        adapter's fixed depth, or skipped entirely when `caller_info` is off.
+        """
+        sinfo = None
+        if self.caller_info:
+            frame = _caller_frame(sys._getframe(2), stacklevel)
+            code = frame.f_code
+            fn, lno, func = code.co_filename, frame.f_lineno, code.co_name
+            if stack_info:
+                sinfo = "Stack (most recent call last):\n" + "".join(
+                    traceback.format_stack(frame)
+                ).rstrip("\n")
+        else:
+            fn, lno, func = "(unknown file)", 0, "(unknown function)"
+        if exc_info:
+            if isinstance(exc_info, BaseException):
+                exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+            elif not isinstance(exc_info, tuple):
+                exc_info = sys.exc_info()
+        record = self.logger.makeRecord(
+            self.logger.name, level, fn, lno, msg, args, exc_info, func, extra, sinfo
+        )
+        if self.durable:
+            record.durable = True
+        self.logger.handle(record)
+
+    def _within_rate(self, level, limiter, scope):
+        if limiter is None:
+            return True
+        allowed = limiter.allow(level)
+        suppressed = limiter.take_report()
+        if suppressed:
+            total = sum(suppressed.values())
+            self.logger.warning(
+                {
+                    "message": f"{total} records suppressed by {scope} rate limit",
+                    "event": "log_rate_limited",
+                    "scope": scope,
+                    "suppressed": suppressed,
+                },
+                extra=self.extra,
+            )
+        return allowed
+
+
+def _get_formatter_pool():
+    global _FORMATTER_POOL
+    if _FORMATTER_POOL is None:
+        _FORMATTER_POOL = ThreadPoolExecutor(
+            max_workers=max(1, LOG_FORMATTER_POOL_SIZE),
+            thread_name_prefix="hestia-formatter",
+        )
+    return _FORMATTER_POOL
+
+
+def _snapshot_record(record):
+    """
+    Copies a record so it can be formatted later on another thread.
+
+    Dict payloads are copied (callers such as `log_execution` keep mutating
+    them) and %-style arguments are merged so later mutation cannot leak in.
+    """
+    record = copy.copy(record)
+    if isinstance(record.msg, dict):
+        record.msg = dict(record.msg)
+    elif record.args:
+        record.msg = record.getMessage()
+        record.args = None
+    return record
+
+
+class _SerializingQueueHandler(QueueHandler):
+    """
+    Queue handler that formats each record exactly once.
+
+    - `worker`: enqueue a record snapshot, the writer thread formats it.
+    - `producer`: format to final bytes on the calling thread.
+    - `pool`: format to final bytes on a shared formatter pool; the writer
+      thread resolves the futures in order.
+    """
+
+    def __init__(self, log_queue, target, mode):
+        super().__init__(log_queue)
+        self.target = target
+        self.mode = mode
+        self.setLevel(target.level)
+
+    def prepare(self, record):
+        if self.mode == "producer":
+            return self.target.serialize(record)
+        if self.mode == "pool":
+            return _get_formatter_pool().submit(
+                self.target.serialize, _snapshot_record(record)
+            )
+        return _snapshot_record(record)
+
+    def handle(self, record):
+        # Like `Handler.handle`, but a write-through wait happens after the
+        # handler lock is released, so concurrent waiters share one flush
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.acquire()
+            try:
+                written = self.emit(record)
+            finally:
+                self.release()
+            if written is not None:
+                self._wait_written(written)
+        return rv
+
+    def emit(self, record):
+        """
+        Queues the record; returns an event to wait on for write-through records.
+        """
+        # The writer thread only sees bytes, so handler filters run here
+        if self.mode != "worker" and not self.target.filter(record):
+            return None
+        try:
+            item = self.prepare(record)
+            priority = (
+                LOG_PRIORITY_LEVEL is not None and record.levelno >= LOG_PRIORITY_LEVEL
+            )
+            if getattr(record, "durable", False) or (
+                record.levelno >= logging.CRITICAL and LOG_CRITICAL_WRITE_THROUGH
+            ):
+                # Written and flushed (fsynced on `group_commit` sinks) first
+                written = threading.Event()
+                item = _WriteThrough(item, written)
+                if priority:
+                    self.queue.put_priority(item)
+                else:
+                    self.enqueue(item)
+                return written
+            if priority:
+                self.queue.put_priority(item)
+            else:
+                self.enqueue(item)
+        except Exception:
+            self.handleError(record)
+        return None
+
+    def _wait_written(self, written):
+        worker = getattr(self, "worker_thread", None)
+        if worker is None or worker is threading.current_thread():
+            return
+        if worker.is_alive() and not written.wait(LOG_WRITE_THROUGH_TIMEOUT):
+            hestia_internal_logger.error(
+                f"Record not confirmed written within {LOG_WRITE_THROUGH_TIMEOUT}s"
+            )
+
+
+def _sink_name(handler):
+    filename = getattr(handler, "baseFilename", None)
+    if filename:
+        return os.path.splitext(os.path.basename(filename))[0]
+    return type(handler).__name__
+
+
+class _SinkSwap:
+    """
+    Queue marker: records queued after it go to `handler`.
+    """
+
+    __slots__ = ("handler", "mode")
+
+    def __init__(self, handler, mode):
+        self.handler = handler
+        self.mode = mode
+
+
+class _WriteThrough:
+    """
+    Priority item whose producer waits for `written` to be set.
+    """
+
+    __slots__ = ("item", "written")
+
+    def __init__(self, item, written):
+        self.item = item
+        self.written = written
+
+
+class _LaneQueue(queue.Queue):
+    """
+    Unbounded FIFO queue with a priority lane drained first.
+
+    `put()` appends to the normal lane; `put_priority()` to the priority lane
+    (`LOG_PRIORITY_LEVEL` records), so they are not stuck behind an INFO
+    backlog. Order is kept within each lane. Control items (sink swaps, the
+    shutdown sentinel) go through the normal lane and act as barriers: a
+    priority item queued after one is not handed out before it, so it is
+    written to the sink it was prepared for.
+    """
+
+    def _init(self, maxsize):
+        self._normal = collections.deque()
+        self._priority = collections.deque()
+        self._barriers_queued = 0
+        self._barriers_taken = 0
+
+    def _qsize(self):
+        return len(self._normal) + len(self._priority)
+
+    def _put(self, item):
+        self._normal.append(item)
+        if item is None or isinstance(item, _SinkSwap):
+            self._barriers_queued += 1
+
+    def _get(self):
+        if self._priority and self._priority[0][0] == self._barriers_taken:
+            return self._priority.popleft()[1]
+        item = self._normal.popleft()
+        if item is None or isinstance(item, _SinkSwap):
+            self._barriers_taken += 1
+        return item
+
+    def put_priority(self, item):
+        with self.not_full:
+            self._priority.append((self._barriers_queued, item))
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
 
+def _serialization_mode(handler):
+    mode = LOG_SERIALIZATION_MODE
+    if mode not in _SERIALIZATION_MODES or not hasattr(handler, "write_batch"):
+        mode = "worker"
+    if getattr(handler, "serialize_on_writer", False):
+        mode = "worker"
+    return mode
 
-def _wrap_with_async_queue(handler):
+
+def _wrap_with_async_queue(handler, name=None):
     """
     Wraps a synchronous handler with an async queue so logging does not block.
+
+    Handlers exposing `serialize()`/`write_batch()` honour
+    `LOG_SERIALIZATION_MODE` and receive one write per batch; any other
+    handler is handed records one by one on the worker. The sink can be
+    replaced later with `_swap_sink()` without restarting the worker.
     """
-    log_queue = queue.Queue()
+    batched = hasattr(handler, "write_batch")
+    mode = _serialization_mode(handler)
+    log_queue = _LaneQueue()
+    metrics = register_sink(name or _sink_name(handler), "queue", log_queue)
+
+    def serialize(item):
+        if mode == "producer":
+            return item
+        if mode == "pool":
+            return item.result()
+        return handler.serialize(item) if handler.filter(item) else b""
+
+    def write(items):
+        if not batched:
+            for record in items:
+                handler.handle(record)
+            return len(items), 0
+        payloads = []
+        for item in items:
+            try:
+                payloads.append(serialize(item))
+            except Exception as e:
+                metrics.records_dropped += 1
+                hestia_internal_logger.error(f"ERROR SERIALIZING LOG RECORD: {e}")
+        payload = b"".join(payloads)
+        handler.write_batch(payload)
+        return sum(1 for chunk in payloads if chunk), len(payload)
+
+    def write_segment(items):
+        if not items:
+            return
+        started = time.perf_counter()
+        try:
+            written, nbytes = write(items)
+            metrics.record_write(written, nbytes, time.perf_counter() - started)
+        except Exception as e:
+            metrics.write_errors += 1
+            metrics.records_dropped += len(items)
+            hestia_internal_logger.error(f"ERROR WRITING LOG BATCH: {e}")
+
+    def swap(marker):
+        nonlocal handler, mode, batched, idle_flush_interval
+        old = handler
+        handler, mode = marker.handler, marker.mode
+        batched = hasattr(handler, "write_batch")
+        idle_flush_interval = getattr(handler, "idle_flush_interval", None)
+        worker_entry[2] = handler
+        try:
+            old.flush()
+            old.close()
+        except Exception as e:
+            hestia_internal_logger.error(f"ERROR CLOSING REPLACED SINK: {e}")
+
+    idle_flush_interval = getattr(handler, "idle_flush_interval", None)
 
     def worker():
-        while True:
-            record = log_queue.get()
-            if record is None:
-                log_queue.task_done()
-                break
+        running = True
+        while running:
+            metrics.observe_queue()
             try:
-                handler.handle(record)
+                batch = [log_queue.get(timeout=idle_flush_interval)]
+            except queue.Empty:
+                # Let buffering sinks (e.g. compressed frames) flush while idle
+                try:
+                    handler.flush()
+                except Exception as e:
+                    hestia_internal_logger.error(f"ERROR FLUSHING IDLE SINK: {e}")
+                continue
+            batch_size = runtime_config.current().LOG_WRITER_BATCH_SIZE
+            while len(batch) < batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not None]
+            running = len(items) == len(batch)
+            waiters = []
+            try:
+                segment = []
+                for item in items:
+                    if isinstance(item, _WriteThrough):
+                        waiters.append(item.written)
+                        item = item.item
+                    if isinstance(item, _SinkSwap):
+                        # Records queued before the swap still go to the old sink
+                        write_segment(segment)
+                        segment = []
+                        swap(item)
+                    else:
+                        segment.append(item)
+                write_segment(segment)
+                if waiters:
+                    handler.flush()
+            except Exception as e:
+                hestia_internal_logger.error(f"ERROR FLUSHING LOG SINK: {e}")
             finally:
-                log_queue.task_done()
+                for written in waiters:
+                    written.set()
+                for _ in batch:
+                    log_queue.task_done()
 
     worker_thread = threading.Thread(target=worker, daemon=True)
+    worker_entry = [log_queue, worker_thread, handler, metrics]
     worker_thread.start()
-    _ASYNC_WORKERS.append((log_queue, worker_thread, handler))
+    _ASYNC_WORKERS.append(worker_entry)
 
-    queue_handler = QueueHandler(log_queue)
-    queue_handler.setLevel(handler.level)
+    queue_handler = _SerializingQueueHandler(log_queue, handler, mode)
+    queue_handler.worker_thread = worker_thread
 
     def flush(self):
-        log_queue.join()
+        if worker_thread.is_alive() and not _join_queue(log_queue, LOG_FLUSH_TIMEOUT):
+            hestia_internal_logger.error(
+                f"Flush of {_sink_name(handler)} timed out after {LOG_FLUSH_TIMEOUT}s"
+            )
+            return
         if hasattr(handler, "flush"):
             handler.flush()
 
@@ -204,11 +865,45 @@ def _wrap_with_async_queue(handler):
     return queue_handler
 
 
-def get_logger(name: str, metadata: dict = None, log_level=None, internal=False):
+def _swap_sink(queue_handler, new_handler):
+    """
+    Atomically points an async queue handler at `new_handler`.
+
+    Emitting holds the queue handler's lock, so every record is prepared for
+    exactly one sink; the worker closes the old sink once the records queued
+    before the swap are written.
+    """
+    mode = _serialization_mode(new_handler)
+    queue_handler.acquire()
+    try:
+        queue_handler.enqueue(_SinkSwap(new_handler, mode))
+        queue_handler.target = new_handler
+        queue_handler.mode = mode
+        queue_handler.setLevel(new_handler.level)
+    finally:
+        queue_handler.release()
+
+
+def get_logger(
+    name: str,
+    metadata: dict = None,
+    log_level=None,
+    internal=False,
+    rate_limit=None,
+    caller_info=None,
+    durable=None,
+):
     """
     Returns a structured logger for a specific service/module.
     - Ensures `app.log` is always available internally.
     - Prevents duplicate logger creation.
+    - `rate_limit` caps records/sec below ERROR (a number, a `{level: rate}`
+      dict or a `RateLimiter`); `0` removes an existing limit.
+    - `caller_info=False` skips the module/function/line lookup for this
+      logger (default: `LOG_CALLER_INFO`).
+    - `durable=True` makes each call wait until its record is written and
+      flushed (fsynced on `group_commit` sinks, see `LOG_DURABILITY`); a
+      single record can ask for it with `extra={"durable": True}`.
     """
     global _LOGGERS, _APP_LOG_HANDLER
 
@@ -217,17 +912,26 @@ def get_logger(name: str, metadata: dict = None, log_level=None, internal=False)
             f'"{_RESERVED_APP_NAME}" is a reserved logger name and cannot be used directly.'
         )
 
+    # Built first so an invalid `rate_limit` fails before anything is set up
+    rate_limiter = _make_rate_limiter(rate_limit)
+
     if name in _LOGGERS:
         adapter = _LOGGERS[name]
         if metadata:
             adapter.extra.setdefault("metadata", {}).update(metadata)
         _ensure_required_handlers(adapter.logger, name)
-        adapter.logger.setLevel(log_level or adapter.logger.level)
+        if log_level:
+            register_level(name, log_level)
+        if rate_limit is not None:
+            adapter.rate_limiter = rate_limiter
+        if caller_info is not None:
+            adapter.caller_info = caller_info
+        if durable is not None:
+            adapter.durable = durable
         return adapter
 
-    log_level = log_level or LOG_LEVEL
-
-    logger = _initialize_logger(name, log_level)
+    _BASE_LEVELS[name] = log_level or None
+    logger = _initialize_logger(name, _effective_level(name))
 
     default_metadata = {
         "environment": ENVIRONMENT,
@@ -238,27 +942,202 @@ def get_logger(name: str, metadata: dict = None, log_level=None, internal=False)
         default_metadata.update(metadata)
 
     adapter = HestiaLoggerAdapter(logger, {"metadata": default_metadata})
+    adapter.rate_limiter = rate_limiter
+    if caller_info is not None:
+        adapter.caller_info = caller_info
+    if durable is not None:
+        adapter.durable = durable
     _LOGGERS[name] = adapter
     return adapter
 
 
+def _apply_level(name: str, level):
+    """
+    Sets a logger's level together with its service sink, so lowering the
+    level actually lets the records through to `<name>.log`.
+    """
+    logging.getLogger(name).setLevel(level)
+    for handler in _SERVICE_HANDLERS.get(name, ()):
+        handler.setLevel(level)
+
+
+def _effective_level(name: str):
+    """
+    `HESTIA_LEVELS` override, else the level requested in code, else `LOG_LEVEL`.
+    """
+    level = _LEVEL_TABLE.level_for(name)
+    if level is None:
+        level = _BASE_LEVELS.get(name)
+    return level if level is not None else runtime_config.current().LOG_LEVEL
+
+
+def register_level(name: str, level=None):
+    """
+    Puts a logger's level under HESTIA management and returns the level
+    applied: `HESTIA_LEVELS` overrides `level`, and `None` follows `LOG_LEVEL`
+    (including runtime reloads).
+    """
+    _BASE_LEVELS[name] = level
+    _OVERRIDDEN_LEVELS.pop(name, None)  # Now managed (see `_install_level_hook`)
+    effective = _effective_level(name)
+    if name not in _LEVEL_TIMERS:
+        _apply_level(name, effective)
+    return effective
+
+
+def _refresh_levels():
+    if _LEVEL_TABLE:
+        _install_level_hook()
+    for name in list(_BASE_LEVELS):
+        if name not in _LEVEL_TIMERS:
+            _apply_level(name, _effective_level(name))
+
+    # Loggers HESTIA does not manage (e.g. third-party libraries) only take
+    # overrides, and get their own level back when a rule goes away
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if name in _BASE_LEVELS or not isinstance(logger, logging.Logger):
+            continue
+        level = _LEVEL_TABLE.level_for(name)
+        if level is not None:
+            _OVERRIDDEN_LEVELS.setdefault(name, logger.level)
+            logger.setLevel(level)
+        elif name in _OVERRIDDEN_LEVELS:
+            logger.setLevel(_OVERRIDDEN_LEVELS.pop(name))
+
+
+def _install_level_hook():
+    """
+    Applies `HESTIA_LEVELS` to loggers created after the table (libraries
+    often create theirs lazily) by wrapping the logging manager's
+    `getLogger`; an existing logger costs one extra dict lookup. Installed
+    once, the first time the table has rules.
+    """
+    manager = logging.root.manager
+    if hasattr(manager.getLogger, "hestia_original"):
+        return
+    create = manager.getLogger
+
+    def get_logger_hook(name):
+        existing = manager.loggerDict.get(name)
+        logger = create(name)
+        if logger is not existing and _LEVEL_TABLE and name not in _BASE_LEVELS:
+            level = _LEVEL_TABLE.level_for(name)
+            if level is not None:
+                _OVERRIDDEN_LEVELS.setdefault(name, logger.level)
+                logger.setLevel(level)
+        return logger
+
+    get_logger_hook.hestia_original = create
+    manager.getLogger = get_logger_hook
+
+
+def _restore_level(name: str, timer):
+    entry = _LEVEL_TIMERS.get(name)
+    if entry is None or entry[0] is not timer:
+        return
+    del _LEVEL_TIMERS[name]
+    if name in _BASE_LEVELS:
+        _apply_level(name, _effective_level(name))
+    else:
+        _apply_level(name, entry[1])
+
+
+def set_level(name: str, level, duration: float = None):
+    """
+    Changes the level of a HESTIA logger at runtime.
+
+    With `duration` (seconds) the previous level is restored afterwards, e.g.
+    `set_level("api_service", "DEBUG", duration=300)`.
+    """
+    if isinstance(level, str):
+        if level.strip().upper() not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level: {level!r}")
+        level = LOG_LEVELS[level.strip().upper()]
+    pending = _LEVEL_TIMERS.pop(name, None)
+    if pending is not None:
+        pending[0].cancel()
+    previous = pending[1] if pending else logging.getLogger(name).level
+
+    _apply_level(name, level)
+    if duration:
+        timer = threading.Timer(duration, lambda: _restore_level(name, timer))
+        timer.daemon = True
+        _LEVEL_TIMERS[name] = (timer, previous)
+        timer.start()
+    elif name in _BASE_LEVELS:
+        _BASE_LEVELS[name] = level
+
+
+_COMPRESSION_SETTINGS = frozenset(
+    key
+    for key in runtime_config.SINK_SETTINGS
+    if key.startswith(("LOG_FILE_COMPRESSION", "LOG_COMPRESSION_"))
+)
+
+
+def _apply_runtime_config(old, new):
+    """
+    Applies a reloaded runtime configuration to the live pipeline.
+    """
+    changed = old.diff(new)
+
+    global _LEVEL_TABLE
+    if "LOG_LEVEL" in changed:
+        logging.root.setLevel(new.LOG_LEVEL)
+        _set_console_level(new.LOG_LEVEL)
+    if "HESTIA_LEVELS" in changed:
+        _LEVEL_TABLE = LevelTable(new.HESTIA_LEVELS)
+    if changed & {"LOG_LEVEL", "HESTIA_LEVELS"}:
+        _refresh_levels()
+
+    if changed & {"LOG_ROTATION_MAX_BYTES", "LOG_ROTATION_BACKUP_COUNT"}:
+        for _, _, handler, _ in list(_ASYNC_WORKERS):
+            if isinstance(handler, BatchRotatingFileHandler):
+                handler.acquire()
+                try:
+                    handler.maxBytes = new.LOG_ROTATION_MAX_BYTES
+                    handler.backupCount = new.LOG_ROTATION_BACKUP_COUNT
+                finally:
+                    handler.release()
+
+    if changed & runtime_config.SINK_SETTINGS and _APP_LOG_HANDLER is not None:
+        app_sink = _create_app_sink(new)
+        app_sink.setFormatter(JSONFormatter())
+        app_sink.setLevel(logging.DEBUG)
+        _swap_sink(_APP_LOG_HANDLER, app_sink)
+
+    if changed & _COMPRESSION_SETTINGS:
+        for name, (queue_handler, file_handler) in list(_SERVICE_HANDLERS.items()):
+            service_sink = _create_service_sink(name, file_handler.level, new)
+            _swap_sink(queue_handler, service_sink)
+            _SERVICE_HANDLERS[name] = (queue_handler, service_sink)
+
+
+runtime_config.subscribe("custom_logger", _apply_runtime_config)
+# A reloaded module drops the level hook of its previous instance
+if hasattr(logging.root.manager.getLogger, "hestia_original"):
+    logging.root.manager.getLogger = logging.root.manager.getLogger.hestia_original
+if _LEVEL_TABLE:
+    _refresh_levels()
+
+# Console output goes through the async pipeline too, so callers never block
+# on stderr; the writer thread writes each batch with one call
+async_console_handler = _wrap_with_async_queue(console_handler, "console")
+
+
+def _set_console_level(level):
+    console_handler.setLevel(level)
+    async_console_handler.setLevel(level)
+
+
 def apply_logging_settings():
     """
     Applies `LOG_LEVEL` settings to all handlers and ensures correct formatting.
     """
     logging.root.handlers = []
     logging.root.setLevel(LOG_LEVEL)
-    console_handler.setLevel(LOG_LEVEL)
-
-    color_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(color_formatter)
-
-    logging.root.addHandler(console_handler)
-
-    for handler in logging.root.handlers:
-        handler.flush = lambda: handler.stream.flush()
+    _set_console_level(LOG_LEVEL)
+    logging.root.addHandler(async_console_handler)
 
     if hasattr(hestia_internal_logger, "setLevel"):
         hestia_internal_logger.setLevel(LOG_LEVEL)
@@ -272,3 +1151,54 @@ def apply_logging_settings():
 
 
 apply_logging_settings()
+
+
+def _open_flight_recorder():
+    """
+    Opens this process's flight recorder (`{pid}` in the path keeps workers
+    of a pre-forking server off each other's rings).
+    """
+    HestiaLoggerAdapter.flight_recorder = None
+    path = LOG_FLIGHT_RECORDER_PATH.replace("{pid}", str(os.getpid()))
+    try:
+        if path != LOG_FLIGHT_RECORDER_PATH:
+            prune_rings(LOG_FLIGHT_RECORDER_PATH, LOG_FLIGHT_RECORDER_KEEP)
+        recorder = FlightRecorder(path, LOG_FLIGHT_RECORDER_SIZE_KB * 1024)
+    except (OSError, ValueError) as e:
+        hestia_internal_logger.error(f"Could not open the flight recorder: {e}")
+        return
+    HestiaLoggerAdapter.flight_recorder = recorder
+    dump_signal = getattr(signal, LOG_FLIGHT_RECORDER_DUMP_SIGNAL or "-", None)
+    if dump_signal is not None and (
+        threading.current_thread() is threading.main_thread()
+    ):
+        install_dump_signal(recorder, dump_signal, LOG_FLIGHT_RECORDER_DUMP_RECORDS)
+
+
+def _close_flight_recorder():
+    """
+    Removes this process's ring at a clean exit: it only matters after a
+    crash, and recycled workers would otherwise leave one each behind.
+    """
+    recorder = HestiaLoggerAdapter.flight_recorder
+    HestiaLoggerAdapter.flight_recorder = None
+    if recorder is not None:
+        try:
+            recorder.close(unlink=True)
+        except (OSError, ValueError) as e:
+            hestia_internal_logger.error(f"Could not remove the flight recorder: {e}")
+
+
+if LOG_FLIGHT_RECORDER:
+    _open_flight_recorder()
+    atexit.register(_close_flight_recorder)
+    if hasattr(os, "register_at_fork"):
+        # A forked worker must not share the parent's ring (one mmap, two
+        # sets of head/tail and locks)
+        os.register_at_fork(after_in_child=_open_flight_recorder)
+
+if threading.current_thread() is threading.main_thread():
+    if LOG_RELOAD_ON_SIGHUP:
+        runtime_config.install_reload_signal(LOG_CONFIG_FILE or None)
+    if LOG_SHUTDOWN_ON_SIGTERM:
+        install_shutdown_signal()
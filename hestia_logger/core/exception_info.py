@@ -0,0 +1,144 @@
+"""
+HESTIA Logger - Structured Exception Capture.
+
+Turns exceptions into structured data for JSON sinks:
+
+    {"type": "ValueError", "message": "boom", "fingerprint": "4f1c...",
+     "frames": [{"file": "app.py", "line": 12, "function": "handler"}, ...]}
+
+Walking a traceback only touches code objects and line numbers, and that
+pair sequence is the cache key: a repeated exception (same code path) reuses
+the frames rendered the first time. No source lines are read and nothing is
+string-formatted on a cache hit. `max_frames` keeps the innermost frames of
+deep stacks.
+
+`formatted_traceback` renders the same cached frames as traceback text in
+the `traceback.format_exception` layout, without source lines, for
+consumers that expect a string.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import collections
+import hashlib
+import threading
+import traceback
+
+from ..core.config import LOG_EXC_MAX_FRAMES, LOG_EXC_CACHE_SIZE
+
+__all__ = ["structured_exception", "formatted_traceback"]
+
+_MAX_CHAIN = 3  # Causes/contexts rendered below the top-level exception
+
+_CACHE = collections.OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _code_path(tb):
+    path = []
+    while tb is not None:
+        path.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return tuple(path)
+
+
+def _render(exc_type, path, max_frames):
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{exc_type.__module__}.{exc_type.__qualname__}".encode())
+    for code, lineno in path:
+        digest.update(f"|{code.co_filename}:{code.co_name}:{lineno}".encode())
+    kept = path[-max_frames:] if max_frames else ()
+    frames = tuple(
+        {"file": code.co_filename, "line": lineno, "function": code.co_name}
+        for code, lineno in kept
+    )
+    omitted = len(path) - len(kept)
+    text = ""
+    if path:
+        lines = ["Traceback (most recent call last):\n"]
+        if omitted:
+            lines.append(f"  [{omitted} outer frames omitted]\n")
+        lines.extend(
+            f'  File "{code.co_filename}", line {lineno}, in {code.co_name}\n'
+            for code, lineno in kept
+        )
+        text = "".join(lines)
+    return digest.hexdigest(), frames, omitted, text
+
+
+def _cached(exc_type, path, max_frames):
+    key = (exc_type, path, max_frames)
+    with _CACHE_LOCK:
+        rendered = _CACHE.get(key)
+        if rendered is not None:
+            _CACHE.move_to_end(key)
+            return rendered
+    rendered = _render(exc_type, path, max_frames)
+    with _CACHE_LOCK:
+        _CACHE[key] = rendered
+        while len(_CACHE) > LOG_EXC_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return rendered
+
+
+def _as_exception(exc):
+    if isinstance(exc, tuple):  # `exc_info` triple
+        return exc[1]
+    return exc
+
+
+def structured_exception(exc, max_frames: int = None, _depth: int = 0):
+    """
+    Structured form of an exception (or an `exc_info` triple); `None` if empty.
+    """
+    exc = _as_exception(exc)
+    if exc is None:
+        return None
+    max_frames = LOG_EXC_MAX_FRAMES if max_frames is None else max_frames
+    fingerprint, frames, omitted, _ = _cached(
+        type(exc), _code_path(exc.__traceback__), max_frames
+    )
+    entry = {
+        "type": type(exc).__qualname__,
+        "message": str(exc),
+        "fingerprint": fingerprint,
+        "frames": list(frames),
+    }
+    if omitted:
+        entry["frames_omitted"] = omitted
+
+    cause = exc.__cause__ or (None if exc.__suppress_context__ else exc.__context__)
+    if cause is not None and _depth < _MAX_CHAIN:
+        entry["cause"] = structured_exception(cause, max_frames, _depth + 1)
+    return entry
+
+
+def formatted_traceback(exc, max_frames: int = None, _depth: int = 0) -> str:
+    """
+    Traceback text of an exception (or an `exc_info` triple) built from the
+    cached frames; `""` if empty.
+    """
+    exc = _as_exception(exc)
+    if exc is None:
+        return ""
+    max_frames = LOG_EXC_MAX_FRAMES if max_frames is None else max_frames
+    text = _cached(type(exc), _code_path(exc.__traceback__), max_frames)[3]
+    text += "".join(traceback.format_exception_only(type(exc), exc))
+
+    if _depth >= _MAX_CHAIN:
+        return text
+    if exc.__cause__ is not None:
+        return (
+            formatted_traceback(exc.__cause__, max_frames, _depth + 1)
+            + "\nThe above exception was the direct cause of the following"
+            " exception:\n\n"
+            + text
+        )
+    if exc.__context__ is not None and not exc.__suppress_context__:
+        return (
+            formatted_traceback(exc.__context__, max_frames, _depth + 1)
+            + "\nDuring handling of the above exception, another exception"
+            " occurred:\n\n"
+            + text
+        )
+    return text
@@ -0,0 +1,318 @@
+"""
+HESTIA Logger - Flight Recorder.
+
+A fixed-size ring of recent records in a memory-mapped file under
+`LOGS_DIR`. Records land in the ring at every level, before level filtering,
+so DEBUG records that were never written anywhere are there too. Appending is
+a memory copy into the page cache with no syscall, so if the process
+segfaults or is OOM-killed the kernel still holds the last records. It
+complements the async queues, whose contents die with the process.
+
+File layout (little endian):
+
+    header: magic (8) | capacity u64 | head u64 | tail u64
+    ring:   records   = length u32 | created f64 | level u8 | name_len u16
+                        | name | msgpack [msg, args]
+
+`head`/`tail` are absolute byte counters (ring offset = counter % capacity).
+A record is copied in before `tail` moves past it, so a crash mid-append
+leaves the previous tail intact. Messages are stored unformatted (template
+and arguments) and only %-formatted when the ring is read.
+
+Each process writes its own ring (`flight.<pid>.rec`; reopened in forked
+children), and a ring left at the same path by an earlier process is kept
+as `.1`. A clean exit removes the ring, and opening one prunes the rings
+of exited processes to the newest `LOG_FLIGHT_RECORDER_KEEP`. Recover the tail with `hestia-logger flight logs/` (every ring in
+the directory) or `hestia-logger flight logs/flight.<pid>.rec`. A signal
+(`LOG_FLIGHT_RECORDER_DUMP_SIGNAL`) dumps the last N records to a JSON-lines
+file next to the ring.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import datetime
+import glob
+import json
+import logging
+import mmap
+import os
+import re
+import signal
+import struct
+import threading
+import time
+
+import msgpack
+
+__all__ = [
+    "FlightRecorder",
+    "read_flight_records",
+    "install_dump_signal",
+    "prune_rings",
+]
+
+_MAGIC = b"HESTFR2\0"
+_TEXT_MAGIC = b"HESTFR1\0"  # Rings written with pre-formatted messages
+_HEADER = struct.Struct("<8sQQQ")
+_POSITIONS = struct.Struct("<QQ")  # head, tail (right after magic + capacity)
+_POSITIONS_OFFSET = 16
+_RECORD = struct.Struct("<IdBH")
+_LENGTH = struct.Struct("<I")
+_MAX_NAME = 255
+
+
+def _format_message(msg, args):
+    if args and len(args) == 1 and isinstance(args[0], dict):
+        args = args[0]  # As `LogRecord` does for `%(name)s` templates
+    if args:
+        try:
+            return str(msg) % args
+        except Exception:
+            return f"{msg} {args}"
+    return msg if isinstance(msg, str) else str(msg)
+
+
+def _entry(created, levelno, name, message):
+    return {
+        "timestamp": datetime.datetime.fromtimestamp(
+            created, datetime.timezone.utc
+        ).isoformat(timespec="milliseconds"),
+        "level": logging.getLevelName(levelno),
+        "service": name,
+        "message": message,
+    }
+
+
+class FlightRecorder:
+    """
+    Memory-mapped ring of the most recent records (thread-safe).
+    """
+
+    def __init__(self, path: str, capacity: int = 4 * 1024 * 1024):
+        self.path = path
+        self.capacity = max(capacity, 4096)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Keep the previous run's ring (e.g. after a crash) for recovery
+        if os.path.exists(path) and os.path.getsize(path) > _HEADER.size:
+            os.replace(path, path + ".1")
+        size = _HEADER.size + self.capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._head = self._tail = 0
+        _HEADER.pack_into(self._map, 0, _MAGIC, self.capacity, 0, 0)
+        self._max_record = self.capacity // 4
+
+    def _write_at(self, position: int, data: bytes):
+        offset = position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        start = _HEADER.size + offset
+        self._map[start : start + first] = data[:first]
+        if first < len(data):
+            rest = len(data) - first
+            self._map[_HEADER.size : _HEADER.size + rest] = data[first:]
+
+    def _length_at(self, position: int) -> int:
+        (length,) = _LENGTH.unpack(_read_ring(self._map, self.capacity, position, 4))
+        return length
+
+    def record(self, name: str, levelno: int, msg, args=None, created=None):
+        """
+        Appends one record to the ring, evicting the oldest ones as needed.
+        """
+        name_bytes = name.encode("utf-8", "backslashreplace")[:_MAX_NAME]
+        limit = self._max_record - _RECORD.size - len(name_bytes)
+        try:
+            message = _pack((msg, args or None))
+        except Exception:  # e.g. integers beyond 64 bits
+            message = b""
+        if not message or len(message) > limit:
+            text = _format_message(msg, args).encode("utf-8", "backslashreplace")
+            text = text[: limit - 5].decode("utf-8", "ignore")  # str header <= 5
+            message = _pack((text, None))
+        length = _RECORD.size + len(name_bytes) + len(message)
+        data = (
+            _RECORD.pack(
+                length,
+                time.time() if created is None else created,
+                levelno & 0xFF,
+                len(name_bytes),
+            )
+            + name_bytes
+            + message
+        )
+        with self._lock:
+            if self._map.closed:
+                return
+            head, tail = self._head, self._tail
+            while tail + length - head > self.capacity:
+                head += self._length_at(head)
+            if head != self._head:
+                # Publish the eviction before the old bytes are overwritten
+                _POSITIONS.pack_into(self._map, _POSITIONS_OFFSET, head, tail)
+                self._head = head
+            self._write_at(tail, data)
+            self._tail = tail + length
+            _POSITIONS.pack_into(self._map, _POSITIONS_OFFSET, head, self._tail)
+
+    def records(self, last: int = None):
+        """
+        Decoded records in the ring, oldest first (only the `last` N if given).
+        """
+        with self._lock:
+            snapshot = bytes(self._map)
+        return _decode(snapshot, last)
+
+    def dump(self, last: int = None, path: str = None) -> str:
+        """
+        Writes the last records to a JSON-lines file and returns its path.
+        """
+        path = path or f"{self.path}.{os.getpid()}.{int(time.time())}.jsonl"
+        with open(path, "w", encoding="utf-8") as out:
+            for entry in self.records(last):
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return path
+
+    def close(self, unlink: bool = False):
+        """
+        Unmaps the ring; `unlink` also deletes the file.
+        """
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_ring(data, capacity, position, size):
+    offset = position % capacity
+    start = _HEADER.size + offset
+    first = min(size, capacity - offset)
+    chunk = bytes(data[start : start + first])
+    if first < size:
+        chunk += bytes(data[_HEADER.size : _HEADER.size + size - first])
+    return chunk
+
+
+_LOCAL = threading.local()  # One reusable msgpack Packer per thread
+
+
+def _pack(value) -> bytes:
+    packer = getattr(_LOCAL, "packer", None)
+    if packer is None:
+        packer = _LOCAL.packer = msgpack.Packer(default=str)
+    try:
+        return packer.pack(value)
+    except Exception:
+        _LOCAL.packer = None  # Do not reuse a half-filled buffer
+        raise
+
+
+def _message(body: bytes, packed: bool) -> str:
+    if not packed:
+        return body.decode("utf-8", "replace")
+    try:
+        msg, args = msgpack.unpackb(body, strict_map_key=False)
+    except Exception:
+        return body.decode("utf-8", "replace")
+    return _format_message(msg, tuple(args) if isinstance(args, list) else args)
+
+
+def _decode(data, last=None):
+    magic, capacity, head, tail = _HEADER.unpack_from(data, 0)
+    if magic not in (_MAGIC, _TEXT_MAGIC):
+        raise ValueError("Not a HESTIA flight recorder file")
+    packed = magic == _MAGIC
+    entries = []
+    position = head
+    while position + _RECORD.size <= tail:
+        length, created, levelno, name_length = _RECORD.unpack(
+            _read_ring(data, capacity, position, _RECORD.size)
+        )
+        if length < _RECORD.size + name_length or position + length > tail:
+            break  # Torn or corrupted record: keep what was decoded so far
+        body = _read_ring(
+            data, capacity, position + _RECORD.size, length - _RECORD.size
+        )
+        entries.append(
+            _entry(
+                created,
+                levelno,
+                body[:name_length].decode("utf-8", "replace"),
+                _message(body[name_length:], packed),
+            )
+        )
+        position += length
+    return entries[-last:] if last else entries
+
+
+def read_flight_records(path: str, last: int = None):
+    """
+    Recovers the records of a flight recorder file, e.g. after a crash.
+    """
+    with open(path, "rb") as stream:
+        return _decode(stream.read(), last)
+
+
+def install_dump_signal(recorder: FlightRecorder, signum, last: int = None):
+    """
+    Dumps the last `last` records whenever the process receives `signum`.
+    Must be called from the main thread.
+    """
+
+    def handle(signo, frame):
+        # Dump off the signal frame: the interrupted code may hold the ring lock
+        threading.Thread(
+            target=recorder.dump,
+            kwargs={"last": last},
+            name="hestia-flight-dump",
+            daemon=True,
+        ).start()
+
+    return signal.signal(signum, handle)
+
+
+def prune_rings(template: str, keep: int):
+    """
+    Deletes all but the newest `keep` rings (and `.1` backups) of exited
+    processes among the files matching `template`, a path with `{pid}`.
+    Rings of running processes are never touched.
+    """
+    pattern = re.compile(
+        re.escape(template).replace(re.escape("{pid}"), r"(\d+)") + r"(?:\.1)?"
+    )
+    exited = []
+    for path in glob.glob(glob.escape(template).replace("{pid}", "*") + "*"):
+        match = pattern.fullmatch(path)
+        if match is None or _alive(int(match.group(1))):
+            continue
+        try:
+            exited.append((os.path.getmtime(path), path))
+        except OSError:
+            pass
+    exited.sort(reverse=True)
+    for _, path in exited[max(keep, 0) :]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid() or os.name == "nt":  # Signal 0 is CTRL_C_EVENT there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # e.g. PermissionError: it exists
+        return True
+    return True
@@ -8,10 +8,18 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 import json
 import logging
 import datetime
-from ..core.config import ENVIRONMENT, HOSTNAME, APP_VERSION
+from ..core.config import ENVIRONMENT, HOSTNAME, APP_VERSION, LOG_REDACT_IN_FORMATTER
+from ..core.exception_info import structured_exception
+from ..core.redaction import default_redactor
 
 
 class JSONFormatter(logging.Formatter):
+    def __init__(self, *args, redact=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if redact is None:
+            redact = LOG_REDACT_IN_FORMATTER
+        self.redactor = default_redactor() if redact else None
+
     def formatTime(self, record, datefmt=None):
         # Convert the timestamp float to a UTC datetime
         dt = datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
@@ -22,7 +30,10 @@ class JSONFormatter(logging.Formatter):
             s = dt.isoformat()
         return s
 
-    def format(self, record):
+    def build_entry(self, record) -> dict:
+        """
+        Builds the structured log entry for a record, before JSON encoding.
+        """
         # 1. Message content extraction
         if isinstance(record.msg, dict):
             message_content = record.msg
@@ -56,5 +67,19 @@ class JSONFormatter(logging.Formatter):
         # 4. Merge the message payload
         log_entry.update(message_content)
 
-        # 5. Serialize to JSON (ensure Unicode like emojis is preserved)
-        return json.dumps(log_entry, ensure_ascii=False)
+        # 5. Attach the exception as structured data (rendered on the writer
+        #    thread for queued sinks, frames cached per code path)
+        if record.exc_info:
+            exception = structured_exception(record.exc_info)
+            if exception is not None:
+                log_entry["exception"] = exception
+
+        # 6. Mask sensitive keys/values for every sink (LOG_REDACT_IN_FORMATTER)
+        if self.redactor is not None:
+            log_entry = self.redactor.redact(log_entry)
+
+        return log_entry
+
+    def format(self, record):
+        # 7. Serialize to JSON (ensure Unicode like emojis is preserved)
+        return json.dumps(self.build_entry(record), ensure_ascii=False)
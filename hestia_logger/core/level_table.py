@@ -0,0 +1,103 @@
+"""
+HESTIA Logger - Level Overrides.
+
+Compiles a `HESTIA_LEVELS` override spec such as
+`api_service=DEBUG,database_*=WARNING` into a level table.
+
+Exact names are looked up in a dict; glob rules are compiled into a single
+regular expression whose alternatives are ordered from most to least
+specific, so one match finds the winning rule however many rules there are.
+Each logger name is resolved once and the result is cached. The level is
+then set on the logger itself, which keeps `isEnabledFor` a plain integer
+compare.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import fnmatch
+import re
+
+from ..core.config import LOG_LEVELS
+from ..internal_logger import hestia_internal_logger
+
+__all__ = ["LevelTable", "parse_level_spec"]
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def _parse_level(value: str):
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    return LOG_LEVELS.get(value.upper())
+
+
+def parse_level_spec(spec: str):
+    """
+    Parses `name=LEVEL,pattern*=LEVEL` into `(pattern, level)` rules.
+    """
+    rules = []
+    for item in (spec or "").replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        pattern, _, value = item.partition("=")
+        level = _parse_level(value)
+        if not pattern.strip() or level is None:
+            hestia_internal_logger.error(
+                f"Ignoring invalid HESTIA_LEVELS rule: {item!r}"
+            )
+            continue
+        rules.append((pattern.strip(), level))
+    return rules
+
+
+class LevelTable:
+    """
+    Resolves logger names to override levels (or `None` when no rule matches).
+
+    Exact names beat globs; between globs, the one with more literal
+    characters wins, and later rules win ties.
+    """
+
+    def __init__(self, spec: str = ""):
+        self.spec = spec or ""
+        self.rules = parse_level_spec(self.spec)
+        self._exact = {}
+        globs = []
+        for index, (pattern, level) in enumerate(self.rules):
+            if _GLOB_CHARS.search(pattern):
+                literal = len(_GLOB_CHARS.sub("", pattern))
+                globs.append((-literal, -index, pattern, level))
+            else:
+                self._exact[pattern] = level
+        globs.sort()
+        self._glob_levels = {f"r{i}": g[3] for i, g in enumerate(globs)}
+        self._globs = (
+            re.compile(
+                "|".join(
+                    f"(?P<r{i}>{fnmatch.translate(g[2])})" for i, g in enumerate(globs)
+                )
+            )
+            if globs
+            else None
+        )
+        self._resolved = {}
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def level_for(self, name: str):
+        """
+        Returns the override level for `name`, or `None`.
+        """
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        level = self._exact.get(name)
+        if level is None and self._globs is not None:
+            match = self._globs.match(name)
+            if match is not None:
+                level = self._glob_levels[match.lastgroup]
+        self._resolved[name] = level
+        return level
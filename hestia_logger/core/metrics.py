@@ -0,0 +1,248 @@
+"""
+HESTIA Logger - Pipeline Metrics.
+
+Keeps cheap counters and latency histograms for every HESTIA sink (async
+queue workers, Elasticsearch, `AsyncFileLogger`) and exposes them through
+`stats()` and a Prometheus text-format exposition.
+
+Counters are plain attributes updated without locks; the hot ones are only
+touched by the sink's own writer thread, so the logging path stays lock-free.
+
+Outbound HTTP calls (`hestia_logger.utils.http_client`) get a request count
+and latency histogram per host, exposed through `http_stats()`.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import bisect
+import threading
+
+__all__ = [
+    "SinkMetrics",
+    "register_sink",
+    "unregister_sink",
+    "stats",
+    "observe_http",
+    "http_stats",
+    "prometheus_text",
+]
+
+# Latency bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_SINKS = {}
+_HOSTS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (single writer).
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = total
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class SinkMetrics:
+    """
+    Counters and write-latency histogram for one sink.
+    """
+
+    def __init__(self, name: str, kind: str, queue=None):
+        self.name = name
+        self.kind = kind
+        self.queue = queue
+        self.records_written = 0
+        self.records_dropped = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+        self.batches = 0
+        self.queue_high_watermark = 0
+        self.write_latency = Histogram()
+
+    def observe_queue(self):
+        if self.queue is not None:
+            depth = self.queue.qsize()
+            if depth > self.queue_high_watermark:
+                self.queue_high_watermark = depth
+
+    def record_write(self, records: int, nbytes: int, seconds: float):
+        self.records_written += records
+        self.bytes_written += nbytes
+        self.batches += 1
+        self.write_latency.observe(seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_high_watermark": self.queue_high_watermark,
+            "records_written": self.records_written,
+            "records_dropped": self.records_dropped,
+            "bytes_written": self.bytes_written,
+            "write_errors": self.write_errors,
+            "batches": self.batches,
+            "write_latency_seconds": self.write_latency.snapshot(),
+        }
+
+
+class HostMetrics:
+    """
+    Request count and latency histogram for one outbound HTTP host.
+    """
+
+    __slots__ = ("requests", "errors", "latency", "lock")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.lock = threading.Lock()  # Any thread may call out to the host
+
+    def observe(self, seconds: float, failed: bool):
+        with self.lock:
+            self.requests += 1
+            self.errors += failed
+            self.latency.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "latency_seconds": self.latency.snapshot(),
+            }
+
+
+def register_sink(name: str, kind: str, queue=None) -> SinkMetrics:
+    """
+    Creates (or replaces) the metrics entry for a sink.
+    """
+    metrics = SinkMetrics(name, kind, queue)
+    with _REGISTRY_LOCK:
+        _SINKS[name] = metrics
+    return metrics
+
+
+def unregister_sink(metrics: SinkMetrics):
+    with _REGISTRY_LOCK:
+        if _SINKS.get(metrics.name) is metrics:
+            del _SINKS[metrics.name]
+
+
+def stats() -> dict:
+    """
+    Returns a point-in-time snapshot of every registered sink.
+    """
+    with _REGISTRY_LOCK:
+        sinks = list(_SINKS.values())
+    return {metrics.name: metrics.snapshot() for metrics in sinks}
+
+
+def observe_http(host: str, seconds: float, failed: bool = False):
+    """
+    Records one outbound HTTP call (failed: transport error or 5xx).
+    """
+    metrics = _HOSTS.get(host)
+    if metrics is None:
+        with _REGISTRY_LOCK:
+            metrics = _HOSTS.setdefault(host, HostMetrics())
+    metrics.observe(seconds, failed)
+
+
+def http_stats() -> dict:
+    """
+    Returns a point-in-time snapshot of every outbound HTTP host.
+    """
+    with _REGISTRY_LOCK:
+        hosts = list(_HOSTS.items())
+    return {host: metrics.snapshot() for host, metrics in hosts}
+
+
+_COUNTERS = (
+    ("records_written", "Records written by the sink."),
+    ("records_dropped", "Records dropped before reaching the sink."),
+    ("bytes_written", "Bytes written by the sink."),
+    ("write_errors", "Failed sink writes."),
+    ("batches", "Write batches flushed by the sink."),
+)
+_GAUGES = (
+    ("queue_depth", "Records waiting in the sink queue."),
+    ("queue_high_watermark", "Highest queue depth observed by the writer."),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """
+    Renders `stats()` in the Prometheus text exposition format (version 0.0.4).
+    """
+    snapshot = stats()
+    lines = []
+    for key, help_text in _COUNTERS:
+        lines.append(f"# HELP hestia_{key}_total {help_text}")
+        lines.append(f"# TYPE hestia_{key}_total counter")
+        for name, sink in snapshot.items():
+            lines.append(f'hestia_{key}_total{{sink="{_escape(name)}"}} {sink[key]}')
+    for key, help_text in _GAUGES:
+        lines.append(f"# HELP hestia_{key} {help_text}")
+        lines.append(f"# TYPE hestia_{key} gauge")
+        for name, sink in snapshot.items():
+            lines.append(f'hestia_{key}{{sink="{_escape(name)}"}} {sink[key]}')
+
+    metric = "hestia_write_latency_seconds"
+    lines.append(f"# HELP {metric} Sink write latency per batch.")
+    lines.append(f"# TYPE {metric} histogram")
+    for name, sink in snapshot.items():
+        label = _escape(name)
+        histogram = sink["write_latency_seconds"]
+        for bound, count in histogram["buckets"].items():
+            lines.append(f'{metric}_bucket{{sink="{label}",le="{bound}"}} {count}')
+        lines.append(f'{metric}_sum{{sink="{label}"}} {histogram["sum"]}')
+        lines.append(f'{metric}_count{{sink="{label}"}} {histogram["count"]}')
+
+    hosts = http_stats()
+    if hosts:
+        for key, help_text in (
+            ("requests", "Outbound HTTP requests."),
+            ("errors", "Outbound HTTP requests that failed or got a 5xx."),
+        ):
+            lines.append(f"# HELP hestia_http_client_{key}_total {help_text}")
+            lines.append(f"# TYPE hestia_http_client_{key}_total counter")
+            for host, entry in hosts.items():
+                lines.append(
+                    f'hestia_http_client_{key}_total{{host="{_escape(host)}"}} '
+                    f"{entry[key]}"
+                )
+        metric = "hestia_http_client_duration_seconds"
+        lines.append(f"# HELP {metric} Outbound HTTP request duration.")
+        lines.append(f"# TYPE {metric} histogram")
+        for host, entry in hosts.items():
+            label = _escape(host)
+            histogram = entry["latency_seconds"]
+            for bound, count in histogram["buckets"].items():
+                lines.append(f'{metric}_bucket{{host="{label}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{host="{label}"}} {histogram["sum"]}')
+            lines.append(f'{metric}_count{{host="{label}"}} {histogram["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,200 @@
+"""
+HESTIA Logger - Sampled Profiling.
+
+Runs a sampled fraction of `log_execution` calls under `cProfile` and/or
+`tracemalloc` and turns the result into structured fields for the
+completion record:
+
+    "profile":     [{"function": "app.py:12(load)", "calls": 3,
+                     "cumulative_ms": 41.2, "own_ms": 2.0}, ...]
+    "allocations": [{"site": "app.py:20", "size_kb": 512.0, "count": 4096}, ...]
+
+Both tools are process-wide, so one sampled call at a time uses each; a call
+sampled while another holds it simply goes unprofiled. Profiles of each
+function are added into a `pstats.Stats` aggregate that a background thread
+dumps to `LOG_PROFILE_DIR/<function>.pstats` every
+`LOG_PROFILE_DUMP_INTERVAL` seconds (open it with `python -m pstats`).
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+
+from ..internal_logger import hestia_internal_logger
+from ..core.custom_logger import get_logger
+from ..core.config import (
+    LOG_PROFILE_TOP,
+    LOG_PROFILE_DUMP_INTERVAL,
+    LOG_PROFILE_DIR,
+    LOG_TRACEMALLOC_FRAMES,
+)
+
+__all__ = ["SampledCall", "dump_profiles"]
+
+_PROFILER_LOCK = threading.Lock()
+_TRACEMALLOC_LOCK = threading.Lock()
+
+_AGGREGATES = {}  # function -> [pstats.Stats, sampled calls]
+_AGGREGATES_LOCK = threading.Lock()
+_last_dump = time.monotonic()
+
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]")
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _label(function) -> str:
+    filename, line, name = function
+    if filename == "~":  # Built-in
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def _top_functions(stats: pstats.Stats, top: int):
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": _label(function),
+            "calls": calls,
+            "cumulative_ms": round(cumulative * 1000, 3),
+            "own_ms": round(own * 1000, 3),
+        }
+        for function, (_, calls, own, cumulative, _) in rows
+        if "_lsprof.Profiler" not in function[2]
+    ][:top]
+
+
+def _top_allocations(statistics, top: int):
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(getattr(stat, "size_diff", stat.size) / 1024, 3),
+            "count": getattr(stat, "count_diff", stat.count),
+        }
+        for stat in statistics[:top]
+    ]
+
+
+class SampledCall:
+    """
+    Profiles one call; `stop()` ends it and returns the record fields.
+    """
+
+    __slots__ = ("function", "_profiler", "_tracing", "_owns_tracing", "_baseline")
+
+    def __init__(self, function: str, profile: bool, trace_malloc: bool):
+        self.function = function
+        self._profiler = None
+        self._tracing = self._owns_tracing = False
+        self._baseline = None
+        # Allocation tracing starts first so the profile does not include it
+        if trace_malloc and _TRACEMALLOC_LOCK.acquire(blocking=False):
+            self._tracing = True
+            if tracemalloc.is_tracing():
+                # Someone else traces: report what this call added
+                self._baseline = tracemalloc.take_snapshot()
+            else:
+                self._owns_tracing = True
+                tracemalloc.start(LOG_TRACEMALLOC_FRAMES)
+        if profile and _PROFILER_LOCK.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # Another profiler is active
+                _PROFILER_LOCK.release()
+            else:
+                self._profiler = profiler
+
+    def stop(self) -> dict:
+        fields = {}
+        if self._profiler is not None:
+            self._profiler.disable()
+            _PROFILER_LOCK.release()
+            stats = pstats.Stats(self._profiler)
+            fields["profile"] = _top_functions(stats, LOG_PROFILE_TOP)
+            _aggregate(self.function, stats)
+            self._profiler = None
+        if self._tracing:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            if self._owns_tracing:
+                fields["peak_allocated_kb"] = round(
+                    tracemalloc.get_traced_memory()[1] / 1024, 3
+                )
+                tracemalloc.stop()
+                statistics = snapshot.statistics("lineno")
+            else:
+                baseline = self._baseline.filter_traces(_TRACE_FILTERS)
+                statistics = snapshot.compare_to(baseline, "lineno")
+            _TRACEMALLOC_LOCK.release()
+            fields["allocations"] = _top_allocations(statistics, LOG_PROFILE_TOP)
+            self._tracing = False
+            self._baseline = None
+        return fields
+
+
+def _aggregate(function: str, stats: pstats.Stats):
+    global _last_dump
+    with _AGGREGATES_LOCK:
+        entry = _AGGREGATES.get(function)
+        if entry is None:
+            _AGGREGATES[function] = [stats, 1]
+        else:
+            entry[0].add(stats)
+            entry[1] += 1
+        due = (
+            LOG_PROFILE_DUMP_INTERVAL
+            and time.monotonic() - _last_dump >= LOG_PROFILE_DUMP_INTERVAL
+        )
+        if due:
+            _last_dump = time.monotonic()
+    if due:
+        # Writing the files must not hold up the profiled request
+        threading.Thread(
+            target=_dump_in_background, name="hestia-profile-dump", daemon=True
+        ).start()
+
+
+def _dump_in_background():
+    try:
+        dump_profiles()
+    except Exception as e:
+        hestia_internal_logger.error(f"Could not dump profiles: {e}")
+
+
+def dump_profiles(directory: str = None) -> list:
+    """
+    Writes each function's aggregate profile to `<directory>/<function>.pstats`
+    (default `LOG_PROFILE_DIR`), logs a summary record per function and
+    returns the summaries.
+    """
+    directory = directory or LOG_PROFILE_DIR
+    with _AGGREGATES_LOCK:
+        aggregates = [(name, entry[0], entry[1]) for name, entry in _AGGREGATES.items()]
+    if not aggregates:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    app_logger = get_logger("app", internal=True)
+    summaries = []
+    for function, stats, calls in aggregates:
+        path = os.path.join(directory, _UNSAFE_FILENAME.sub("_", function) + ".pstats")
+        with _AGGREGATES_LOCK:  # `add()` may be running for a new sample
+            stats.dump_stats(path)
+            top = _top_functions(stats, LOG_PROFILE_TOP)
+        summary = {
+            "event": "profile_aggregate",
+            "function": function,
+            "sampled_calls": calls,
+            "file": path,
+            "profile": top,
+        }
+        app_logger.info(summary)
+        summaries.append(summary)
+    return summaries
@@ -0,0 +1,228 @@
+"""
+HESTIA Logger - Redaction Engine.
+
+Masks sensitive data in log payloads in a single pass:
+
+- Key rules (`password`, `*_token`, ...) are matched case-insensitively.
+  Exact names go in a set and globs are compiled into one regular
+  expression. Each key's decision is cached, so a key seen before costs one
+  dict lookup.
+- Value patterns (emails, bearer tokens, card numbers) are compiled into one
+  alternation and scanned over string values. Card numbers must start with
+  a card network prefix and pass the Luhn check; `card` is still off by
+  default, as numeric IDs of card length pass both checks often enough.
+- Containers are copy-on-write: the input is returned unchanged (same
+  object) when nothing is masked, and only the containers on the path to a
+  masked value are copied.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import fnmatch
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from ..core.config import (
+    LOG_REDACT_KEYS,
+    LOG_REDACT_PATTERNS,
+    LOG_REDACT_MASK,
+)
+
+__all__ = ["Redactor", "VALUE_PATTERNS", "default_redactor", "redact"]
+
+# Built-in value patterns, selectable by name in `LOG_REDACT_PATTERNS`
+VALUE_PATTERNS = {
+    # Lookbehinds keep the engine from retrying inside a word or digit run
+    "email": r"(?<![\w.%+-])[\w.%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "bearer": r"\b[Bb][Ee][Aa][Rr][Ee][Rr]\s+[A-Za-z0-9\-._~+/]+=*",
+    # 13-19 digits with a card network prefix (2-series Mastercard, Amex,
+    # Visa, Mastercard, Discover...); IDs and epoch timestamps start with 1
+    "card": r"(?<![\d-])(?:[3-6]\d|2[2-7])(?:[ -]?\d){11,17}(?!\d)",
+}
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_KEY_CACHE_SIZE = 4096
+_SCALARS = frozenset((int, float, bool, type(None)))
+
+
+def _luhn(digits: str) -> bool:
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if index % 2:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+class Redactor:
+    """
+    Masks values under sensitive keys and sensitive substrings in strings.
+    """
+
+    def __init__(self, keys=(), patterns=(), mask="***"):
+        self.mask = mask
+        self._exact = set()
+        globs = []
+        for key in keys:
+            key = key.strip().casefold()
+            if not key:
+                continue
+            if _GLOB_CHARS.search(key):
+                globs.append(fnmatch.translate(key))
+            else:
+                self._exact.add(key)
+        self._key_globs = re.compile("|".join(globs)) if globs else None
+        self._key_cache = {}
+
+        alternatives = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            if pattern in VALUE_PATTERNS:
+                alternatives.append(f"(?P<{pattern}>{VALUE_PATTERNS[pattern]})")
+            else:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    # Imported here: the internal logger itself uses JSONFormatter
+                    from ..internal_logger import hestia_internal_logger
+
+                    hestia_internal_logger.error(
+                        f"Ignoring invalid redaction pattern {pattern!r}: {e}"
+                    )
+                    continue
+                alternatives.append(f"(?:{pattern})")
+        self._values = re.compile("|".join(alternatives)) if alternatives else None
+
+    @property
+    def keys(self) -> set:
+        """
+        The exact (non-glob) sensitive keys, casefolded.
+        """
+        return self._exact
+
+    def is_sensitive_key(self, key) -> bool:
+        """
+        Whether values under `key` are masked (non-string keys never are).
+        """
+        try:
+            return self._key_cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable keys cannot be dict keys anyway
+            return False
+        if isinstance(key, str):
+            folded = key.casefold()
+            sensitive = folded in self._exact or (
+                self._key_globs is not None
+                and self._key_globs.fullmatch(folded) is not None
+            )
+        else:
+            sensitive = False
+        if len(self._key_cache) >= _KEY_CACHE_SIZE:
+            self._key_cache.clear()
+        self._key_cache[key] = sensitive
+        return sensitive
+
+    def _replace(self, match):
+        if match.lastgroup == "card":
+            digits = re.sub(r"[ -]", "", match.group())
+            if not _luhn(digits):
+                return match.group()
+        return self.mask
+
+    def redact_text(self, text: str) -> str:
+        """
+        Masks value-pattern matches in a string (the same object if none).
+        """
+        if self._values is None or self._values.search(text) is None:
+            return text
+        masked = self._values.sub(self._replace, text)
+        return masked if masked != text else text
+
+    def redact(self, obj):
+        """
+        Returns `obj` with sensitive data masked; unchanged parts are shared.
+        """
+        if isinstance(obj, str):
+            return self.redact_text(obj)
+        if isinstance(obj, dict):
+            copied = None
+            for key, value in obj.items():
+                if self.is_sensitive_key(key):
+                    new = self.mask
+                    if value is new:
+                        continue
+                elif type(value) in _SCALARS:
+                    continue
+                else:
+                    new = self.redact(value)
+                    if new is value:
+                        continue
+                if copied is None:
+                    copied = dict(obj)
+                copied[key] = new
+            return obj if copied is None else copied
+        if isinstance(obj, (list, tuple)):
+            copied = None
+            for index, value in enumerate(obj):
+                if type(value) in _SCALARS:
+                    continue
+                new = self.redact(value)
+                if new is value:
+                    continue
+                if copied is None:
+                    copied = list(obj)
+                copied[index] = new
+            if copied is None:
+                return obj
+            if isinstance(obj, list):
+                return copied
+            if hasattr(obj, "_fields"):  # namedtuple
+                return type(obj)(*copied)
+            return type(obj)(copied)
+        if isinstance(obj, (set, frozenset)):
+            items = [self.redact(value) for value in obj]
+            if all(new is old for new, old in zip(items, obj)):
+                return obj
+            return type(obj)(items)
+        return obj
+
+    def redact_query(self, query: str) -> str:
+        """
+        Masks sensitive parameters of a URL query string.
+        """
+        if not query:
+            return query
+        pairs = parse_qsl(query, keep_blank_values=True)
+        masked = [
+            (key, self.mask if self.is_sensitive_key(key) else self.redact_text(value))
+            for key, value in pairs
+        ]
+        if masked == pairs:
+            return query
+        return urlencode(masked, safe="*@")
+
+
+_DEFAULT = None
+
+
+def default_redactor() -> Redactor:
+    """
+    The redactor configured by `LOG_REDACT_KEYS`/`LOG_REDACT_PATTERNS`.
+    """
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Redactor(LOG_REDACT_KEYS, LOG_REDACT_PATTERNS, LOG_REDACT_MASK)
+    return _DEFAULT
+
+
+def redact(obj):
+    """
+    Masks `obj` with the default redactor.
+    """
+    return default_redactor().redact(obj)
@@ -0,0 +1,201 @@
+"""
+HESTIA Logger - Runtime Configuration.
+
+`config.py` exposes settings as constants read once at import. This module
+keeps the subset that can change while the process runs (levels, rotation,
+writer batching and the file/shipping sink settings) in an immutable
+`RuntimeConfig` snapshot that can be reloaded from the environment, a
+`.env` file or a signal (SIGHUP).
+
+A reload builds a new snapshot, swaps it in with a single reference
+assignment and hands `(old, new)` to the subscribers (the logger pipeline),
+which apply only what changed.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import os
+import signal
+import threading
+
+from dotenv import dotenv_values, find_dotenv
+
+from ..core.config import (
+    LOG_LEVELS,
+    LOG_LEVEL_STR,
+    LOG_ROTATION_MAX_BYTES,
+    LOG_ROTATION_BACKUP_COUNT,
+)
+from ..internal_logger import hestia_internal_logger
+
+__all__ = [
+    "RuntimeConfig",
+    "current",
+    "reload_config",
+    "subscribe",
+    "install_reload_signal",
+]
+
+
+def _level(value):
+    return LOG_LEVELS.get(str(value).strip().upper(), LOG_LEVELS["INFO"])
+
+
+def _bool(value):
+    return str(value).strip().lower() == "true"
+
+
+def _lower(value):
+    return str(value).strip().lower()
+
+
+def _optional_int(value):
+    return int(value) if str(value).strip() else None
+
+
+def _key_list(value):
+    return tuple(key.strip() for key in str(value).split(",") if key.strip())
+
+
+# Reloadable settings: env name -> (parser, default). This is the only place
+# the settings below are read from the environment.
+SETTINGS = {
+    "LOG_LEVEL": (_level, LOG_LEVEL_STR),
+    # Per-logger overrides with globs, e.g. "api_service=DEBUG,database_*=WARNING"
+    "HESTIA_LEVELS": (str.strip, ""),
+    "LOG_ROTATION_MAX_BYTES": (int, LOG_ROTATION_MAX_BYTES),
+    "LOG_ROTATION_BACKUP_COUNT": (int, LOG_ROTATION_BACKUP_COUNT),
+    "LOG_WRITER_BATCH_SIZE": (int, 256),
+    # `app` sink: "json" (app.log) or "binary" (app.hlog, `hestia-logger cat`)
+    "LOG_FILE_FORMAT": (_lower, "json"),
+    # JSON `app` and service text sinks: none, gzip or zstd (`zstandard`)
+    "LOG_FILE_COMPRESSION": (_lower, "none"),
+    "LOG_COMPRESSION_LEVEL": (_optional_int, ""),
+    "LOG_COMPRESSION_FRAME_KB": (int, 64),
+    "LOG_COMPRESSION_FRAME_MS": (int, 1000),
+    # Sparse index of the JSON `app` sink (see `hestia-logger query`)
+    "LOG_INDEX_ENABLED": (_bool, "false"),
+    "LOG_INDEX_INTERVAL": (int, 1000),
+    "LOG_INDEX_BLOOM_KEYS": (_key_list, "request_id,service"),
+    # With a host or Unix socket set, `app` records are shipped over the
+    # Forward protocol and app.log is only written when shipping fails
+    "FLUENT_FORWARD_HOST": (str.strip, ""),
+    "FLUENT_FORWARD_PORT": (int, 24224),
+    "FLUENT_FORWARD_SOCKET": (str.strip, ""),
+    "FLUENT_FORWARD_TAG": (str, "hestia"),
+    "FLUENT_FORWARD_COMPRESS": (_bool, "false"),
+    "FLUENT_FORWARD_ACK": (_bool, "false"),
+}
+
+# Settings that require the file/shipping sinks to be rebuilt
+SINK_SETTINGS = frozenset(
+    key
+    for key in SETTINGS
+    if key.startswith(("LOG_FILE_", "LOG_COMPRESSION_", "LOG_INDEX_", "FLUENT_"))
+)
+
+
+class RuntimeConfig:
+    """
+    Immutable snapshot of the reloadable settings, one attribute per env name.
+    """
+
+    __slots__ = tuple(SETTINGS)
+
+    def __init__(self, values=None):
+        values = os.environ if values is None else values
+        for key, (parse, default) in SETTINGS.items():
+            raw = values.get(key)
+            try:
+                value = parse(default if raw is None else raw)
+            except (TypeError, ValueError):
+                hestia_internal_logger.error(
+                    f"Invalid value for {key}: {raw!r}; using {default!r}"
+                )
+                value = parse(default)
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("RuntimeConfig is immutable; use reload_config()")
+
+    def diff(self, other) -> set:
+        """
+        Names of the settings whose value differs in `other`.
+        """
+        return {key for key in SETTINGS if getattr(self, key) != getattr(other, key)}
+
+
+_CURRENT = RuntimeConfig()
+_SUBSCRIBERS = {}
+_RELOAD_LOCK = threading.Lock()
+
+
+def current() -> RuntimeConfig:
+    """
+    Returns the active runtime configuration.
+    """
+    return _CURRENT
+
+
+def subscribe(name: str, callback):
+    """
+    Registers `callback(old, new)` to run after each reload (replaces `name`).
+    """
+    _SUBSCRIBERS[name] = callback
+
+
+def reload_config(path: str = None, values: dict = None) -> set:
+    """
+    Rebuilds the runtime configuration and applies it.
+
+    Values come from the process environment overlaid with the `.env` file at
+    `path` (default: the nearest `.env` from the working directory), or from
+    `values` when given. Returns the names of the settings that changed.
+    """
+    global _CURRENT
+    if values is None:
+        values = dict(os.environ)
+        env_file = path or find_dotenv(usecwd=True)
+        if env_file:
+            try:
+                values.update(
+                    {k: v for k, v in dotenv_values(env_file).items() if v is not None}
+                )
+            except OSError as e:
+                hestia_internal_logger.error(f"Could not read {env_file}: {e}")
+
+    with _RELOAD_LOCK:
+        old, new = _CURRENT, RuntimeConfig(values)
+        changed = old.diff(new)
+        if not changed:
+            return changed
+        _CURRENT = new
+        for name, callback in list(_SUBSCRIBERS.items()):
+            try:
+                callback(old, new)
+            except Exception as e:
+                hestia_internal_logger.error(f"ERROR APPLYING CONFIG ({name}): {e}")
+
+    hestia_internal_logger.info(f"Reloaded logging configuration: {sorted(changed)}")
+    return changed
+
+
+def install_reload_signal(path: str = None, signum=None):
+    """
+    Reloads the configuration whenever the process receives `signum`
+    (SIGHUP by default). Must be called from the main thread.
+    """
+    signum = signum if signum is not None else getattr(signal, "SIGHUP", None)
+    if signum is None:  # pragma: no cover - Windows has no SIGHUP
+        raise RuntimeError("SIGHUP is not available on this platform")
+
+    def handle(signo, frame):
+        # Reload off the signal frame: the interrupted code may hold handler locks
+        threading.Thread(
+            target=reload_config,
+            kwargs={"path": path},
+            name="hestia-config-reload",
+            daemon=True,
+        ).start()
+
+    return signal.signal(signum, handle)
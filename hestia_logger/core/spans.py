@@ -0,0 +1,142 @@
+"""
+HESTIA Logger - Call-Tree Spans.
+
+`log_execution` opens a span per decorated call. The current span lives in
+a `contextvars.ContextVar`, so nested calls (sync, or async across `await`
+and into tasks, which copy the context) become its children. Records carry
+`trace_id`, `span_id` and `parent_span_id`. Each span adds its total time to
+its parent, so the parent's self time is what remains. Concurrent children
+can add up to more than the parent's wall time; self time is then clamped
+to 0.
+
+A tree root (`span_tree=True` or `LOG_SPAN_TREE`) collects its descendants
+instead of letting them log, then emits one record with the whole tree:
+
+    {"function": "handle", "span_id": "...", "start_ms": 0.0,
+     "total_ms": 12.5, "self_ms": 1.2, "status": "completed",
+     "children": [...]}
+
+A span that ends after its tree was emitted (a task that outlived the
+root) logs on its own.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import contextvars
+import random
+import time
+
+from ..core.config import LOG_SPAN_TREE_MAX_SPANS
+
+__all__ = ["Span", "start_span", "end_span", "current_span"]
+
+_CURRENT = contextvars.ContextVar("hestia_span", default=None)
+
+
+class Span:
+    """
+    One decorated call in a trace.
+    """
+
+    __slots__ = (
+        "function",
+        "span_id",
+        "trace_id",
+        "parent",
+        "collector",
+        "started",
+        "children_time",
+        "children",
+        "size",
+        "dropped",
+        "done",
+        "_token",
+    )
+
+    @property
+    def buffered(self) -> bool:
+        """Whether this span is collected into an enclosing tree."""
+        return self.collector is not None and self.collector is not self
+
+    @property
+    def tree(self) -> bool:
+        """Whether this span collects its descendants into one record."""
+        return self.collector is self
+
+    def ids(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent.span_id if self.parent else None,
+        }
+
+
+def current_span():
+    """
+    The innermost open span in this context, or `None`.
+    """
+    return _CURRENT.get()
+
+
+def start_span(function: str, tree: bool = False) -> Span:
+    """
+    Opens a span under the current one and makes it current.
+    """
+    parent = _CURRENT.get()
+    span = Span()
+    span.function = function
+    span.span_id = "%016x" % random.getrandbits(64)
+    span.parent = parent
+    span.trace_id = parent.trace_id if parent is not None else span.span_id
+    collector = parent.collector if parent is not None else None
+    if collector is not None and collector.done:
+        collector = None  # The tree was already emitted
+    span.collector = collector if collector is not None else (span if tree else None)
+    span.children_time = 0.0
+    span.children = []
+    span.size = span.dropped = 0
+    span.done = False
+    span.started = time.perf_counter()
+    span._token = _CURRENT.set(span)
+    return span
+
+
+def end_span(span: Span, error=None, extra: dict = None, status: str = None):
+    """
+    Closes a span and returns its self time in seconds; a buffered span is
+    added to its parent's children. Closing it again is a no-op.
+    """
+    if span.done:
+        return None
+    span.done = True
+    total = time.perf_counter() - span.started
+    try:
+        _CURRENT.reset(span._token)
+    except ValueError:  # Ended in another context than it started in
+        _CURRENT.set(span.parent)
+    own = max(0.0, total - span.children_time)
+    parent = span.parent
+    if parent is not None:
+        parent.children_time += total
+    if span.buffered:
+        collector = span.collector
+        if collector.size >= LOG_SPAN_TREE_MAX_SPANS:
+            collector.dropped += 1
+        else:
+            collector.size += 1
+            node = {
+                "function": span.function,
+                "span_id": span.span_id,
+                "start_ms": round((span.started - collector.started) * 1000, 3),
+                "total_ms": round(total * 1000, 3),
+                "self_ms": round(own * 1000, 3),
+                "status": status or ("error" if error is not None else "completed"),
+            }
+            if error is not None:
+                node["error"] = f"{type(error).__name__}: {error}"
+            if extra:
+                node.update(extra)
+            if span.children:
+                node["children"] = span.children
+            parent.children.append(node)
+    return own
@@ -0,0 +1,159 @@
+"""
+HESTIA Logger - Tail Sampling.
+
+Keeps the records a request logs below the logger level (e.g. DEBUG while the
+service runs at INFO) in a per-request ring buffer, keyed by the middleware's
+`request_id`. When the request fails (an exception or a 5xx response) the
+buffer is replayed to the sinks; otherwise it is dropped without a
+`LogRecord` ever being built or formatted.
+
+Buffered entries are compact tuples holding the raw message, arguments and
+caller location. A process-wide cap bounds the records held across all
+in-flight requests. Replayed records go to every handler whatever its level:
+service sinks run at the logger level, which is what kept them out.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import collections
+import contextvars
+import sys
+import threading
+import time
+
+from ..internal_logger import hestia_internal_logger
+from ..core.config import (
+    LOG_TAIL_SAMPLING_LEVEL,
+    LOG_TAIL_BUFFER_SIZE,
+    LOG_TAIL_MAX_RECORDS,
+)
+
+__all__ = ["TailBuffer", "begin_request", "end_request", "current_buffer"]
+
+_CURRENT = contextvars.ContextVar("hestia_tail_buffer", default=None)
+_LOCK = threading.Lock()
+_in_flight = 0  # Records held across all open buffers
+
+
+_NO_CALLER = ("(unknown file)", 0, "(unknown function)")
+
+
+def _replay(logger, record):
+    """
+    `Logger.handle` without the handler level checks.
+    """
+    if logger.disabled or not logger.filter(record):
+        return
+    current = logger
+    while current is not None:
+        for handler in current.handlers:
+            handler.handle(record)
+        if not current.propagate:
+            break
+        current = current.parent
+
+
+class TailBuffer:
+    """
+    Ring buffer of the below-level records logged while serving one request.
+    """
+
+    __slots__ = ("request_id", "level", "entries", "dropped")
+
+    def __init__(self, request_id, level=LOG_TAIL_SAMPLING_LEVEL, size=None):
+        self.request_id = request_id
+        self.level = level
+        self.entries = collections.deque(maxlen=size or LOG_TAIL_BUFFER_SIZE)
+        self.dropped = 0
+
+    def add(self, logger, level, msg, args, kwargs, caller=None):
+        """
+        Stores a record cheaply; no `LogRecord` is built until a flush.
+        `caller` is the `(filename, line, function)` of the logging call.
+        """
+        global _in_flight
+        full = len(self.entries) == self.entries.maxlen
+        if not full:
+            with _LOCK:
+                if _in_flight >= LOG_TAIL_MAX_RECORDS:
+                    self.dropped += 1
+                    return
+                _in_flight += 1
+        else:
+            self.dropped += 1  # The ring evicts the oldest entry
+
+        if isinstance(msg, dict):
+            msg = dict(msg)  # Callers may keep mutating their payload dict
+        exc_info = kwargs.get("exc_info")
+        if exc_info and not isinstance(exc_info, (tuple, BaseException)):
+            exc_info = sys.exc_info()
+        self.entries.append(
+            (
+                logger,
+                level,
+                msg,
+                args,
+                exc_info,
+                kwargs.get("extra"),
+                time.time(),
+                caller,
+            )
+        )
+
+    def release(self):
+        global _in_flight
+        with _LOCK:
+            _in_flight -= len(self.entries)
+        self.entries.clear()
+
+    def flush(self):
+        """
+        Builds and dispatches the buffered records, oldest first.
+        """
+        entries = list(self.entries)
+        self.release()
+        for logger, level, msg, args, exc_info, extra, created, caller in entries:
+            extra = dict(extra or {})
+            metadata = dict(extra.get("metadata") or {})
+            metadata.update(request_id=self.request_id, tail_sampled=True)
+            extra["metadata"] = metadata
+            fn, lno, func = caller or _NO_CALLER
+            record = logger.makeRecord(
+                logger.name, level, fn, lno, msg, args, exc_info, func, extra
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            _replay(logger, record)
+        if self.dropped:
+            hestia_internal_logger.warning(
+                f"Tail buffer for request {self.request_id} dropped "
+                f"{self.dropped} records (LOG_TAIL_BUFFER_SIZE/LOG_TAIL_MAX_RECORDS)"
+            )
+
+
+def current_buffer():
+    """
+    Returns the tail buffer of the request being served, if any.
+    """
+    return _CURRENT.get()
+
+
+def begin_request(request_id, level=LOG_TAIL_SAMPLING_LEVEL):
+    """
+    Opens a tail buffer for the current context; returns a token for `end_request`.
+    """
+    return _CURRENT.set(TailBuffer(request_id, level))
+
+
+def end_request(token, failed):
+    """
+    Closes the current buffer, flushing it to the sinks when `failed`.
+    """
+    buffer = _CURRENT.get()
+    _CURRENT.reset(token)
+    if buffer is None:
+        return
+    if failed:
+        buffer.flush()
+    else:
+        buffer.release()
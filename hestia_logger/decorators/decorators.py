@@ -1,11 +1,21 @@
 import functools
+import random
 import time
 import asyncio
-import traceback
 import logging
 from hestia_logger.core.custom_logger import get_logger
+from hestia_logger.core.exception_info import (
+    formatted_traceback,
+    structured_exception,
+)
+from hestia_logger.core.config import LOG_SPAN_TREE
+from hestia_logger.core.profiling import SampledCall
+from hestia_logger.core.spans import start_span, end_span
+from hestia_logger.core.redaction import default_redactor
+
+# Kept for compatibility: the default redactor's keys (see LOG_REDACT_KEYS)
+SENSITIVE_KEYS = default_redactor().keys
 
-SENSITIVE_KEYS = {"password", "token", "secret", "apikey", "api_key"}
 
 # Optional: Import known types for type-based redaction
 try:
@@ -21,19 +31,8 @@ except ImportError:
 
 
 def mask_sensitive_data(obj):
-    """Recursively masks sensitive keys in nested dicts/lists."""
-    if isinstance(obj, dict):
-        return {
-            k: "***" if k.lower() in SENSITIVE_KEYS else mask_sensitive_data(v)
-            for k, v in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [mask_sensitive_data(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(mask_sensitive_data(item) for item in obj)
-    elif isinstance(obj, set):
-        return {mask_sensitive_data(item) for item in obj}
-    return obj
+    """Masks sensitive keys and values in nested containers (see `core.redaction`)."""
+    return default_redactor().redact(obj)
 
 
 def sanitize_module_name(module_name):
@@ -79,12 +78,35 @@ def safe_serialize(obj, max_length=300):
         return repr(obj)
 
 
-def log_execution(func=None, *, logger_name=None, max_length=300):
-    """Logs function execution start, end, and duration."""
+def log_execution(
+    func=None,
+    *,
+    logger_name=None,
+    max_length=300,
+    profile_sample_rate=0.0,
+    trace_malloc_sample_rate=0.0,
+    span_tree=None,
+):
+    """Logs function execution start, end, and duration.
+
+    A `profile_sample_rate` / `trace_malloc_sample_rate` fraction of calls
+    runs under cProfile / tracemalloc and adds the top functions /
+    allocation sites to the completion record (see `core.profiling`).
+
+    Nested decorated calls are linked by trace/span/parent ids. With
+    `span_tree=True` (default: `LOG_SPAN_TREE`) a root call emits its whole
+    call tree as one completion record instead of 2 records per call (see
+    `core.spans`).
+    """
 
     if func is None:
         return lambda f: log_execution(
-            f, logger_name=logger_name, max_length=max_length
+            f,
+            logger_name=logger_name,
+            max_length=max_length,
+            profile_sample_rate=profile_sample_rate,
+            trace_malloc_sample_rate=trace_malloc_sample_rate,
+            span_tree=span_tree,
         )
 
     module_name = func.__module__
@@ -92,81 +114,146 @@ def log_execution(func=None, *, logger_name=None, max_length=300):
 
     service_logger = get_logger(logger_name or sanitized_name)
     app_logger = get_logger("app", internal=True)
+    qualified_name = f"{module_name}.{func.__qualname__}"
+    sample_rate = max(profile_sample_rate, trace_malloc_sample_rate)
+    span_tree = LOG_SPAN_TREE if span_tree is None else span_tree
+
+    def _sample():
+        # One draw decides both tools; unsampled calls cost nothing more
+        draw = random.random()
+        if draw >= sample_rate:
+            return None
+        return SampledCall(
+            qualified_name,
+            draw < profile_sample_rate,
+            draw < trace_malloc_sample_rate,
+        )
+
+    def _stop(sampled):
+        return sampled.stop() if sampled is not None else None
 
     def _build_log_entry(args, kwargs):
-        masked_kwargs = mask_sensitive_data(kwargs)
+        # Serialize first so attributes of objects are masked too
         return {
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.Z", time.gmtime()),
             "service": service_logger.name,
             "function": func.__name__,
             "status": "started",
-            "args": safe_serialize(mask_sensitive_data(args), max_length),
-            "kwargs": safe_serialize(masked_kwargs, max_length),
+            "args": mask_sensitive_data(safe_serialize(args, max_length)),
+            "kwargs": mask_sensitive_data(safe_serialize(kwargs, max_length)),
         }
 
-    def _log_success(log_entry, duration, result, service_info_enabled):
+    def _begin(args, kwargs):
+        span = start_span(qualified_name, span_tree)
+        if span.buffered:
+            # Part of an enclosing call tree: reported with its root
+            return span, None, False
+        try:
+            app_info_enabled = app_logger.isEnabledFor(logging.INFO)
+            service_info_enabled = service_logger.isEnabledFor(logging.INFO)
+            log_entry = _build_log_entry(args, kwargs) if app_info_enabled else None
+            if log_entry is not None:
+                log_entry.update(span.ids())
+                if not span.tree:
+                    app_logger.info(log_entry)
+            if service_info_enabled and not span.tree:
+                service_logger.info(f"Started: {func.__name__}()")
+        except BaseException:
+            end_span(span)
+            raise
+        return span, log_entry, service_info_enabled
+
+    def _add_tree(entry, span):
+        if span.tree:
+            entry["spans"] = span.children
+            if span.dropped:
+                entry["spans_dropped"] = span.dropped
+
+    def _log_success(
+        span, log_entry, duration, result, service_info_enabled, profile
+    ):
+        own = end_span(span, extra=profile)
+        if span.buffered:
+            return
         if log_entry is not None:
             log_entry.update(
                 {
                     "status": "completed",
                     "duration": f"{duration:.4f} sec",
-                    "result": safe_serialize(mask_sensitive_data(result), max_length),
+                    "self_duration": f"{own:.4f} sec",
+                    "result": mask_sensitive_data(safe_serialize(result, max_length)),
                 }
             )
+            _add_tree(log_entry, span)
+            if profile:
+                log_entry.update(profile)
             app_logger.info(log_entry)
         if service_info_enabled:
             service_logger.info(f"Finished: {func.__name__}() in {duration:.4f} sec")
 
-    def _log_error(log_entry, error, args, kwargs):
-        entry = log_entry if log_entry is not None else _build_log_entry(args, kwargs)
-        entry.update(
+    def _log_error(span, log_entry, error, args, kwargs, profile):
+        own = end_span(span, error=error, extra=profile)
+        if span.buffered:
+            return  # The root reports it, with the exception if it propagates
+        if log_entry is None:
+            log_entry = _build_log_entry(args, kwargs)
+            log_entry.update(span.ids())
+        log_entry.update(
             {
                 "status": "error",
                 "error": str(error),
-                "traceback": traceback.format_exc(),
+                "traceback": formatted_traceback(error),
+                "exception": structured_exception(error),
             }
         )
-        app_logger.error(entry)
+        if own is not None:
+            log_entry["self_duration"] = f"{own:.4f} sec"
+        _add_tree(log_entry, span)
+        if profile:
+            log_entry.update(profile)
+        app_logger.error(log_entry)
         service_logger.error(f"Error in {func.__name__}: {error}")
 
     @functools.wraps(func)
     async def async_wrapper(*args, **kwargs):
         start_time = time.time()
-        app_info_enabled = app_logger.isEnabledFor(logging.INFO)
-        service_info_enabled = service_logger.isEnabledFor(logging.INFO)
-        log_entry = _build_log_entry(args, kwargs) if app_info_enabled else None
-        if log_entry is not None:
-            app_logger.info(log_entry)
-        if service_info_enabled:
-            service_logger.info(f"Started: {func.__name__}()")
+        span, log_entry, service_info_enabled = _begin(args, kwargs)
 
+        sampled = _sample() if sample_rate else None
         try:
             result = await func(*args, **kwargs)
             duration = time.time() - start_time
-            _log_success(log_entry, duration, result, service_info_enabled)
+            profile = _stop(sampled)
+            _log_success(
+                span, log_entry, duration, result, service_info_enabled, profile
+            )
             return result
         except Exception as error:  # pragma: no cover - re-raised after logging
-            _log_error(log_entry, error, args, kwargs)
+            _log_error(span, log_entry, error, args, kwargs, _stop(sampled))
             raise
+        finally:
+            _stop(sampled)  # Cancelled/interrupted calls release the profiler
+            end_span(span, status="cancelled")
 
     @functools.wraps(func)
     def sync_wrapper(*args, **kwargs):
         start_time = time.time()
-        app_info_enabled = app_logger.isEnabledFor(logging.INFO)
-        service_info_enabled = service_logger.isEnabledFor(logging.INFO)
-        log_entry = _build_log_entry(args, kwargs) if app_info_enabled else None
-        if log_entry is not None:
-            app_logger.info(log_entry)
-        if service_info_enabled:
-            service_logger.info(f"Started: {func.__name__}()")
+        span, log_entry, service_info_enabled = _begin(args, kwargs)
 
+        sampled = _sample() if sample_rate else None
         try:
             result = func(*args, **kwargs)
             duration = time.time() - start_time
-            _log_success(log_entry, duration, result, service_info_enabled)
+            profile = _stop(sampled)
+            _log_success(
+                span, log_entry, duration, result, service_info_enabled, profile
+            )
             return result
         except Exception as error:
-            _log_error(log_entry, error, args, kwargs)
+            _log_error(span, log_entry, error, args, kwargs, _stop(sampled))
             raise
+        finally:
+            _stop(sampled)  # Cancelled/interrupted calls release the profiler
+            end_span(span, status="cancelled")
 
     return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
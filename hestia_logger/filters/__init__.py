@@ -0,0 +1,17 @@
+"""
+HESTIA Logger - Filters Module.
+
+Provides logging filters that reduce log volume before records are
+formatted and queued for the file and Elasticsearch sinks.
+
+Available Filters:
+- `DeduplicationFilter`: Suppresses bursts of repeated records.
+- `RateLimiter`: Token-bucket emission caps checked before records are built.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+from .dedup_filter import DeduplicationFilter
+from .rate_limiter import RateLimiter
+
+__all__ = ["DeduplicationFilter", "RateLimiter"]
@@ -0,0 +1,119 @@
+"""
+HESTIA Logger - Deduplication Filter.
+
+Suppresses bursts of identical records (same logger, level, message template
+and exception type). The first occurrence passes immediately; repeats inside
+the window are counted and reported by a single summary record.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ["DeduplicationFilter"]
+
+
+class _Window:
+    __slots__ = ("started", "count", "metadata")
+
+    def __init__(self, started, metadata):
+        self.started = started
+        self.count = 0
+        self.metadata = metadata
+
+
+class DeduplicationFilter(logging.Filter):
+    """
+    Logger filter that emits the first record of a burst and a repeat count
+    summary once the window closes. Tracked keys are bounded with LRU eviction.
+    """
+
+    def __init__(
+        self, window: float = 10.0, max_keys: int = 1024, clock=time.monotonic
+    ):
+        super().__init__()
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + window
+
+    @staticmethod
+    def _template(record):
+        msg = record.msg
+        if isinstance(msg, str):
+            return msg
+        if isinstance(msg, dict) and "message" in msg:
+            return str(msg["message"])
+        return None
+
+    def filter(self, record):
+        if getattr(record, "hestia_dedup_summary", False):
+            return True
+        template = self._template(record)
+        if template is None:
+            return True
+
+        # `exc_info=True` outside an `except` block gives (None, None, None)
+        exc_info = record.exc_info
+        exc_type = exc_info[0].__name__ if exc_info and exc_info[0] else None
+        key = (record.name, record.levelno, template, exc_type)
+        now = self._clock()
+        expired = []
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None and now - window.started < self.window:
+                window.count += 1
+                self._windows.move_to_end(key)
+                allow = False
+            else:
+                if window is not None:
+                    expired.append((key, self._windows.pop(key)))
+                self._windows[key] = _Window(now, getattr(record, "metadata", None))
+                while len(self._windows) > self.max_keys:
+                    expired.append(self._windows.popitem(last=False))
+                allow = True
+            if now >= self._next_sweep:
+                expired.extend(self._pop_expired(now))
+                self._next_sweep = now + self.window
+
+        self._emit_summaries(expired)
+        return allow
+
+    def _pop_expired(self, now):
+        keys = [k for k, w in self._windows.items() if now - w.started >= self.window]
+        return [(k, self._windows.pop(k)) for k in keys]
+
+    def flush(self):
+        """
+        Emits summaries for every open window and forgets all tracked keys.
+        """
+        with self._lock:
+            expired = list(self._windows.items())
+            self._windows.clear()
+        self._emit_summaries(expired)
+
+    def _emit_summaries(self, expired):
+        for (name, levelno, template, exc_type), window in expired:
+            if not window.count:
+                continue
+            logger = logging.getLogger(name)
+            summary = {
+                "message": f"Suppressed {window.count} duplicate(s): {template}",
+                "event": "log_dedup_summary",
+                "repeat_count": window.count,
+                "window_seconds": self.window,
+            }
+            if exc_type:
+                summary["exception_type"] = exc_type
+            extra = {"hestia_dedup_summary": True}
+            if window.metadata is not None:
+                extra["metadata"] = window.metadata
+            record = logger.makeRecord(
+                name, levelno, "(dedup)", 0, summary, (), None, extra=extra
+            )
+            logger.handle(record)
@@ -0,0 +1,97 @@
+"""
+HESTIA Logger - Rate Limiter.
+
+Token-bucket rate limiting for HESTIA loggers. The check runs in
+`HestiaLoggerAdapter.log` before a `LogRecord` is built, so suppressed calls
+never pay for record creation or formatting.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import time
+
+__all__ = ["RateLimiter"]
+
+
+def _level(key) -> int:
+    if not isinstance(key, str):
+        return key
+    level = logging.getLevelName(key.strip().upper())
+    if not isinstance(level, int):  # getLevelName returns "Level FOO"
+        raise ValueError(f"Unknown log level in rate limit: {key!r}")
+    return level
+
+
+class _Bucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp", "suppressed")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+        self.suppressed = 0
+
+
+class RateLimiter:
+    """
+    Per-level token buckets; ERROR and above always pass.
+
+    `rate` is either records/sec applied to every level below ERROR, or a
+    mapping of level (int or name) to records/sec. Buckets are updated without
+    locks: under heavy contention a few extra records may slip through or be
+    miscounted, which keeps the hot path free of lock acquisitions.
+    """
+
+    def __init__(self, rate, burst=None, report_interval=10.0, clock=time.monotonic):
+        self._clock = clock
+        self.report_interval = report_interval
+        now = clock()
+        if isinstance(rate, dict):
+            rates = {_level(k): v for k, v in rate.items()}
+        else:
+            rates = {
+                level: rate for level in (logging.DEBUG, logging.INFO, logging.WARNING)
+            }
+        self._buckets = {
+            level: _Bucket(r, burst or max(r, 1.0), now)
+            for level, r in rates.items()
+            if level < logging.ERROR
+        }
+        self._next_report = now + report_interval
+
+    def allow(self, level: int) -> bool:
+        """
+        Takes one token for `level`; returns False when the record must be dropped.
+        """
+        bucket = self._buckets.get(level)
+        if bucket is None:
+            return True
+        now = self._clock()
+        tokens = bucket.tokens + (now - bucket.stamp) * bucket.rate
+        if tokens > bucket.burst:
+            tokens = bucket.burst
+        bucket.stamp = now
+        if tokens >= 1.0:
+            bucket.tokens = tokens - 1.0
+            return True
+        bucket.tokens = tokens
+        bucket.suppressed += 1
+        return False
+
+    def take_report(self):
+        """
+        Returns `{level_name: suppressed}` once per report interval when any
+        record was suppressed since the last report, otherwise None.
+        """
+        now = self._clock()
+        if now < self._next_report:
+            return None
+        self._next_report = now + self.report_interval
+        counts = {}
+        for level, bucket in self._buckets.items():
+            suppressed, bucket.suppressed = bucket.suppressed, 0
+            if suppressed:
+                counts[logging.getLevelName(level)] = suppressed
+        return counts or None
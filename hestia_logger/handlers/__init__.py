@@ -11,8 +11,24 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 from .file_handler import file_handler_app
 from .console_handler import console_handler
 from .elasticsearch_handler import get_es_handler  # Ensure this exists
+from .batch_file_handler import BatchRotatingFileHandler
+from .fluent_handler import FluentForwardHandler
+from .binary_handler import BinaryLogHandler
+from .compressed_handler import CompressedRotatingFileHandler
+from .indexed_handler import IndexedRotatingFileHandler
+from .stdout_handler import StdoutJSONHandler
 
 es_handler = get_es_handler()
 
 # Define public API for `handlers`
-__all__ = ["file_handler_app", "console_handler", "es_handler"]
+__all__ = [
+    "file_handler_app",
+    "console_handler",
+    "es_handler",
+    "BatchRotatingFileHandler",
+    "FluentForwardHandler",
+    "BinaryLogHandler",
+    "CompressedRotatingFileHandler",
+    "IndexedRotatingFileHandler",
+    "StdoutJSONHandler",
+]
@@ -0,0 +1,141 @@
+"""
+HESTIA Logger - Batched Rotating File Handler.
+
+Provides a size-rotating file handler that also accepts pre-serialized
+byte payloads, so a writer thread can append many records with one write.
+
+Durability modes decide when written data is `fsync`ed to disk:
+
+- `none`: never; data reaches the page cache only.
+- `interval`: at most every `fsync_interval` seconds (and on rotation/close).
+- `group_commit`: as `interval`, and every `flush()` fsyncs. The async
+  writer flushes after a batch holding records whose producers wait for
+  durability, so all of them share one fsync.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+
+__all__ = ["BatchRotatingFileHandler", "DURABILITY_MODES"]
+
+DURABILITY_MODES = ("none", "interval", "group_commit")
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler with a byte-oriented batch write path.
+
+    `serialize()` turns a record into the exact bytes the handler would write,
+    and `write_batch()` appends already serialized bytes, rotating first when
+    the batch would push the file past `maxBytes`.
+    """
+
+    # Bytes a freshly opened file already holds (e.g. a format header)
+    _fresh_size = 0
+
+    def __init__(self, *args, durability="none", fsync_interval=1.0, **kwargs):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unsupported durability mode: {durability!r}")
+        super().__init__(*args, **kwargs)
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self.fsyncs = 0
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        # Lets the async queue worker fsync the tail while no records arrive
+        self.idle_flush_interval = fsync_interval if durability != "none" else None
+
+    def _sync(self):
+        """
+        Fsyncs data written since the last sync (caller holds the lock).
+        """
+        if self._dirty and self.stream is not None:
+            self.stream.flush()
+            os.fsync(self.stream.fileno())
+            self.fsyncs += 1
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def _sync_if_due(self):
+        if (
+            self.durability != "none"
+            and self._dirty
+            and time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self._sync()
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """
+        Formats a record into its final on-disk bytes.
+        """
+        line = self.format(record) + self.terminator
+        return line.encode(self.encoding or "utf-8", self.errors or "strict")
+
+    def _batch_written(self, offset: int, payload: bytes):
+        """
+        Hook called (under the handler lock) after `payload` was written at
+        byte `offset` of the current file.
+        """
+
+    def write_batch(self, payload: bytes):
+        """
+        Appends a block of serialized records to the log file.
+        """
+        if not payload:
+            return
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            # Drain anything written through the text layer by `emit()`
+            self.stream.flush()
+            raw = getattr(self.stream, "buffer", self.stream)
+            raw.seek(0, 2)
+            offset = raw.tell()
+            if (
+                self.maxBytes > 0
+                and offset > self._fresh_size
+                and offset + len(payload) >= self.maxBytes
+            ):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                raw = getattr(self.stream, "buffer", self.stream)
+                raw.seek(0, 2)
+                offset = raw.tell()
+            raw.write(payload)
+            raw.flush()
+            self._batch_written(offset, payload)
+            self._dirty = True
+            self._sync_if_due()
+        finally:
+            self.release()
+
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.durability == "group_commit":
+                self._sync()
+            else:
+                self._sync_if_due()
+        finally:
+            self.release()
+
+    def doRollover(self):
+        if self.durability != "none":
+            self._sync()
+        super().doRollover()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.durability != "none" and self.stream is not None:
+                self._sync()
+        finally:
+            self.release()
+        super().close()
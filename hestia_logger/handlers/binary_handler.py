@@ -0,0 +1,195 @@
+"""
+HESTIA Logger - Binary Log Handler.
+
+Writes structured records as length-prefixed msgpack frames with a per-file
+string dictionary, so repeated keys (`timestamp`, `level`, `service`...) and
+repeated values (hostname, service, module...) are stored once per file
+instead of once per line. `hestia-logger cat` streams the file back to JSON.
+
+File layout (every frame is a 4-byte big-endian length + msgpack body):
+- `[0, "HSTB", version]`  header, resets the reader's dictionary
+- `[1, id, string]`       dictionary definition
+- `[2, {key: value}]`     record; keys are ids, dictionary-coded values are
+                          msgpack extension type 1 holding a 4-byte id
+
+Every time the file is opened (new process or rotation) a header and a
+snapshot of the current dictionary are written first, so each file can be
+decoded on its own. A failed write drops the dictionary and reopens the file
+with a fresh header, so no later frame refers to a definition that never
+reached the disk.
+
+Requires:
+- The `msgpack` Python package.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import struct
+
+from ..core.formatters import JSONFormatter
+from .batch_file_handler import BatchRotatingFileHandler
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+__all__ = ["BinaryLogHandler", "iter_binary_records"]
+
+MAGIC = "HSTB"
+FORMAT_VERSION = 1
+_HEADER, _DEFINE, _RECORD = 0, 1, 2
+_REF_EXT = 1
+_LENGTH = struct.Struct(">I")
+
+# Values repeated on almost every line; stored as dictionary references
+DICTIONARY_FIELDS = frozenset(
+    {
+        "level",
+        "service",
+        "environment",
+        "hostname",
+        "app_version",
+        "module",
+        "filename",
+        "function",
+    }
+)
+
+
+def _frame(body) -> bytes:
+    data = msgpack.packb(body, use_bin_type=True, default=str)
+    return _LENGTH.pack(len(data)) + data
+
+
+class BinaryLogHandler(BatchRotatingFileHandler):
+    """
+    Rotating sink for the compact binary format.
+
+    The dictionary is owned by the writer thread, so this handler always
+    serializes on the worker regardless of `LOG_SERIALIZATION_MODE`.
+    """
+
+    serialize_on_writer = True
+
+    def __init__(self, filename, max_dictionary_size=4096, **kwargs):
+        if msgpack is None:
+            raise ImportError(
+                "msgpack is required for BinaryLogHandler. "
+                "Install it with 'pip install msgpack'."
+            )
+        kwargs.setdefault("delay", True)
+        super().__init__(filename, **kwargs)
+        self.max_dictionary_size = max_dictionary_size
+        self.setFormatter(JSONFormatter())
+        self._ids = {}
+        self._pending = []
+
+    def _open(self):
+        stream = open(self.baseFilename, "ab")
+        preamble = [_frame([_HEADER, MAGIC, FORMAT_VERSION])]
+        preamble.extend(_frame([_DEFINE, i, s]) for s, i in self._ids.items())
+        stream.write(b"".join(preamble))
+        stream.flush()
+        self._fresh_size = stream.tell()
+        return stream
+
+    def _ref(self, value: str):
+        ref = self._ids.get(value)
+        if ref is None:
+            if len(self._ids) >= self.max_dictionary_size:
+                return None
+            ref = self._ids[value] = len(self._ids)
+            self._pending.append(_frame([_DEFINE, ref, value]))
+        return ref
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """
+        Encodes a record (plus any new dictionary entries) into frames.
+        """
+        if isinstance(self.formatter, JSONFormatter):
+            entry = self.formatter.build_entry(record)
+        else:
+            entry = {"message": self.format(record)}
+
+        body = {}
+        for key, value in entry.items():
+            key_ref = self._ref(key) if isinstance(key, str) else None
+            if key in DICTIONARY_FIELDS and isinstance(value, str):
+                value_ref = self._ref(value)
+                if value_ref is not None:
+                    value = msgpack.ExtType(_REF_EXT, _LENGTH.pack(value_ref))
+            body[key if key_ref is None else key_ref] = value
+
+        frames, self._pending = self._pending, []
+        frames.append(_frame([_RECORD, body]))
+        return b"".join(frames)
+
+    def write_batch(self, payload: bytes):
+        try:
+            super().write_batch(payload)
+        except BaseException:
+            # The payload's definitions may not be on disk: start over with a
+            # header (which resets readers) and an empty dictionary
+            self.acquire()
+            try:
+                self._ids.clear()
+                self._pending = []
+                stream, self.stream = self.stream, None
+                if stream is not None:
+                    try:
+                        stream.close()
+                    except Exception:
+                        pass
+            finally:
+                self.release()
+            raise
+
+    def emit(self, record):
+        try:
+            self.write_batch(self.serialize(record))
+        except Exception:
+            self.handleError(record)
+
+
+def iter_binary_records(stream):
+    """
+    Lazily decodes records from a binary log stream opened in `rb` mode.
+    """
+    if msgpack is None:  # pragma: no cover - optional dependency
+        raise ImportError("msgpack is required to read HESTIA binary logs.")
+
+    dictionary = {}
+
+    def ext_hook(code, data):
+        if code == _REF_EXT:
+            ref = _LENGTH.unpack(data)[0]
+            return dictionary.get(ref, f"<unknown ref {ref}>")
+        return msgpack.ExtType(code, data)
+
+    while True:
+        prefix = stream.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(prefix)
+        data = stream.read(length)
+        if len(data) < length:
+            return  # Truncated tail frame (e.g. the writer crashed mid-write)
+        body = msgpack.unpackb(data, raw=False, ext_hook=ext_hook, strict_map_key=False)
+        kind = body[0]
+        if kind == _HEADER:
+            if body[1] != MAGIC:
+                raise ValueError("Not a HESTIA binary log stream")
+            dictionary = {}
+        elif kind == _DEFINE:
+            dictionary[body[1]] = body[2]
+        elif kind == _RECORD:
+            yield {
+                (
+                    dictionary.get(key, f"<unknown ref {key}>")
+                    if isinstance(key, int)
+                    else key
+                ): value
+                for key, value in body[1].items()
+            }
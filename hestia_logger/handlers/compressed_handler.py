@@ -0,0 +1,137 @@
+"""
+HESTIA Logger - Compressed Rotating File Handler.
+
+Writes log files as a sequence of independent gzip members or zstd frames.
+Serialized records are buffered on the writer thread and compressed as one
+frame every `frame_size` bytes or `frame_interval` seconds, so the cost is
+spread over many records while `zcat`/`zstdcat` readers and crash recovery
+still see everything up to the last completed frame.
+
+Size-based rotation is measured on compressed bytes.
+
+Requires:
+- The `zstandard` package (or Python 3.14+ `compression.zstd`) for zstd.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import gzip
+import os
+import time
+
+from .batch_file_handler import BatchRotatingFileHandler
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+__all__ = ["CompressedRotatingFileHandler", "COMPRESSION_SUFFIXES"]
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd_compressor(level):
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level or 3)
+        return compressor.compress
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package. "
+            "Install it with 'pip install zstandard'."
+        ) from None
+    return lambda data: zstd.compress(data, level=level or 3)
+
+
+class CompressedRotatingFileHandler(BatchRotatingFileHandler):
+    """
+    Size-rotating file sink that compresses batches into gzip/zstd frames.
+
+    Rotated backups keep the compression suffix (`app.log.1.gz`).
+    """
+
+    def __init__(
+        self,
+        filename,
+        compression="gzip",
+        level=None,
+        frame_size=64 * 1024,
+        frame_interval=1.0,
+        **kwargs,
+    ):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported log compression: {compression!r}")
+        if compression == "zstd":
+            self._compress = _zstd_compressor(level)
+        else:
+            gzip_level = 6 if level is None else level
+            self._compress = lambda data: gzip.compress(
+                data, compresslevel=gzip_level, mtime=0
+            )
+        kwargs.setdefault("delay", True)
+        super().__init__(filename, **kwargs)
+        self.compression = compression
+        self.frame_size = frame_size
+        self.frame_interval = frame_interval
+        # Lets the async queue worker close frames while no records arrive
+        self.idle_flush_interval = min(
+            frame_interval, self.idle_flush_interval or frame_interval
+        )
+        self.namer = self._rotated_name
+        self._pending = []
+        self._pending_size = 0
+        self._last_frame = time.monotonic()
+
+    def _rotated_name(self, default_name):
+        # "app.log.gz.1" -> "app.log.1.gz"
+        root, suffix = os.path.splitext(self.baseFilename)
+        index = default_name[len(self.baseFilename) :]
+        return f"{root}{index}{suffix}"
+
+    def _open(self):
+        return open(self.baseFilename, "ab")
+
+    def write_batch(self, payload: bytes):
+        """
+        Buffers serialized records, compressing a frame once it is due.
+        """
+        self.acquire()
+        try:
+            if payload:
+                self._pending.append(payload)
+                self._pending_size += len(payload)
+            if self._pending_size >= self.frame_size or (
+                self._pending_size
+                and time.monotonic() - self._last_frame >= self.frame_interval
+            ):
+                self._write_frame()
+        finally:
+            self.release()
+
+    def _write_frame(self):
+        data = b"".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        self._last_frame = time.monotonic()
+        super().write_batch(self._compress(data))
+
+    def emit(self, record):
+        try:
+            self.write_batch(self.serialize(record))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending_size:
+                self._write_frame()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
@@ -4,49 +4,131 @@ HESTIA Logger - Console Handler.
 Defines a structured console handler that outputs logs to the terminal
 with proper formatting, including optional colored logs for better visibility.
 
+The handler is a batch-capable sink: `custom_logger` puts it behind the
+async queue so the calling thread never blocks on stderr, and the writer
+thread writes each batch with a single call. Timestamps are formatted once
+per second and the color escape codes per level are computed up front.
+Color is only used when the stream is a TTY (and `NO_COLOR` is unset).
+
 Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 """
 
 import logging
+import os
 import sys
+import time
 
 try:
     import colorama
 except ImportError:  # pragma: no cover - optional dependency
     colorama = None
 
-import colorlog  # Provides colored console output
+from colorlog.escape_codes import escape_codes, parse_colors
+
+__all__ = ["console_handler", "ConsoleFormatter", "ConsoleStreamHandler"]
 
-__all__ = ["console_handler"]
+LOG_COLORS = {
+    "DEBUG": "cyan",
+    "INFO": "green",
+    "WARNING": "yellow",
+    "ERROR": "red",
+    "CRITICAL": "bold_red",
+}
 
 
-def _supports_color():
+def _supports_color(stream=None):
     """
-    Detect whether the current platform supports ANSI colors without extra helpers.
+    Detect whether `stream` (stderr by default) is a terminal that takes ANSI colors.
     """
-    if sys.platform == "win32":
+    if os.getenv("NO_COLOR"):
+        return False
+    if sys.platform == "win32" and colorama is None:
         return False
-    return getattr(sys.stdout, "isatty", lambda: False)()
+    stream = stream if stream is not None else sys.stderr
+    return getattr(stream, "isatty", lambda: False)()
 
 
-def _get_formatter():
-    format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    if colorama is not None:
-        colorama.just_fix_windows_console()
-    if colorama or _supports_color():
-        return colorlog.ColoredFormatter(
-            "%(log_color)s" + format_string,
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "green",
-                "WARNING": "yellow",
-                "ERROR": "red",
-                "CRITICAL": "bold_red",
-            },
+class ConsoleFormatter(logging.Formatter):
+    """
+    Fast `%(asctime)s - %(name)s - %(levelname)s - %(message)s` formatter.
+    """
+
+    def __init__(self, color=False, log_colors=None):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.color = color
+        self._time_cache = (None, "")
+        self._prefixes = {}
+        self._reset = escape_codes["reset"] if color else ""
+        if color:
+            for name, spec in (log_colors or LOG_COLORS).items():
+                self._prefixes[logging.getLevelName(name)] = parse_colors(spec)
+
+    def _asctime(self, record):
+        second = int(record.created)
+        cached_second, text = self._time_cache
+        if cached_second != second:
+            text = time.strftime(self.default_time_format, self.converter(second))
+            # One tuple assignment keeps the cache consistent across threads
+            self._time_cache = (second, text)
+        return "%s,%03d" % (text, record.msecs)
+
+    def format(self, record):
+        text = (
+            f"{self._asctime(record)} - {record.name} - "
+            f"{record.levelname} - {record.getMessage()}"
         )
-    return logging.Formatter(format_string)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            text = f"{text}\n{record.exc_text}"
+        if record.stack_info:
+            text = f"{text}\n{self.formatStack(record.stack_info)}"
+        if self.color:
+            return f"{self._prefixes.get(record.levelno, '')}{text}{self._reset}"
+        return text
+
+
+class ConsoleStreamHandler(logging.StreamHandler):
+    """
+    Stream handler with the `serialize()`/`write_batch()` batch interface.
+    """
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """
+        Formats a record into the bytes written to the stream.
+        """
+        line = self.format(record) + self.terminator
+        return line.encode(self._encoding(), "backslashreplace")
+
+    def _encoding(self):
+        return getattr(self.stream, "encoding", None) or "utf-8"
+
+    def write_batch(self, payload: bytes):
+        """
+        Writes a block of serialized records with one call.
+        """
+        if not payload:
+            return
+        self.acquire()
+        try:
+            buffer = getattr(self.stream, "buffer", None)
+            if buffer is not None:
+                self.stream.flush()  # Keep ordering with text-layer writes
+                buffer.write(payload)
+                buffer.flush()
+            else:
+                self.stream.write(payload.decode(self._encoding(), "replace"))
+                self.flush()
+        finally:
+            self.release()
+
+
+def _get_formatter(stream=None):
+    if colorama is not None and sys.platform == "win32":
+        colorama.just_fix_windows_console()
+    return ConsoleFormatter(color=_supports_color(stream))
 
 
-console_handler = logging.StreamHandler()
+console_handler = ConsoleStreamHandler()
 console_handler.setLevel(logging.DEBUG)
-console_handler.setFormatter(_get_formatter())
+console_handler.setFormatter(_get_formatter(console_handler.stream))
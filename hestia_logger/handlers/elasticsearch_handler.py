@@ -12,7 +12,9 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 
 import logging
 import json
+import time
 from ..core.config import ELASTICSEARCH_HOST, LOG_LEVEL
+from ..core.metrics import register_sink
 from ..internal_logger import hestia_internal_logger
 
 try:
@@ -30,6 +32,7 @@ try:
             self.es = (
                 Elasticsearch([ELASTICSEARCH_HOST]) if ELASTICSEARCH_HOST else None
             )
+            self.metrics = register_sink(f"elasticsearch:{index}", "elasticsearch")
 
         def emit(self, record):
             """
@@ -38,18 +41,23 @@ try:
             if not self.es:
                 return  # Elasticsearch is disabled
 
+            started = time.perf_counter()
             try:
                 log_entry = self.format(record)
+                size = len(log_entry) if isinstance(log_entry, str) else 0
 
                 # Ensure valid JSON before sending
                 if isinstance(log_entry, str):
                     log_entry = json.loads(log_entry)
 
                 self.es.index(index=self.index, body=log_entry)
+                self.metrics.record_write(1, size, time.perf_counter() - started)
                 hestia_internal_logger.debug(
                     f"Successfully sent log to Elasticsearch index: {self.index}"
                 )
             except Exception as e:
+                self.metrics.write_errors += 1
+                self.metrics.records_dropped += 1
                 hestia_internal_logger.error(
                     f"ERROR SENDING LOG TO ELASTICSEARCH: {e}"
                 )
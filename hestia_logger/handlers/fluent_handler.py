@@ -0,0 +1,208 @@
+"""
+HESTIA Logger - Fluent Forward Handler.
+
+Ships structured log records straight to Fluent Bit / Fluentd using the
+Forward protocol (msgpack over TCP or a Unix socket), so logs no longer have
+to be written to `app.log`, tailed and re-parsed.
+
+Records are serialized into `[time, record]` msgpack entries and each writer
+batch is sent as one `PackedForward` message (`CompressedPackedForward` when
+gzip is enabled) over a persistent connection. Failed batches are appended
+to a JSON-lines fallback file.
+
+Requires:
+- The `msgpack` Python package.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import base64
+import gzip
+import io
+import json
+import logging
+import socket
+import struct
+import time
+import uuid
+
+from ..core.formatters import JSONFormatter
+from ..internal_logger import hestia_internal_logger
+from .batch_file_handler import BatchRotatingFileHandler
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+__all__ = ["FluentForwardHandler"]
+
+
+def _event_time(created: float):
+    """
+    Encodes a timestamp as the Forward protocol `EventTime` extension (type 0).
+    """
+    seconds = int(created)
+    nanoseconds = int((created - seconds) * 1e9)
+    return msgpack.ExtType(0, struct.pack(">II", seconds, nanoseconds))
+
+
+class FluentForwardHandler(logging.Handler):
+    """
+    Batched Fluent Forward handler with a persistent connection.
+
+    Use it behind the HESTIA async pipeline (`serialize()`/`write_batch()`);
+    calling `emit()` directly sends one record per message synchronously.
+    """
+
+    def __init__(
+        self,
+        tag="hestia",
+        host="localhost",
+        port=24224,
+        unix_socket=None,
+        compress=False,
+        require_ack=False,
+        timeout=3.0,
+        retry_interval=5.0,
+        fallback_path=None,
+        fallback_max_bytes=0,
+        fallback_backup_count=0,
+        level=logging.NOTSET,
+    ):
+        if msgpack is None:
+            raise ImportError(
+                "msgpack is required for FluentForwardHandler. "
+                "Install it with 'pip install msgpack'."
+            )
+        super().__init__(level)
+        self.tag = tag
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.compress = compress
+        self.require_ack = require_ack
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.setFormatter(JSONFormatter())
+        self._sock = None
+        self._retry_at = 0.0
+        self._fallback = (
+            BatchRotatingFileHandler(
+                fallback_path,
+                maxBytes=fallback_max_bytes,
+                backupCount=fallback_backup_count,
+                delay=True,
+            )
+            if fallback_path
+            else None
+        )
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """
+        Packs a record into one `[time, record]` Forward entry.
+        """
+        if isinstance(self.formatter, JSONFormatter):
+            entry = self.formatter.build_entry(record)
+        else:
+            entry = {"message": self.format(record)}
+        return msgpack.packb(
+            [_event_time(record.created), entry], use_bin_type=True, default=str
+        )
+
+    def emit(self, record):
+        try:
+            self.write_batch(self.serialize(record))
+        except Exception:
+            self.handleError(record)
+
+    def write_batch(self, payload: bytes):
+        """
+        Sends serialized entries as one `PackedForward` message.
+        """
+        if not payload:
+            return
+        self.acquire()
+        try:
+            if time.monotonic() >= self._retry_at:
+                for _attempt in range(2):
+                    try:
+                        self._send(payload)
+                        return
+                    except OSError as e:
+                        self._close_socket()
+                        error = e
+                self._retry_at = time.monotonic() + self.retry_interval
+                hestia_internal_logger.error(
+                    f"ERROR SENDING LOGS TO FLUENT FORWARD: {error}"
+                )
+            self._write_fallback(payload)
+        finally:
+            self.release()
+
+    def _connect(self):
+        if self.unix_socket:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.unix_socket)
+        else:
+            sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.settimeout(self.timeout)
+        return sock
+
+    def _send(self, payload: bytes):
+        if self._sock is None:
+            self._sock = self._connect()
+        option = {}
+        entries = payload
+        if self.compress:
+            entries = gzip.compress(payload)
+            option["compressed"] = "gzip"
+        if self.require_ack:
+            option["chunk"] = base64.b64encode(uuid.uuid4().bytes).decode("ascii")
+        message = msgpack.packb([self.tag, entries, option], use_bin_type=True)
+        self._sock.sendall(message)
+        if self.require_ack:
+            self._wait_for_ack(option["chunk"])
+
+    def _wait_for_ack(self, chunk: str):
+        unpacker = msgpack.Unpacker(raw=False)
+        while True:
+            data = self._sock.recv(4096)
+            if not data:
+                raise ConnectionError("Fluent Forward connection closed before ack")
+            unpacker.feed(data)
+            for response in unpacker:
+                if isinstance(response, dict) and response.get("ack") == chunk:
+                    return
+                raise ConnectionError(f"Unexpected Fluent Forward ack: {response}")
+
+    def _write_fallback(self, payload: bytes):
+        if self._fallback is None:
+            return
+        lines = []
+        for _time, entry in msgpack.Unpacker(io.BytesIO(payload), raw=False):
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._fallback.write_batch("".join(lines).encode("utf-8"))
+
+    def _close_socket(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def flush(self):
+        if self._fallback is not None:
+            self._fallback.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._close_socket()
+            if self._fallback is not None:
+                self._fallback.close()
+        finally:
+            self.release()
+        super().close()
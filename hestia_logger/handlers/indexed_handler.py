@@ -0,0 +1,118 @@
+"""
+HESTIA Logger - Indexed Rotating File Handler.
+
+JSON-lines file sink that maintains a sidecar sparse index (`<file>.idx`)
+while it writes: one index line per block of `interval` records with the
+block's byte range, its first/last timestamps and optional bloom filters on
+selected keys. `hestia_logger.reader` uses the index to seek directly to the
+blocks that can match a query.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import json
+import os
+
+from ..reader import INDEX_SUFFIX, BloomFilter, key_pattern, timestamp_of
+from .batch_file_handler import BatchRotatingFileHandler
+
+__all__ = ["IndexedRotatingFileHandler"]
+
+
+class IndexedRotatingFileHandler(BatchRotatingFileHandler):
+    """
+    Rotating JSON-lines sink with a sparse timestamp/bloom sidecar index.
+
+    Index bookkeeping runs on the writer thread, on bytes that were already
+    serialized: timestamps are sliced from the `JSONFormatter` line prefix and
+    bloom keys are extracted with a precompiled pattern, so no JSON parsing
+    happens on the write path.
+    """
+
+    def __init__(
+        self, filename, interval=1000, bloom_keys=("request_id", "service"), **kwargs
+    ):
+        kwargs.setdefault("delay", True)
+        super().__init__(filename, **kwargs)
+        self.interval = interval
+        self.bloom_keys = tuple(bloom_keys)
+        self._patterns = [(key, key_pattern(key)) for key in self.bloom_keys]
+        self._bloom_size = max(64, interval * 10) // 8 * 8
+        self._reset_block()
+
+    @property
+    def index_path(self):
+        return self.baseFilename + INDEX_SUFFIX
+
+    def _reset_block(self):
+        self._block_start = None
+        self._block_end = None
+        self._block_count = 0
+        self._block_first = None
+        self._block_last = None
+        self._blooms = {key: BloomFilter(self._bloom_size) for key in self.bloom_keys}
+
+    def _batch_written(self, offset, payload):
+        position = offset
+        for line in payload.splitlines(keepends=True):
+            if self._block_start is None:
+                self._block_start = position
+            position += len(line)
+            self._block_end = position
+            self._block_count += 1
+
+            timestamp = timestamp_of(line)
+            if timestamp is not None:
+                if self._block_first is None or timestamp < self._block_first:
+                    self._block_first = timestamp
+                if self._block_last is None or timestamp > self._block_last:
+                    self._block_last = timestamp
+            for key, pattern in self._patterns:
+                for match in pattern.finditer(line):
+                    self._blooms[key].add(match.group(1))
+
+            if self._block_count >= self.interval:
+                self._finish_block()
+
+    def _finish_block(self):
+        if not self._block_count:
+            return
+        entry = {
+            "offset": self._block_start,
+            "end": self._block_end,
+            "count": self._block_count,
+            "first": self._block_first,
+            "last": self._block_last,
+            "bloom": {key: bloom.encode() for key, bloom in self._blooms.items()},
+        }
+        with open(self.index_path, "a", encoding="utf-8") as index:
+            index.write(json.dumps(entry) + "\n")
+        self._reset_block()
+
+    def doRollover(self):
+        self._finish_block()
+        super().doRollover()
+        # Rotate sidecars alongside their log files: app.log.idx -> app.log.1.idx
+        for i in range(self.backupCount - 1, 0, -1):
+            source = f"{self.baseFilename}.{i}{INDEX_SUFFIX}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.baseFilename}.{i + 1}{INDEX_SUFFIX}")
+        if os.path.exists(self.index_path):
+            if self.backupCount > 0:
+                os.replace(self.index_path, f"{self.baseFilename}.1{INDEX_SUFFIX}")
+            else:
+                os.remove(self.index_path)
+
+    def emit(self, record):
+        try:
+            self.write_batch(self.serialize(record))
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            self._finish_block()
+        finally:
+            self.release()
+        super().close()
@@ -0,0 +1,75 @@
+"""
+HESTIA Logger - Stdout JSON Handler.
+
+Writes JSON lines straight to a file descriptor (stdout by default) for
+container deployments where the runtime collects stdout, so no log file has
+to be written and tailed again by a shipper.
+
+Behind the async queue there is a single writer thread, and each batch of
+serialized records goes to the descriptor with as few `os.write` calls as
+the pipe allows. A non-blocking descriptor (EAGAIN) is waited on until it is
+writable. A closed reader (EPIPE) disables the sink instead of raising on
+every record.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import os
+import select
+
+from ..core.formatters import JSONFormatter
+from ..internal_logger import hestia_internal_logger
+
+__all__ = ["StdoutJSONHandler"]
+
+
+class StdoutJSONHandler(logging.Handler):
+    """
+    JSON-lines sink writing serialized batches to a raw file descriptor.
+    """
+
+    def __init__(self, fd: int = 1, level=logging.NOTSET):
+        super().__init__(level)
+        self.fd = fd
+        self.broken = False
+        self.bytes_dropped = 0
+        self.setFormatter(JSONFormatter())
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        """
+        Formats a record into one JSON line.
+        """
+        return (self.format(record) + "\n").encode("utf-8", "backslashreplace")
+
+    def write_batch(self, payload: bytes):
+        """
+        Writes a block of serialized records to the descriptor.
+        """
+        if not payload:
+            return
+        if self.broken:
+            self.bytes_dropped += len(payload)
+            return
+        view = memoryview(payload)
+        while view:
+            try:
+                written = os.write(self.fd, view)
+            except BlockingIOError:
+                # Non-blocking stdout is full: wait for the reader to drain it
+                select.select([], [self.fd], [])
+                continue
+            except BrokenPipeError:
+                self.broken = True
+                self.bytes_dropped += len(view)
+                hestia_internal_logger.warning(
+                    f"Log reader on fd {self.fd} went away; dropping stdout JSON logs."
+                )
+                return
+            view = view[written:]
+
+    def emit(self, record):
+        try:
+            self.write_batch(self.serialize(record))
+        except Exception:
+            self.handleError(record)
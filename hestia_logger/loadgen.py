@@ -0,0 +1,457 @@
+"""
+HESTIA Logger - Load Generator.
+
+Drives the logging pipeline with synthetic traffic for capacity planning
+and soak tests, fully offline:
+
+    hestia-logger loadgen --rate 20000 --duration 60 --threads 4 \\
+        --processes 2 --async-tasks 8 --payload nested --sink zstd
+
+Each producer process is started fresh (spawn) with the environment of the
+selected sink, runs its thread and asyncio producers against
+`get_logger()`, then drains the pipeline with `shutdown()`. The report
+combines every process: achieved records/sec, producer-side call latency
+(p50/p99/max), queue depth over time, peak RSS and records lost (produced
+but never written by the `app` sink).
+
+Options default to `LOADGEN_*` environment variables, so the same run can
+be configured from a container spec.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import argparse
+import array
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+__all__ = ["SINKS", "PAYLOADS", "add_arguments", "run", "format_report", "main"]
+
+# Sink name -> environment the producer processes start with
+SINKS = {
+    "file": {"LOG_OUTPUT": "file", "LOG_FILE_FORMAT": "json"},
+    "binary": {"LOG_OUTPUT": "file", "LOG_FILE_FORMAT": "binary"},
+    "gzip": {"LOG_OUTPUT": "file", "LOG_FILE_COMPRESSION": "gzip"},
+    "zstd": {"LOG_OUTPUT": "file", "LOG_FILE_COMPRESSION": "zstd"},
+    "indexed": {"LOG_OUTPUT": "file", "LOG_INDEX_ENABLED": "true"},
+    "stdout": {"LOG_OUTPUT": "stdout"},  # Sent to /dev/null while measuring
+}
+PAYLOADS = ("string", "dict", "nested", "exception", "mixed")
+_LEVELS = ("info", "info", "info", "warning", "error")
+_QUEUE_SAMPLE_INTERVAL = 0.1
+
+
+def _env(name, default):
+    return os.getenv(f"LOADGEN_{name}", default)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the load generator options to `parser`.
+    """
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=float(_env("RATE", 0)),
+        help="Target records/sec across all producers (0: as fast as possible).",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=float(_env("DURATION", 10)),
+        help="Seconds to produce for.",
+    )
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=int(_env("RECORDS", 0)),
+        help="Stop after this many records in total (0: duration only).",
+    )
+    parser.add_argument(
+        "--payload",
+        choices=PAYLOADS,
+        default=_env("PAYLOAD", "dict"),
+        help="Record shape.",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(_env("THREADS", 1)),
+        help="Producer threads per process.",
+    )
+    parser.add_argument(
+        "--async-tasks",
+        type=int,
+        default=int(_env("ASYNC_TASKS", 0)),
+        help="asyncio producer tasks per process.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(_env("PROCESSES", 1)),
+        help="Producer processes.",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=sorted(SINKS),
+        default=_env("SINK", "file"),
+        help="Sink the records go to.",
+    )
+    parser.add_argument(
+        "--logs-dir",
+        default=_env("LOGS_DIR", ""),
+        help="Where file sinks write (default: a temporary directory).",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=float(_env("DRAIN_TIMEOUT", 30)),
+        help="Seconds allowed for draining the queues after producing.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+# ---------------------------------------------------------------------------
+# Producer process
+# ---------------------------------------------------------------------------
+
+
+def _make_emitters(logger, payload):
+    def string(i):
+        logger.info("user %d logged in from %s", i, "10.0.0.1")
+
+    def flat(i):
+        getattr(logger, _LEVELS[i % len(_LEVELS)])(
+            {
+                "message": "payment processed",
+                "event": "payment",
+                "user_id": i,
+                "amount": 12.5,
+                "currency": "EUR",
+                "session_id": f"session-{i % 1000}",
+            }
+        )
+
+    def nested(i):
+        logger.info(
+            {
+                "message": "order placed",
+                "order": {
+                    "id": i,
+                    "items": [
+                        {"sku": f"SKU-{n}", "qty": n, "price": {"amount": 9.99}}
+                        for n in range(3)
+                    ],
+                    "customer": {"id": i % 500, "tags": ["new", "promo"]},
+                },
+            }
+        )
+
+    def exception(i):
+        try:
+            raise ValueError(f"failure {i}")
+        except ValueError as error:
+            logger.error("request failed", exc_info=error)
+
+    shapes = {"string": string, "dict": flat, "nested": nested, "exception": exception}
+    if payload != "mixed":
+        return [shapes[payload]]
+    return list(shapes.values())
+
+
+def _produce(emitters, interval, end, limit, latencies):
+    clock = time.perf_counter
+    next_at = clock()
+    produced = 0
+    count = len(emitters)
+    while produced != limit:
+        now = clock()
+        if now >= end:
+            break
+        if interval:
+            if next_at > now:
+                time.sleep(next_at - now)
+            next_at += interval
+        started = clock()
+        emitters[produced % count](produced)
+        latencies.append(clock() - started)
+        produced += 1
+    return produced
+
+
+async def _produce_async(emitters, interval, end, limit, latencies):
+    clock = time.perf_counter
+    next_at = clock()
+    produced = 0
+    count = len(emitters)
+    while produced != limit:
+        now = clock()
+        if now >= end:
+            break
+        if interval:
+            if next_at > now:
+                await asyncio.sleep(next_at - now)
+            next_at += interval
+        elif produced % 100 == 0:
+            await asyncio.sleep(0)  # Let the other tasks run
+        started = clock()
+        emitters[produced % count](produced)
+        latencies.append(clock() - started)
+        produced += 1
+    return produced
+
+
+def _peak_rss_mb():
+    if resource is None:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_process(options, results):
+    if options["sink"] == "stdout":
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+
+    from .core.custom_logger import get_logger, shutdown
+    from .core.metrics import stats
+
+    logger = get_logger("loadgen")
+    emitters = _make_emitters(logger, options["payload"])
+    producers = options["threads"] + options["async_tasks"]
+    rate = options["rate"] / options["processes"] / producers
+    interval = 1 / rate if rate else 0
+    limit = -1
+    if options["records"]:
+        limit = max(1, options["records"] // (options["processes"] * producers))
+
+    depths = []
+    sampling = threading.Event()
+
+    def sample_queues():
+        started = time.perf_counter()
+        while not sampling.wait(_QUEUE_SAMPLE_INTERVAL):
+            depth = sum(sink["queue_depth"] for sink in stats().values())
+            depths.append((round(time.perf_counter() - started, 2), depth))
+
+    sampler = threading.Thread(target=sample_queues, daemon=True)
+    sampler.start()
+
+    latencies = [array.array("d") for _ in range(producers)]
+    counts = [0] * producers
+    started = time.perf_counter()
+    end = started + options["duration"]
+
+    def run_thread(index):
+        counts[index] = _produce(emitters, interval, end, limit, latencies[index])
+
+    async def run_tasks():
+        offset = options["threads"]
+        produced = await asyncio.gather(
+            *(
+                _produce_async(emitters, interval, end, limit, latencies[offset + n])
+                for n in range(options["async_tasks"])
+            )
+        )
+        counts[offset:] = produced
+
+    threads = [
+        threading.Thread(target=run_thread, args=(n,))
+        for n in range(options["threads"])
+    ]
+    for thread in threads:
+        thread.start()
+    if options["async_tasks"]:
+        asyncio.run(run_tasks())
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    drain = shutdown(timeout=options["drain_timeout"])
+    sampling.set()
+    sampler.join()
+    app = stats().get("app", {})
+
+    merged = array.array("d")
+    for chunk in latencies:
+        merged.extend(chunk)
+    results.put(
+        {
+            "produced": sum(counts),
+            "elapsed": elapsed,
+            "written": app.get("records_written", 0),
+            "dropped": app.get("records_dropped", 0),
+            "abandoned": drain["abandoned"],
+            "drain_seconds": drain["elapsed"],
+            "peak_rss_mb": _peak_rss_mb(),
+            "queue_depth": depths,
+            "latencies": merged.tobytes(),
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(options: dict) -> dict:
+    """
+    Runs a load test (options as produced by `add_arguments`) and returns
+    the combined report.
+    """
+    options = dict(options)
+    options["threads"] = max(0, options["threads"])
+    options["async_tasks"] = max(0, options["async_tasks"])
+    if options["threads"] + options["async_tasks"] == 0:
+        options["threads"] = 1
+    options["processes"] = max(1, options["processes"])
+    logs_dir = options.get("logs_dir") or tempfile.mkdtemp(prefix="hestia-loadgen-")
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    environment = {
+        **SINKS[options["sink"]],
+        "LOGS_DIR": logs_dir,
+        "LOG_LEVEL": "INFO",
+        "LOG_SHUTDOWN_ON_SIGTERM": "false",
+    }
+    saved = {key: os.environ.get(key) for key in environment}
+    processes = []
+    try:
+        # Spawned children import HESTIA with the sink's environment
+        os.environ.update(environment)
+        for _ in range(options["processes"]):
+            process = context.Process(target=_run_process, args=(options, results))
+            process.start()
+            processes.append(process)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    # Read before joining: a child exits only once its report is flushed
+    reports = []
+    while len(reports) < len(processes):
+        try:
+            reports.append(results.get(timeout=1))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+    for process in processes:
+        process.join()
+    results.close()
+    failed = len(processes) - len(reports)
+
+    latencies = array.array("d")
+    for report in reports:
+        latencies.frombytes(report["latencies"])
+    ordered = sorted(latencies)
+    produced = sum(report["produced"] for report in reports)
+    written = sum(report["written"] for report in reports)
+    elapsed = max((report["elapsed"] for report in reports), default=0.0)
+    timeline = {}
+    for report in reports:
+        for second, depth in report["queue_depth"]:
+            timeline[second] = timeline.get(second, 0) + depth
+    return {
+        "config": {
+            key: options[key]
+            for key in (
+                "rate",
+                "duration",
+                "records",
+                "payload",
+                "threads",
+                "async_tasks",
+                "processes",
+                "sink",
+            )
+        },
+        "logs_dir": logs_dir,
+        "failed_processes": failed,
+        "produced": produced,
+        "written": written,
+        "lost": max(0, produced - written),
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(produced / elapsed, 1) if elapsed else 0.0,
+        "latency_us": {
+            "p50": round(_percentile(ordered, 0.50) * 1e6, 1),
+            "p99": round(_percentile(ordered, 0.99) * 1e6, 1),
+            "max": round(ordered[-1] * 1e6, 1) if ordered else 0.0,
+        },
+        "queue_depth": {
+            "max": max(timeline.values(), default=0),
+            "timeline": sorted(timeline.items()),
+        },
+        "drain_seconds": max(
+            (report["drain_seconds"] for report in reports), default=0.0
+        ),
+        "peak_rss_mb": max(
+            (report["peak_rss_mb"] or 0 for report in reports), default=None
+        ),
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Human-readable summary of a `run()` report.
+    """
+    config = report["config"]
+    latency = report["latency_us"]
+    lines = [
+        "HESTIA load test: {payload} payload -> {sink} sink, {processes} process(es)"
+        " x ({threads} threads + {async_tasks} async tasks)".format(**config),
+        f"  produced           {report['produced']}"
+        f" in {report['elapsed_seconds']}s",
+        f"  records/sec        {report['records_per_second']}"
+        + (f" (target {config['rate']})" if config["rate"] else ""),
+        f"  call latency (us)  p50 {latency['p50']}  p99 {latency['p99']}"
+        f"  max {latency['max']}",
+        f"  queue depth max    {report['queue_depth']['max']}",
+        f"  drain time         {report['drain_seconds']}s",
+        f"  peak RSS (MB)      {report['peak_rss_mb']}",
+        f"  written / lost     {report['written']} / {report['lost']}",
+        f"  logs               {report['logs_dir']}",
+    ]
+    if report["failed_processes"]:
+        lines.append(f"  FAILED PROCESSES   {report['failed_processes']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = add_arguments(
+        argparse.ArgumentParser(
+            prog="hestia-loadgen", description="HESTIA Logger load generator."
+        )
+    )
+    args = parser.parse_args(argv)
+    report = run(vars(args))
+    print(json.dumps(report) if args.json else format_report(report))
+    return 1 if report["failed_processes"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
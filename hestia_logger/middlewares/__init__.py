@@ -9,7 +9,7 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 # Expose middleware module
 from .middleware import LoggingMiddleware
 from .middleware import setup_logging_middleware
-
+from .middleware import setup_metrics_endpoint
 
 # Define public API for `middlewares`
-__all__ = ["LoggingMiddleware", "setup_logging_middleware"]
+__all__ = ["LoggingMiddleware", "setup_logging_middleware", "setup_metrics_endpoint"]
@@ -23,11 +23,15 @@ except ImportError:  # pragma: no cover - handled via _require_starlette
     Request = Response = Any
     STARLETTE_AVAILABLE = False
 
-from ..handlers.console_handler import console_handler  # Use global console handler
 from ..core.formatters import JSONFormatter  # Use JSON formatter
-from ..core.config import LOGS_DIR
+from ..core.config import LOGS_DIR, LOG_LEVELS, LOG_OUTPUT, LOG_TAIL_SAMPLING
+from ..core.custom_logger import app_log_handler, register_level
+from ..core.custom_logger import async_console_handler as console_handler
+from ..core import tail_sampling
+from ..core.redaction import default_redactor
+from ..core.metrics import prometheus_text
 
-__all__ = ["LoggingMiddleware"]
+__all__ = ["LoggingMiddleware", "setup_metrics_endpoint"]
 
 
 def _require_starlette():
@@ -50,18 +54,22 @@ class LoggingMiddleware:
         """
         self.logger = logging.getLogger(logger_name)
 
-        # Load log level from environment variable
-        LOG_LEVELS = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL,
-        }
+        # Level from MIDDLEWARE_LOG_LEVEL, unless HESTIA_LEVELS overrides it
         LOG_LEVEL_STR = os.getenv("MIDDLEWARE_LOG_LEVEL", "INFO").upper()
-        LOG_LEVEL = LOG_LEVELS.get(LOG_LEVEL_STR, logging.INFO)
-        self.logger.setLevel(LOG_LEVEL)
+        register_level(logger_name, LOG_LEVELS.get(LOG_LEVEL_STR, logging.INFO))
+
+        if LOG_OUTPUT == "stdout":
+            # JSON lines on stdout through the shared `app` sink; no files
+            stdout_handler = app_log_handler()
+            if stdout_handler not in self.logger.handlers:
+                self.logger.addHandler(stdout_handler)
+        else:
+            self._add_console_and_file_handlers()
+
+        # Prevent log duplication
+        self.logger.propagate = False
 
+    def _add_console_and_file_handlers(self):
         # Use global console handler
         if console_handler not in self.logger.handlers:
             self.logger.addHandler(console_handler)
@@ -83,9 +91,6 @@ class LoggingMiddleware:
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
 
-        # Prevent log duplication
-        self.logger.propagate = False
-
     def log_request(self, request: Request):
         """
         Logs details of an incoming HTTP request.
@@ -98,17 +103,20 @@ class LoggingMiddleware:
         client = getattr(request, "client", None)
         headers = getattr(request, "headers", {}) or {}
 
+        redactor = default_redactor()
         log_entry = {
             "event": "incoming_request",
             "request_id": request_id,
             "method": getattr(request, "method", "UNKNOWN"),
             "path": str(path) if path is not None else str(url),
-            "query": str(query),
+            "query": redactor.redact_query(str(query)),
             "client": getattr(client, "host", "unknown") if client else "unknown",
-            "headers": {
-                "user-agent": headers.get("user-agent"),
-                "host": headers.get("host"),
-            },
+            "headers": redactor.redact(
+                {
+                    "user-agent": headers.get("user-agent"),
+                    "host": headers.get("host"),
+                }
+            ),
         }
         self.logger.info(log_entry)
 
@@ -143,12 +151,20 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
-def setup_logging_middleware(app, logger_name="hestia_middleware"):
+def setup_logging_middleware(
+    app, logger_name="hestia_middleware", tail_sampling_enabled=None
+):
     """
     Apply HESTIA logging and request ID middleware to a FastAPI app.
+
+    With tail sampling (`LOG_TAIL_SAMPLING`), records HESTIA loggers drop for
+    being below their level are buffered per request and only written when
+    the request raises or returns a 5xx.
     """
     _require_starlette()
     logger = LoggingMiddleware(logger_name)
+    if tail_sampling_enabled is None:
+        tail_sampling_enabled = LOG_TAIL_SAMPLING
 
     @app.middleware("http")
     async def log_wrapper(request: Request, call_next):
@@ -156,7 +172,31 @@ def setup_logging_middleware(app, logger_name="hestia_middleware"):
         request.state.request_id = request_id
 
         logger.log_request(request)
-        response = await call_next(request)
+        if tail_sampling_enabled:
+            token = tail_sampling.begin_request(request_id)
+            try:
+                response = await call_next(request)
+            except BaseException:
+                tail_sampling.end_request(token, failed=True)
+                raise
+            tail_sampling.end_request(token, failed=response.status_code >= 500)
+        else:
+            response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
         logger.log_response(request, response)
         return response
+
+
+def setup_metrics_endpoint(app, path="/metrics"):
+    """
+    Expose HESTIA pipeline metrics in Prometheus text format on a FastAPI app.
+    """
+    _require_starlette()
+
+    @app.get(path, include_in_schema=False)
+    async def hestia_metrics():
+        return Response(
+            prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    return hestia_metrics
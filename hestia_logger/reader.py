@@ -0,0 +1,234 @@
+"""
+HESTIA Logger - Indexed Log Reader.
+
+Reads JSON-lines logs (`app.log` and its rotated backups) through `mmap`
+and uses the sidecar sparse index (`app.log.idx`) written by
+`IndexedRotatingFileHandler` to jump straight to the blocks that can match a
+time range or a key lookup instead of parsing every line.
+
+Index format: one JSON object per line, one line per block of records:
+    {"offset": 0, "end": 81234, "count": 1000,
+     "first": "2025-03-14T13:57:41.052Z", "last": "2025-03-14T13:57:43.911Z",
+     "bloom": {"request_id": "<base64 bits>", "service": "<base64 bits>"}}
+
+Timestamps are compared as ISO-8601 strings, so `since`/`until` accept any
+prefix such as `2025-03-14` or `2025-03-14T13:00`.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import base64
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+
+__all__ = ["BloomFilter", "LogReader", "log_files", "query_logs"]
+
+INDEX_SUFFIX = ".idx"
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over raw JSON value tokens.
+    """
+
+    __slots__ = ("bits", "size", "hashes")
+
+    def __init__(self, size: int, hashes: int = 7, bits: bytes = None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray(size // 8)
+
+    def _positions(self, token: bytes):
+        digest = hashlib.blake2b(token, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, token: bytes):
+        for position in self._positions(token):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, token: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(token)
+        )
+
+    def encode(self) -> str:
+        return base64.b64encode(bytes(self.bits)).decode("ascii")
+
+    @classmethod
+    def decode(cls, data: str) -> "BloomFilter":
+        bits = base64.b64decode(data)
+        return cls(len(bits) * 8, bits=bits)
+
+
+_TIMESTAMP = re.compile(rb'\{"timestamp": "([^"]*)"')
+
+
+def timestamp_of(line: bytes):
+    """
+    Returns the leading JSONFormatter timestamp of a serialized line.
+    """
+    match = _TIMESTAMP.match(line)
+    return match.group(1).decode("ascii", "replace") if match else None
+
+
+def key_pattern(key: str):
+    """
+    Matches `"key": <json scalar>` and captures the raw JSON token.
+    """
+    return re.compile(
+        rb'"' + re.escape(key.encode()) + rb'": ("(?:[^"\\]|\\.)*"|[^,}\s\]]+)'
+    )
+
+
+def value_tokens(value):
+    """
+    Raw JSON tokens a looked-up value may have been serialized as.
+    """
+    tokens = {json.dumps(value, ensure_ascii=False).encode("utf-8")}
+    if isinstance(value, str):
+        try:
+            tokens.add(json.dumps(json.loads(value)).encode("utf-8"))
+        except ValueError:
+            pass
+    return tokens
+
+
+def log_files(path: str, include_backups: bool = True):
+    """
+    Returns `path` and its rotated backups, oldest first.
+    """
+    files = []
+    if include_backups:
+        suffix = re.compile(re.escape(path) + r"\.(\d+)$")
+        backups = [
+            (int(m.group(1)), f)
+            for f in glob.glob(glob.escape(path) + ".*")
+            if (m := suffix.match(f))
+        ]
+        files = [f for _, f in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def _in_range(timestamp, since, until):
+    if timestamp is None:
+        return True
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp[: len(until)] > until:
+        return False
+    return True
+
+
+class LogReader:
+    """
+    Memory-mapped reader for one JSON-lines log file and its sidecar index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.blocks = self._load_index(path + INDEX_SUFFIX)
+
+    @staticmethod
+    def _load_index(index_path):
+        blocks = []
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        blocks.append(json.loads(line))
+                    except ValueError:
+                        break  # Torn last line; the tail is scanned instead
+        except FileNotFoundError:
+            pass
+        return blocks
+
+    def _regions(self, size, since, until, where):
+        tokens = {key: value_tokens(value) for key, value in where.items()}
+        # Blocks beyond the data belong to a replaced/truncated file
+        blocks = sorted(
+            (block for block in self.blocks if block["end"] <= size),
+            key=lambda block: block["offset"],
+        )
+        covered = 0
+        for block in blocks:
+            if block["offset"] > covered:
+                # Never indexed (e.g. a writer died before finishing its
+                # block and another one appended after it): scan it all
+                yield covered, block["offset"]
+            start = max(block["offset"], covered)
+            covered = max(covered, block["end"])
+            if start >= block["end"]:
+                continue
+            first, last = block.get("first"), block.get("last")
+            if since is not None and last is not None and last < since:
+                continue
+            if until is not None and first is not None and first[: len(until)] > until:
+                continue
+            blooms = block.get("bloom", {})
+            if any(
+                key in blooms
+                and not any(t in BloomFilter.decode(blooms[key]) for t in key_tokens)
+                for key, key_tokens in tokens.items()
+            ):
+                continue
+            yield start, block["end"]
+        if covered < size:
+            yield covered, size
+
+    def query(self, since=None, until=None, where=None):
+        """
+        Lazily yields entries within `[since, until]` whose fields equal `where`.
+        """
+        where = where or {}
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                needles = [
+                    (key, [b'"' + key.encode() + b'": ' + t for t in value_tokens(v)])
+                    for key, v in where.items()
+                ]
+                for start, end in self._regions(size, since, until, where):
+                    position = start
+                    while position < end:
+                        newline = mm.find(b"\n", position, end)
+                        stop = end if newline == -1 else newline
+                        line = mm[position:stop]
+                        position = stop + 1
+                        if not line.strip():
+                            continue
+                        if not _in_range(timestamp_of(line), since, until):
+                            continue
+                        if any(not any(n in line for n in ns) for _, ns in needles):
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if all(
+                            entry.get(k) == v or str(entry.get(k)) == str(v)
+                            for k, v in where.items()
+                        ):
+                            yield entry
+
+
+def query_logs(path, since=None, until=None, where=None, include_backups=True):
+    """
+    Queries `path` and (optionally) its rotated backups, oldest first.
+    """
+    for log_file in log_files(path, include_backups):
+        yield from LogReader(log_file).query(since, until, where)
@@ -7,7 +7,21 @@ Author: FOX Techniques <ali.nabbi@fox-techniques.com>
 """
 
 # Define public API for `utils`
-__all__ = ["requests_logger"]
+__all__ = [
+    "requests_logger",
+    "InstrumentedHTTPAdapter",
+    "InstrumentedTransport",
+    "AsyncInstrumentedTransport",
+    "instrument_session",
+    "instrument_engine",
+]
 
 # Expose utilities
 from .requests_logger import requests_logger
+from .http_client import (
+    InstrumentedHTTPAdapter,
+    InstrumentedTransport,
+    AsyncInstrumentedTransport,
+    instrument_session,
+)
+from .sqlalchemy_logger import instrument_engine
@@ -0,0 +1,370 @@
+"""
+Hestia Logger - HTTP Client Instrumentation.
+
+Transport-level instrumentation for outbound calls made with `requests` and
+`httpx` (sync and async):
+
+    session = instrument_session(requests.Session())
+    client = httpx.Client(transport=InstrumentedTransport())
+    client = httpx.AsyncClient(transport=AsyncInstrumentedTransport())
+
+Every call records method, host, route (`/users/{id}`), status, connect,
+time-to-first-byte and total timings, bytes sent/received and whether a
+pooled connection was reused. Each call feeds the per-host latency histogram
+in `core.metrics` (`http_stats()`, `/metrics`). Calls are logged to the
+`hestia_requests` logger; successful (<400) ones only at
+`LOG_HTTP_SUCCESS_SAMPLE_RATE`, so the sampling decision is made before
+anything is formatted.
+
+Connect time covers name resolution, TCP and TLS: neither urllib3 nor
+httpcore reports DNS separately.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import logging
+import random
+import re
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..core.config import LOG_HTTP_SUCCESS_SAMPLE_RATE
+from ..core.metrics import observe_http
+from .requests_logger import requests_logger
+
+__all__ = [
+    "InstrumentedHTTPAdapter",
+    "InstrumentedTransport",
+    "AsyncInstrumentedTransport",
+    "instrument_session",
+    "route_template",
+]
+
+# Path segments replaced by `{id}`: numbers, UUIDs and long hex/base64ish ids
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,}|[A-Za-z0-9_-]{24,}"
+)
+_ROUTE_CACHE = {}
+_ROUTE_CACHE_SIZE = 4096
+
+
+def route_template(path: str) -> str:
+    """
+    Low-cardinality route for a URL path (`/users/42` -> `/users/{id}`).
+    """
+    route = _ROUTE_CACHE.get(path)
+    if route is None:
+        route = "/".join(
+            "{id}" if _ID_SEGMENT.fullmatch(segment) else segment
+            for segment in path.split("/")
+        )
+        if len(_ROUTE_CACHE) >= _ROUTE_CACHE_SIZE:
+            _ROUTE_CACHE.clear()
+        _ROUTE_CACHE[path] = route
+    return route
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return None  # Streamed/generator body
+
+
+class _Call:
+    """
+    Timings of one outbound request, recorded once when it completes.
+    """
+
+    __slots__ = (
+        "method",
+        "host",
+        "path",
+        "started",
+        "ttfb",
+        "connect",
+        "reused",
+        "sent",
+        "received",
+        "status",
+        "done",
+        "_connect_started",
+    )
+
+    def __init__(self, method: str, host: str, path: str, sent):
+        self.method = method
+        self.host = host
+        self.path = path
+        self.sent = sent
+        self.started = time.perf_counter()
+        self.ttfb = self.connect = self.reused = self.status = None
+        self.received = 0
+        self.done = False
+        self._connect_started = None
+
+    def trace(self, event: str, info):
+        """
+        httpcore `trace` extension callback.
+        """
+        if event == "connection.connect_tcp.started":
+            self._connect_started = time.perf_counter()
+        elif event in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            if self._connect_started is not None:
+                self.connect = time.perf_counter() - self._connect_started
+        elif event.endswith("send_request_headers.started"):
+            self.reused = self._connect_started is None
+        elif event.endswith("receive_response_headers.complete"):
+            self.ttfb = time.perf_counter() - self.started
+
+    def headers_received(self, status: int):
+        self.status = status
+        if self.ttfb is None:
+            self.ttfb = time.perf_counter() - self.started
+
+    def finish(self, error: BaseException = None):
+        if self.done:
+            return
+        self.done = True
+        total = time.perf_counter() - self.started
+        status = self.status
+        observe_http(self.host, total, error is not None or (status or 0) >= 500)
+        if error is None and status is not None and status < 400:
+            rate = LOG_HTTP_SUCCESS_SAMPLE_RATE
+            if rate < 1 and random.random() >= rate:
+                return
+            level = logging.INFO
+        elif error is None and status < 500:
+            level = logging.WARNING
+        else:
+            level = logging.ERROR
+        if not requests_logger.isEnabledFor(level):
+            return
+
+        entry = {
+            "event": "http_client_request",
+            "method": self.method,
+            "host": self.host,
+            "route": route_template(self.path or "/"),
+            "status_code": status,
+            "duration_ms": round(total * 1000, 3),
+            "ttfb_ms": None if self.ttfb is None else round(self.ttfb * 1000, 3),
+            "connect_ms": (
+                None if self.connect is None else round(self.connect * 1000, 3)
+            ),
+            "connection_reused": self.reused,
+            "bytes_sent": self.sent,
+            "bytes_received": self.received,
+        }
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        requests_logger.log(level, entry)
+
+
+# ---------------------------------------------------------------------------
+# requests
+# ---------------------------------------------------------------------------
+
+
+class _TimedConnection:
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        self._hestia_connect = time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter that times and records every call.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # New connections time their own connect(); pooled ones are reused
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        parts = urlsplit(request.url)
+        host = parts.hostname or ""
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        call = _Call(request.method, host, parts.path, _body_size(request.body))
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            call.headers_received(response.status_code)
+            connection = getattr(response.raw, "connection", None)
+            if isinstance(connection, _TimedConnection):
+                call.connect = connection.__dict__.pop("_hestia_connect", None)
+                call.reused = call.connect is None
+            if stream:
+                length = response.headers.get("Content-Length")
+                call.received = int(length) if length and length.isdigit() else None
+            else:
+                # Session.send would read it right after; read it here to time it
+                call.received = len(response.content)
+        except Exception as error:
+            call.finish(error)
+            raise
+        call.finish()
+        return response
+
+
+def instrument_session(session=None):
+    """
+    Mounts `InstrumentedHTTPAdapter` on a `requests` session (a new one if
+    none is given) and returns it.
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+    adapter = InstrumentedHTTPAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# ---------------------------------------------------------------------------
+# httpx
+# ---------------------------------------------------------------------------
+
+
+def _httpx_call(request: httpx.Request) -> _Call:
+    url = request.url
+    host = url.host if url.port is None else f"{url.host}:{url.port}"
+    length = request.headers.get("Content-Length")
+    sent = int(length) if length and length.isdigit() else None
+    return _Call(request.method, host, url.path, sent)
+
+
+class _TimedStream(httpx.SyncByteStream):
+    def __init__(self, stream, call: _Call):
+        self._stream = stream
+        self._call = call
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._call.received += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._call.finish()
+
+
+class _AsyncTimedStream(httpx.AsyncByteStream):
+    def __init__(self, stream, call: _Call):
+        self._stream = stream
+        self._call = call
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._call.received += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._call.finish()
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """
+    `httpx` transport recording every call; wraps `transport` (default: a
+    new `httpx.HTTPTransport(**kwargs)`).
+    """
+
+    def __init__(self, transport: httpx.BaseTransport = None, **kwargs):
+        self._transport = transport or httpx.HTTPTransport(**kwargs)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        call = _httpx_call(request)
+        previous = request.extensions.get("trace")
+
+        def trace(event, info):
+            call.trace(event, info)
+            if previous is not None:
+                previous(event, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as error:
+            call.finish(error)
+            raise
+        call.headers_received(response.status_code)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TimedStream(response.stream, call),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncInstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of `InstrumentedTransport` for `httpx.AsyncClient`.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport = None, **kwargs):
+        self._transport = transport or httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        call = _httpx_call(request)
+        previous = request.extensions.get("trace")
+
+        async def trace(event, info):
+            call.trace(event, info)
+            if previous is not None:
+                await previous(event, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as error:
+            call.finish(error)
+            raise
+        call.headers_received(response.status_code)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_AsyncTimedStream(response.stream, call),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -0,0 +1,280 @@
+"""
+Hestia Logger - SQLAlchemy Query Instrumentation.
+
+Opt-in instrumentation of SQLAlchemy engines through the
+`before_cursor_execute` / `after_cursor_execute` / `handle_error` events:
+
+    instrumentation = instrument_engine(engine)
+
+Statements are fingerprinted by normalizing literals and bind parameters
+(`WHERE id = 42` and `WHERE id = :id_1` both become `WHERE id = ?`, and
+`IN (?, ?, ?)` becomes `IN (?+)`). Fingerprints are cached per distinct SQL
+string in an LRU, so a statement is only parsed the first time it is seen.
+
+Every execution updates the count and latency histogram of its
+fingerprint. Only slow statements (`LOG_SQL_SLOW_MS`), failures and a
+`LOG_SQL_SAMPLE_RATE` sample are logged one by one, with redacted
+parameters. Every `LOG_SQL_REPORT_INTERVAL` seconds the busiest fingerprints
+are logged as aggregate records, so a query repeated hundreds of times per
+window (N+1) stands out without logging every statement.
+
+Author: FOX Techniques <ali.nabbi@fox-techniques.com>
+"""
+
+import collections
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+
+from ..core.config import (
+    LOG_SQL_SLOW_MS,
+    LOG_SQL_SAMPLE_RATE,
+    LOG_SQL_REPORT_INTERVAL,
+    LOG_SQL_REPORT_TOP,
+    LOG_SQL_FINGERPRINT_CACHE,
+)
+from ..core.metrics import Histogram
+from ..core.redaction import default_redactor
+
+try:
+    from sqlalchemy import event
+except ImportError:
+    event = None
+
+__all__ = ["QueryInstrumentation", "instrument_engine", "fingerprint_statement"]
+
+_WHITESPACE = re.compile(r"\s+")
+# String literals, numbers and bind placeholders (%(name)s, %s, :name, $1, ?)
+_VALUES = re.compile(
+    r"'(?:[^']|'')*'"
+    r"|(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"
+    r"|%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+|\?"
+)
+_IN_LIST = re.compile(r"\b(IN) ?\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_ROWS = re.compile(r"(\([?+, ]+\))(?:\s*,\s*\([?+, ]+\))+")
+
+_CACHE = collections.OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _normalize(statement: str) -> str:
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _VALUES.sub("?", normalized)
+    normalized = _IN_LIST.sub(r"\1 (?+)", normalized)
+    return _ROWS.sub(r"\1", normalized)  # Multi-row VALUES
+
+
+def fingerprint_statement(statement: str):
+    """
+    `(fingerprint, normalized statement)` for a SQL string (LRU cached).
+    """
+    with _CACHE_LOCK:
+        cached = _CACHE.get(statement)
+        if cached is not None:
+            _CACHE.move_to_end(statement)
+            return cached
+    normalized = _normalize(statement)
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8)
+    cached = (digest.hexdigest(), normalized)
+    with _CACHE_LOCK:
+        _CACHE[statement] = cached
+        while len(_CACHE) > LOG_SQL_FINGERPRINT_CACHE:
+            _CACHE.popitem(last=False)
+    return cached
+
+
+def _named(context, parameters):
+    # Compiled statements keep their bind names, which key redaction relies
+    # on; the DBAPI parameters of qmark/format drivers are positional
+    compiled = getattr(context, "compiled_parameters", None)
+    if not compiled:
+        return parameters
+    return compiled if len(compiled) > 1 else compiled[0]
+
+
+class _QueryStats:
+    __slots__ = ("statement", "count", "errors", "total", "max", "latency")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.latency = Histogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max * 1000, 3),
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+
+class QueryInstrumentation:
+    """
+    Statement fingerprints, latency aggregates and slow-query logging for
+    one engine. `remove()` detaches it.
+    """
+
+    def __init__(
+        self,
+        engine,
+        logger=None,
+        slow_ms: float = None,
+        sample_rate: float = None,
+        report_interval: float = None,
+        report_top: int = None,
+    ):
+        if event is None:
+            raise ImportError("SQLAlchemy is required for query instrumentation.")
+        if logger is None:
+            from ..core.custom_logger import get_logger
+
+            logger = get_logger("hestia_sql")
+        # AsyncEngine events are registered on its sync engine
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.logger = logger
+        self.slow = (LOG_SQL_SLOW_MS if slow_ms is None else slow_ms) / 1000
+        self.sample_rate = LOG_SQL_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.report_interval = (
+            LOG_SQL_REPORT_INTERVAL if report_interval is None else report_interval
+        )
+        self.report_top = LOG_SQL_REPORT_TOP if report_top is None else report_top
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._window_started = time.monotonic()
+        self._listeners = (
+            ("before_cursor_execute", self._before),
+            ("after_cursor_execute", self._after),
+            ("handle_error", self._error),
+        )
+        for name, listener in self._listeners:
+            event.listen(self.engine, name, listener)
+
+    def remove(self):
+        for name, listener in self._listeners:
+            event.remove(self.engine, name, listener)
+
+    # -- event listeners ----------------------------------------------------
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("hestia_query_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("hestia_query_started")
+        if not started:
+            return
+        self._observe(
+            statement, _named(context, parameters), executemany, started.pop()
+        )
+
+    def _error(self, context):
+        started = context.connection.info.get("hestia_query_started")
+        if context.statement is None or not started:
+            return
+        execution = context.execution_context
+        self._observe(
+            context.statement,
+            _named(execution, context.parameters),
+            execution is not None and execution.executemany,
+            started.pop(),
+            context.original_exception,
+        )
+
+    # -- recording ------------------------------------------------------------
+
+    def _observe(self, statement, parameters, executemany, started, error=None):
+        elapsed = time.perf_counter() - started
+        fingerprint, normalized = fingerprint_statement(statement)
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                stats = self._stats[fingerprint] = _QueryStats(normalized)
+            stats.count += 1
+            stats.errors += error is not None
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+            stats.latency.observe(elapsed)
+
+        if error is not None:
+            level, kind = logging.ERROR, "sql_error"
+        elif elapsed >= self.slow:
+            level, kind = logging.WARNING, "slow_query"
+        elif self.sample_rate and random.random() < self.sample_rate:
+            level, kind = logging.INFO, "sampled_query"
+        else:
+            level = None
+        if level is not None:
+            entry = {
+                "event": kind,
+                "fingerprint": fingerprint,
+                "statement": normalized,
+                "duration_ms": round(elapsed * 1000, 3),
+                "parameters": self._parameters(parameters, executemany),
+            }
+            if error is not None:
+                entry["error"] = f"{type(error).__name__}: {error}"
+            self.logger.log(level, entry)
+
+        if (
+            self.report_interval
+            and time.monotonic() - self._window_started >= self.report_interval
+        ):
+            self.report()
+
+    @staticmethod
+    def _parameters(parameters, executemany):
+        if executemany and isinstance(parameters, (list, tuple)) and parameters:
+            # One parameter set is enough to reproduce the statement
+            return {
+                "first": default_redactor().redact(parameters[0]),
+                "sets": len(parameters),
+            }
+        return default_redactor().redact(parameters)
+
+    def stats(self) -> dict:
+        """
+        Aggregates of the current report window, per fingerprint.
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        return {fingerprint: stats.snapshot() for fingerprint, stats in items}
+
+    def report(self) -> list:
+        """
+        Logs the busiest fingerprints of the current window (by total time),
+        starts a new window and returns the logged aggregates.
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            started, self._window_started = self._window_started, time.monotonic()
+        window = round(time.monotonic() - started, 3)
+        busiest = sorted(stats.items(), key=lambda item: item[1].total, reverse=True)
+        aggregates = []
+        for fingerprint, entry in busiest[: self.report_top]:
+            aggregate = {
+                "event": "sql_aggregate",
+                "fingerprint": fingerprint,
+                "window_seconds": window,
+                **entry.snapshot(),
+            }
+            self.logger.info(aggregate)
+            aggregates.append(aggregate)
+        return aggregates
+
+
+def instrument_engine(engine, **kwargs) -> QueryInstrumentation:
+    """
+    Instruments a SQLAlchemy `Engine` (or `AsyncEngine`); see
+    `QueryInstrumentation` for the options.
+    """
+    return QueryInstrumentation(engine, **kwargs)
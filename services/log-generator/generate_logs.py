@@ -1,58 +1,36 @@
-import time
-import random
-from datetime import datetime
-from hestia_logger import get_logger
+"""
+Soak-test driver for the log-generator service.
 
-# Get the logger
-logger = get_logger("microservice")
+Runs the HESTIA load generator back to back in fixed windows and prints one
+JSON report per window (records/sec, producer latency, queue depth, peak RSS,
+records lost), so a long-running container doubles as a soak test. Every
+option comes from `LOADGEN_*` environment variables (see `hestia-logger
+loadgen --help`); `LOADGEN_WINDOWS=0` keeps running until stopped.
+"""
 
-# Possible log levels
-LOG_LEVELS = ["INFO", "DEBUG", "WARNING", "ERROR", "CRITICAL"]
+import argparse
+import json
+import os
+import sys
 
-# Artificial log messages
-LOG_MESSAGES = [
-    "User login successful",
-    "User login failed: Invalid credentials",
-    "Payment processed successfully",
-    "Database connection lost",
-    "Cache invalidated",
-    "API request timeout",
-    "User session expired",
-    "Unauthorized access attempt detected",
-]
-
-
-def generate_log():
-    """Generates and logs a random log entry using Hestia Logger."""
-    log_level = random.choice(LOG_LEVELS)
-    log_message = random.choice(LOG_MESSAGES)
-
-    # Simulate structured logging
-    log_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "user_id": random.randint(1000, 9999),
-        "session_id": f"session-{random.randint(10000, 99999)}",
-    }
-
-    # Log based on random log level
-    if log_level == "INFO":
-        logger.info(log_message, extra=log_data)
-    elif log_level == "DEBUG":
-        logger.debug(log_message, extra=log_data)
-    elif log_level == "WARNING":
-        logger.warning(log_message, extra=log_data)
-    elif log_level == "ERROR":
-        logger.error(log_message, extra=log_data)
-    elif log_level == "CRITICAL":
-        logger.critical(log_message, extra=log_data)
+from hestia_logger import loadgen
 
 
 def main():
-    """Continuously logs artificial events using Hestia Logger."""
-    while True:
-        generate_log()
-        time.sleep(random.uniform(1, 3))  # Random interval between logs
+    options = vars(loadgen.add_arguments(argparse.ArgumentParser()).parse_args([]))
+    options["logs_dir"] = options["logs_dir"] or os.getenv("LOGS_DIR", "")
+    windows = int(os.getenv("LOADGEN_WINDOWS", 0))
+    window = 0
+    while not windows or window < windows:
+        window += 1
+        report = loadgen.run(options)
+        report["window"] = window
+        report["queue_depth"].pop("timeline")
+        print(json.dumps(report), flush=True)
+        if report["failed_processes"]:
+            return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
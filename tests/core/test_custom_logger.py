@@ -1,5 +1,6 @@
 import io
 import logging
+import signal
 import threading
 import time
 from pathlib import Path
@@ -161,3 +162,452 @@ def test_logger_thread_safety(monkeypatch, tmp_path):
     monkeypatch.delenv("LOGS_DIR", raising=False)
     importlib.reload(core_config)
     importlib.reload(core_custom_logger)
+
+
+class _CountingFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(threadName)s|%(message)s")
+        self.calls = 0
+
+    def format(self, record):
+        self.calls += 1
+        return super().format(record)
+
+
+@pytest.mark.parametrize("mode", ["worker", "producer", "pool"])
+def test_serialization_modes_format_once(monkeypatch, tmp_path, mode):
+    from hestia_logger.core import custom_logger
+    from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", mode)
+    log_path = tmp_path / f"{mode}.log"
+    file_handler = BatchRotatingFileHandler(str(log_path), delay=True)
+    formatter = _CountingFormatter()
+    file_handler.setFormatter(formatter)
+    queue_handler = custom_logger._wrap_with_async_queue(file_handler)
+
+    logger = logging.getLogger(f"serialization_{mode}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    try:
+        for i in range(50):
+            logger.info("record %d", i)
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("|", 1)[1] for line in lines] == [
+        f"record {i}" for i in range(50)
+    ]
+    assert formatter.calls == 50
+    if mode == "producer":
+        assert all(line.startswith("MainThread|") for line in lines)
+
+
+def test_dict_messages_are_snapshotted(monkeypatch, tmp_path):
+    from hestia_logger.core import custom_logger
+    from hestia_logger.core.formatters import JSONFormatter
+    from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    log_path = tmp_path / "dict.log"
+    file_handler = BatchRotatingFileHandler(str(log_path), delay=True)
+    file_handler.setFormatter(JSONFormatter())
+    queue_handler = custom_logger._wrap_with_async_queue(file_handler)
+
+    logger = logging.getLogger("serialization_dict")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        entry = {"message": "started", "event": "job"}
+        logger.warning(entry)
+        entry["message"] = "mutated"
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    import json
+
+    logged = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+    assert logged["message"] == "started"
+    assert logged["event"] == "job"
+
+
+def test_rate_limit_skips_record_creation(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    logger = custom_logger.get_logger("rate_limited_service", rate_limit=3)
+    created = []
+    original = logger.logger.makeRecord
+
+    def counting_make_record(*args, **kwargs):
+        created.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(logger.logger, "makeRecord", counting_make_record)
+    logger.logger.setLevel(logging.DEBUG)
+    for i in range(50):
+        logger.info(f"chatty {i}")
+    logger.error("still delivered")
+
+    assert created.count(logging.INFO) == 3
+    assert created.count(logging.ERROR) == 1
+
+    custom_logger.get_logger("rate_limited_service", rate_limit=0)
+    assert logger.rate_limiter is None
+
+
+def test_rate_limit_with_unknown_level_fails_at_setup():
+    from hestia_logger.core import custom_logger
+
+    with pytest.raises(ValueError, match="Unknown log level"):
+        custom_logger.get_logger("misconfigured_service", rate_limit={"INFOO": 5})
+    assert "misconfigured_service" not in custom_logger._LOGGERS
+
+
+class _RecordList(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_caller_info_points_at_call_site():
+    adapter = get_logger("caller_info_service", log_level=logging.INFO)
+    capture = _RecordList()
+    adapter.logger.addHandler(capture)
+    try:
+        adapter.info("via info")
+        adapter.log(logging.INFO, "via log")
+        expected_line = test_caller_info_points_at_call_site.__code__.co_firstlineno
+    finally:
+        adapter.logger.removeHandler(capture)
+
+    for record in capture.records:
+        assert record.filename == Path(__file__).name
+        assert record.funcName == "test_caller_info_points_at_call_site"
+    assert [r.lineno - expected_line for r in capture.records] == [5, 6]
+
+
+def test_caller_info_disabled_per_logger():
+    adapter = get_logger("no_caller_service", caller_info=False)
+    capture = _RecordList()
+    adapter.logger.addHandler(capture)
+    try:
+        adapter.warning("no caller")
+    finally:
+        adapter.logger.removeHandler(capture)
+        adapter.caller_info = True
+
+    (record,) = capture.records
+    assert record.lineno == 0
+    assert record.funcName == "(unknown function)"
+    assert get_logger("other_caller_service").caller_info is True
+
+
+def test_lane_queue_priority_and_barriers():
+    from hestia_logger.core import custom_logger
+
+    lanes = custom_logger._LaneQueue()
+    lanes.put("info 1")
+    lanes.put("info 2")
+    lanes.put_priority("error 1")
+    lanes.put_priority("error 2")
+    assert [lanes.get_nowait() for _ in range(4)] == [
+        "error 1",
+        "error 2",
+        "info 1",
+        "info 2",
+    ]
+
+    # A priority item never overtakes a sink swap queued before it
+    marker = custom_logger._SinkSwap(None, "worker")
+    lanes.put("info 3")
+    lanes.put(marker)
+    lanes.put_priority("error 3")
+    assert [lanes.get_nowait() for _ in range(3)] == ["info 3", marker, "error 3"]
+
+
+class _GatedSink(logging.Handler):
+    """Batch sink whose first write blocks until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.release_writes = threading.Event()
+        self.lines = []
+
+    def serialize(self, record):
+        return (self.format(record) + "\n").encode()
+
+    def write_batch(self, payload):
+        self.release_writes.wait(5)
+        self.lines.extend(payload.decode().splitlines())
+
+
+def test_warnings_bypass_info_backlog(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    monkeypatch.setattr(custom_logger, "LOG_PRIORITY_LEVEL", logging.WARNING)
+    sink = _GatedSink()
+    queue_handler = custom_logger._wrap_with_async_queue(sink, "lanes_test")
+    logger = logging.getLogger("lanes_test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    try:
+        logger.info("first")
+        while queue_handler.queue.qsize():  # Worker takes "first" and blocks
+            time.sleep(0.001)
+        for i in range(2000):
+            logger.info(f"info {i}")
+        logger.error("outage")
+        sink.release_writes.set()
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    assert sink.lines[:2] == ["first", "outage"]
+    assert sink.lines[2:] == [f"info {i}" for i in range(2000)]
+
+
+def test_records_keep_call_order_by_default(monkeypatch):
+    from hestia_logger.core import config, custom_logger
+
+    assert config.LOG_PRIORITY_LEVEL is None  # Priority lanes are opt-in
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    sink = _GatedSink()
+    queue_handler = custom_logger._wrap_with_async_queue(sink, "ordered_test")
+    logger = logging.getLogger("ordered_test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    try:
+        logger.info("hello")
+        while queue_handler.queue.qsize():  # Worker takes "hello" and blocks
+            time.sleep(0.001)
+        logger.info("queued")
+        logger.error("boom")
+        sink.release_writes.set()
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    assert sink.lines == ["hello", "queued", "boom"]
+
+
+def test_critical_write_through(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "producer")
+    monkeypatch.setattr(custom_logger, "LOG_CRITICAL_WRITE_THROUGH", True)
+    sink = _GatedSink()
+    sink.release_writes.set()
+    queue_handler = custom_logger._wrap_with_async_queue(sink, "write_through")
+    logger = logging.getLogger("write_through")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        logger.critical("fatal")
+        # Written before critical() returned, without flushing the queue
+        assert sink.lines == ["fatal"]
+    finally:
+        logger.removeHandler(queue_handler)
+
+
+class _SlowSink(_GatedSink):
+    """Batch sink taking `delay` seconds per write."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.release_writes.set()
+
+    def write_batch(self, payload):
+        time.sleep(self.delay)
+        super().write_batch(payload)
+
+
+def _queued_logger(custom_logger, sink, name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [custom_logger._wrap_with_async_queue(sink, name)]
+    return logger
+
+
+def test_shutdown_drains_sinks_in_parallel(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    sinks = [_SlowSink(0.2) for _ in range(10)]
+    for index, sink in enumerate(sinks):
+        logger = _queued_logger(custom_logger, sink, f"parallel_shutdown_{index}")
+        for i in range(3):
+            logger.info(f"record {i}")
+
+    report = custom_logger.shutdown(timeout=5)
+
+    assert report["abandoned"] == 0 and report["timed_out"] == []
+    assert all(len(sink.lines) == 3 for sink in sinks)
+    assert report["elapsed"] < 1.5  # Not 10 sinks x 0.2s one after another
+    assert custom_logger._ASYNC_WORKERS == []
+
+
+def test_shutdown_deadline_reports_abandoned(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    stuck = _GatedSink()
+    logger = _queued_logger(custom_logger, stuck, "stuck_shutdown")
+    logger.info("in flight")
+    while logger.handlers[0].queue.qsize():
+        time.sleep(0.001)
+    for i in range(5):
+        logger.info(f"queued {i}")
+
+    started = time.monotonic()
+    report = custom_logger.shutdown(timeout=0.2)
+    stuck.release_writes.set()
+
+    assert time.monotonic() - started < 1
+    assert report["timed_out"] == ["_GatedSink"]
+    assert report["abandoned"] == 6  # The in-flight record was never written
+
+
+def test_shutdown_counts_records_actually_written(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "worker")
+    gated = _GatedSink()
+    logger = _queued_logger(custom_logger, gated, "counted_shutdown")
+    logger.info("in flight")
+    while logger.handlers[0].queue.qsize():
+        time.sleep(0.001)
+    for i in range(5):
+        logger.info(f"queued {i}")
+
+    # The record already taken off the queue is written during shutdown too
+    threading.Timer(0.1, gated.release_writes.set).start()
+    report = custom_logger.shutdown(timeout=5)
+
+    assert report["timed_out"] == [] and report["abandoned"] == 0
+    assert report["flushed"] == len(gated.lines) == 6
+
+
+def test_import_leaves_sigterm_handler_alone():
+    import subprocess
+    import sys
+
+    script = (
+        "import signal, hestia_logger\n"
+        "assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "LOG_SHUTDOWN_ON_SIGTERM"}
+    result = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_flush_is_bounded(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    monkeypatch.setattr(custom_logger, "LOG_FLUSH_TIMEOUT", 0.1)
+    stuck = _GatedSink()
+    logger = _queued_logger(custom_logger, stuck, "stuck_flush")
+    logger.info("blocked")
+    started = time.monotonic()
+    logger.handlers[0].flush()
+    assert time.monotonic() - started < 1
+    stuck.release_writes.set()
+    custom_logger.shutdown(timeout=1)
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+def test_shutdown_signal_drains_then_chains(monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    sink = _SlowSink(0.05)
+    logger = _queued_logger(custom_logger, sink, "signal_shutdown")
+    logger.info("before signal")
+
+    seen = []
+    original = signal.signal(signal.SIGUSR1, lambda signo, frame: seen.append(signo))
+    try:
+        custom_logger.install_shutdown_signal(signal.SIGUSR1, timeout=2)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        time.sleep(0.01)  # Let the interpreter run the handler
+    finally:
+        signal.signal(signal.SIGUSR1, original)
+
+    assert sink.lines == ["before signal"]
+    assert seen == [signal.SIGUSR1]
+
+
+def test_parse_durability_spec():
+    from hestia_logger.core import custom_logger
+
+    assert custom_logger._parse_durability("interval,audit=group_commit,x=bad") == {
+        "*": "interval",
+        "audit": "group_commit",
+    }
+
+
+def test_durable_producers_share_group_commit(monkeypatch, tmp_path):
+    from hestia_logger.core import custom_logger
+    from hestia_logger.handlers import batch_file_handler
+    from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+    monkeypatch.setattr(custom_logger, "_ASYNC_WORKERS", [])
+    fsync = batch_file_handler.os.fsync
+
+    def slow_fsync(fd):
+        time.sleep(0.002)  # A real disk; tmpfs fsyncs are nearly free
+        fsync(fd)
+
+    monkeypatch.setattr(batch_file_handler.os, "fsync", slow_fsync)
+    sink = BatchRotatingFileHandler(
+        str(tmp_path / "audit.log"), delay=True, durability="group_commit"
+    )
+    sink.setFormatter(logging.Formatter("%(message)s"))
+    logger = _queued_logger(custom_logger, sink, "durable_audit")
+
+    path = tmp_path / "audit.log"
+    producers, per_producer = 8, 20
+    start = threading.Barrier(producers)
+    not_on_disk, errors = [], []
+
+    def produce(worker):
+        try:
+            start.wait()
+            for i in range(per_producer):
+                logger.info(f"{worker}-{i}", extra={"durable": True})
+                # Each call returns only once its record is on disk
+                if f"{worker}-{i}\n" not in path.read_text():
+                    not_on_disk.append(f"{worker}-{i}")
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    custom_logger.shutdown(timeout=2)
+
+    records = producers * per_producer
+    assert errors == [] and not_on_disk == []
+    assert len(path.read_text().splitlines()) == records
+    # Concurrent durable records share fsyncs; one fsync per record would not
+    assert 0 < sink.fsyncs < records / 2
@@ -0,0 +1,103 @@
+# test_exception_info.py
+
+from hestia_logger.core import exception_info
+from hestia_logger.core.exception_info import (
+    formatted_traceback,
+    structured_exception,
+)
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+def _recurse(depth):
+    if depth == 0:
+        _fail("deep")
+    _recurse(depth - 1)
+
+
+def _catch(func, *args):
+    try:
+        func(*args)
+    except Exception as e:
+        return e
+
+
+def test_structured_exception_frames():
+    entry = structured_exception(_catch(_fail, "boom"))
+    assert entry["type"] == "ValueError"
+    assert entry["message"] == "boom"
+    assert [f["function"] for f in entry["frames"]] == ["_catch", "_fail"]
+    assert entry["frames"][-1]["file"] == __file__
+    assert "frames_omitted" not in entry
+
+
+def test_fingerprint_stable_per_code_path():
+    first = _catch(_fail, "one")
+    second = _catch(_fail, "two")
+    other = _catch(_recurse, 1)
+    fingerprints = [
+        structured_exception(error)["fingerprint"] for error in (first, second, other)
+    ]
+    assert fingerprints[0] == fingerprints[1] != fingerprints[2]
+    # Messages stay per-instance even though frames come from the cache
+    assert structured_exception(second)["message"] == "two"
+
+
+def test_repeated_exception_hits_cache():
+    exception_info._CACHE.clear()
+    for _ in range(5):
+        structured_exception(_catch(_fail, "x"))
+    assert len(exception_info._CACHE) == 1
+
+
+def test_max_frames_keeps_innermost():
+    entry = structured_exception(_catch(_recurse, 10), max_frames=3)
+    assert len(entry["frames"]) == 3
+    assert entry["frames"][-1]["function"] == "_fail"
+    assert entry["frames_omitted"] == 10
+
+
+def test_exception_chain():
+    def wrap():
+        try:
+            _fail("inner")
+        except ValueError as e:
+            raise RuntimeError("outer") from e
+
+    entry = structured_exception(_catch(wrap))
+    assert entry["type"] == "RuntimeError"
+    assert entry["cause"]["message"] == "inner"
+
+
+def test_exc_info_tuple_and_empty():
+    error = _catch(_fail, "t")
+    assert structured_exception((type(error), error, error.__traceback__))
+    assert structured_exception((None, None, None)) is None
+
+
+def test_formatted_traceback_matches_traceback_layout():
+    import traceback
+
+    def wrap():
+        try:
+            _fail("inner")
+        except ValueError as e:
+            raise RuntimeError("outer") from e
+
+    error = _catch(wrap)
+    text = formatted_traceback(error)
+    expected = "".join(traceback.format_exception(error))
+    # Same frames and chain, minus the source lines
+    assert text.splitlines() == [
+        line for line in expected.splitlines() if not line.startswith("    ")
+    ]
+    assert formatted_traceback((None, None, None)) == ""
+
+
+def test_formatted_traceback_reuses_cached_frames():
+    exception_info._CACHE.clear()
+    texts = {formatted_traceback(_catch(_fail, str(i))) for i in range(5)}
+    assert len(exception_info._CACHE) == 1
+    assert len(texts) == 5  # The message line stays per exception
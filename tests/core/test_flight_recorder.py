@@ -0,0 +1,196 @@
+# test_flight_recorder.py
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hestia_logger.core.flight_recorder import (
+    FlightRecorder,
+    install_dump_signal,
+    prune_rings,
+    read_flight_records,
+)
+
+
+def test_records_round_trip(tmp_path):
+    recorder = FlightRecorder(str(tmp_path / "flight.rec"))
+    recorder.record("svc", logging.DEBUG, "hello %s", ("world",))
+    recorder.record("svc", logging.ERROR, {"event": "boom"})
+    entries = recorder.records()
+    recorder.close()
+
+    assert [(e["level"], e["message"]) for e in entries] == [
+        ("DEBUG", "hello world"),
+        ("ERROR", "{'event': 'boom'}"),
+    ]
+    assert entries[0]["service"] == "svc"
+
+
+def test_ring_wraps_and_keeps_newest(tmp_path):
+    recorder = FlightRecorder(str(tmp_path / "flight.rec"), capacity=4096)
+    for i in range(1000):
+        recorder.record("svc", logging.INFO, f"record {i:04d}")
+    entries = recorder.records()
+    recorder.close()
+
+    messages = [e["message"] for e in entries]
+    assert messages[-1] == "record 0999"
+    assert 50 < len(messages) < 1000
+    first = int(messages[0].split()[1])
+    assert messages == [f"record {i:04d}" for i in range(first, 1000)]
+
+
+def test_recovery_after_kill(tmp_path):
+    path = tmp_path / "flight.rec"
+    script = (
+        "import logging, os, signal\n"
+        "from hestia_logger.core.flight_recorder import FlightRecorder\n"
+        f"recorder = FlightRecorder({str(path)!r}, capacity=64 * 1024)\n"
+        "for i in range(5000):\n"
+        "    recorder.record('svc', logging.DEBUG, f'debug {i}')\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=os.getcwd())
+    assert result.returncode != 0
+
+    entries = read_flight_records(str(path), last=3)
+    assert [e["message"] for e in entries] == ["debug 4997", "debug 4998", "debug 4999"]
+
+    # Reopening keeps the crashed ring for recovery
+    FlightRecorder(str(path)).close()
+    assert read_flight_records(str(path) + ".1", last=1)[0]["message"] == "debug 4999"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="needs SIGUSR2")
+def test_signal_dump(tmp_path):
+    recorder = FlightRecorder(str(tmp_path / "flight.rec"))
+    for i in range(10):
+        recorder.record("svc", logging.DEBUG, f"debug {i}")
+    previous = install_dump_signal(recorder, signal.SIGUSR2, last=2)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR2)
+        deadline = time.monotonic() + 2
+        dumped = ""
+        while '"debug 9"' not in dumped and time.monotonic() < deadline:
+            time.sleep(0.01)
+            dumped = "".join(path.read_text() for path in tmp_path.glob("*.jsonl"))
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+    recorder.close()
+
+    assert [json.loads(line)["message"] for line in dumped.splitlines()] == [
+        "debug 8",
+        "debug 9",
+    ]
+
+
+def _run_with_recorder(script, tmp_path):
+    env = dict(
+        os.environ,
+        LOG_FLIGHT_RECORDER="true",
+        LOG_FLIGHT_RECORDER_PATH=str(tmp_path / "flight.{pid}.rec"),
+        LOGS_DIR=str(tmp_path),
+    )
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.getcwd(),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_workers_get_their_own_ring(tmp_path):
+    # Both processes die without a clean exit, so both rings are kept
+    script = (
+        "import logging, os, signal, sys\n"
+        "from hestia_logger import get_logger\n"
+        "logger = get_logger('worker_service', log_level=logging.WARNING)\n"
+        "pid = os.fork()\n"
+        "logger.debug('from %d', os.getpid())\n"
+        "if pid == 0:\n"
+        "    os._exit(0)\n"
+        "os.waitpid(pid, 0)\n"
+        "print(os.getpid(), pid, flush=True)\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    result = _run_with_recorder(script, tmp_path)
+    parent, child = result.stdout.split()
+
+    for pid in (parent, child):
+        entries = read_flight_records(str(tmp_path / f"flight.{pid}.rec"))
+        assert [e["message"] for e in entries] == [f"from {pid}"]
+
+
+def test_clean_exit_removes_the_ring(tmp_path):
+    script = (
+        "import logging, os\n"
+        "from hestia_logger import get_logger\n"
+        "get_logger('clean_service').debug('bye')\n"
+        "print(os.getpid())\n"
+    )
+    result = _run_with_recorder(script, tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert list(tmp_path.glob("flight.*.rec*")) == []
+
+
+def test_prune_keeps_newest_rings_of_exited_processes(tmp_path):
+    template = str(tmp_path / "flight.{pid}.rec")
+    exited = [2_000_000_000 + i for i in range(5)]  # Beyond any real pid
+    for age, pid in enumerate(reversed(exited)):
+        path = tmp_path / f"flight.{pid}.rec"
+        path.write_bytes(b"ring")
+        os.utime(path, (time.time() - age, time.time() - age))
+    backup = tmp_path / f"flight.{exited[0]}.rec.1"
+    backup.write_bytes(b"old")
+    os.utime(backup, (time.time() - 10, time.time() - 10))
+    live = tmp_path / f"flight.{os.getpid()}.rec"
+    live.write_bytes(b"ring")
+    os.utime(live, (0, 0))
+    (tmp_path / "app.log").write_bytes(b"")
+
+    prune_rings(template, keep=2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [f"flight.{exited[-1]}.rec", f"flight.{exited[-2]}.rec", live.name, "app.log"]
+    )
+
+
+def test_messages_are_formatted_only_when_read(tmp_path):
+    class Counted:
+        calls = 0
+
+        def __str__(self):
+            Counted.calls += 1
+            return "counted"
+
+    recorder = FlightRecorder(str(tmp_path / "flight.rec"))
+    recorder.record("svc", logging.DEBUG, "value=%s n=%d", (Counted(), 7))
+    recorder.record("svc", logging.DEBUG, "%(user)s in", ({"user": "bob"},))
+    # Objects are packed with str() (once), but nothing is %-formatted
+    assert Counted.calls == 1
+    entries = recorder.records()
+    recorder.close()
+
+    assert [e["message"] for e in entries] == ["value=counted n=7", "bob in"]
+
+
+def test_adapter_records_below_level(monkeypatch, tmp_path):
+    from hestia_logger.core import custom_logger
+
+    recorder = FlightRecorder(str(tmp_path / "flight.rec"))
+    monkeypatch.setattr(custom_logger.HestiaLoggerAdapter, "flight_recorder", recorder)
+    logger = custom_logger.get_logger("flight_service", log_level=logging.WARNING)
+    logger.debug("never written %d", 1)
+    entries = recorder.records()
+    recorder.close()
+
+    assert entries[-1]["message"] == "never written 1"
+    assert entries[-1]["level"] == "DEBUG"
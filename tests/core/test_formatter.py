@@ -3,6 +3,8 @@
 import json
 import logging
 import pytest
+from hestia_logger.core import redaction
+from hestia_logger.core.config import LOG_REDACT_KEYS
 from hestia_logger.core.formatters import JSONFormatter
 
 
@@ -70,3 +72,53 @@ def test_json_formatter_with_string(log_record_string):
     # Verify that the JSON string was parsed correctly
     assert log_json["message"] == "Another test", "Incorrect message content"
     assert log_json["event"] == "string_test", "Incorrect event content"
+
+
+def test_json_formatter_structured_exception():
+    """Exceptions are emitted as structured data, not a traceback string."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = __import__("sys").exc_info()
+    record = logging.LogRecord(
+        name="test_service",
+        level=logging.ERROR,
+        pathname=__file__,
+        lineno=10,
+        func="exc_test",
+        msg="failed",
+        args=(),
+        exc_info=exc_info,
+    )
+    entry = json.loads(JSONFormatter().format(record))
+    exception = entry["exception"]
+    assert exception["type"] == "ValueError"
+    assert exception["message"] == "boom"
+    assert (
+        exception["frames"][-1]["function"]
+        == "test_json_formatter_structured_exception"
+    )
+
+
+def test_json_formatter_redaction(monkeypatch):
+    """With redaction on, sensitive keys and values are masked in the entry."""
+    # Value patterns are opt-in (LOG_REDACT_PATTERNS=email)
+    monkeypatch.setattr(
+        redaction, "_DEFAULT", redaction.Redactor(LOG_REDACT_KEYS, ["email"])
+    )
+    record = logging.LogRecord(
+        name="test_service",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10,
+        func="redact_test",
+        msg={"message": "login by bob@example.com", "password": "hunter2"},
+        args=(),
+        exc_info=None,
+    )
+    entry = json.loads(JSONFormatter(redact=True).format(record))
+    assert entry["password"] == "***"
+    assert entry["message"] == "login by ***"
+    assert (
+        json.loads(JSONFormatter(redact=False).format(record))["password"] == "hunter2"
+    )
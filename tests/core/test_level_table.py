@@ -0,0 +1,87 @@
+import logging
+import os
+import subprocess
+import sys
+import pytest
+from hestia_logger.core import custom_logger, runtime_config
+from hestia_logger.core.level_table import LevelTable, parse_level_spec
+
+
+def test_parse_level_spec_skips_invalid_rules():
+    rules = parse_level_spec("api=DEBUG, db_*=warning;bad=LOUD,=INFO,num=15")
+    assert rules == [("api", logging.DEBUG), ("db_*", logging.WARNING), ("num", 15)]
+
+
+def test_exact_names_beat_globs_and_specific_globs_win():
+    table = LevelTable(
+        "*=CRITICAL,database_*=WARNING,database_pg*=ERROR,database_pg_main=DEBUG"
+    )
+    assert table.level_for("database_pg_main") == logging.DEBUG
+    assert table.level_for("database_pg_replica") == logging.ERROR
+    assert table.level_for("database_mysql") == logging.WARNING
+    assert table.level_for("api_service") == logging.CRITICAL
+    assert LevelTable("").level_for("anything") is None
+
+
+def test_many_rules_resolve_once_per_name():
+    spec = ",".join(f"service_{i}_*=WARNING" for i in range(500)) + ",hot_*=DEBUG"
+    table = LevelTable(spec)
+    assert table.level_for("hot_path") == logging.DEBUG
+    assert table.level_for("service_499_worker") == logging.WARNING
+    assert table.level_for("unmatched") is None
+    assert set(table._resolved) == {"hot_path", "service_499_worker", "unmatched"}
+
+
+@pytest.fixture
+def restore_runtime_config():
+    yield
+    runtime_config.reload_config(values=dict(os.environ))
+
+
+def test_hestia_levels_apply_to_existing_and_future_loggers(restore_runtime_config):
+    existing = custom_logger.get_logger("levels_api_service", log_level=logging.INFO)
+    third_party = logging.getLogger("levels_thirdparty.engine")
+    third_party.setLevel(logging.ERROR)
+
+    runtime_config.reload_config(
+        values=dict(
+            os.environ,
+            HESTIA_LEVELS="levels_api_*=DEBUG,levels_thirdparty.*=INFO",
+        )
+    )
+    assert existing.logger.level == logging.DEBUG
+    assert (
+        custom_logger._SERVICE_HANDLERS["levels_api_service"][1].level == logging.DEBUG
+    )
+    assert third_party.level == logging.INFO
+
+    future = custom_logger.get_logger("levels_api_billing", log_level=logging.ERROR)
+    assert future.logger.level == logging.DEBUG
+
+    runtime_config.reload_config(values=dict(os.environ, HESTIA_LEVELS=""))
+    assert existing.logger.level == logging.INFO
+    assert future.logger.level == logging.ERROR
+    assert third_party.level == logging.ERROR
+
+
+def test_hestia_levels_apply_to_loggers_created_later(restore_runtime_config):
+    runtime_config.reload_config(
+        values=dict(os.environ, HESTIA_LEVELS="levels_lazy.*=WARNING")
+    )
+    # Created after the table was applied, as libraries often do
+    lazy = logging.getLogger("levels_lazy.client")
+    assert lazy.level == logging.WARNING
+    assert logging.getLogger("levels_lazy.client") is lazy
+    assert logging.getLogger("levels_other.client").level == logging.NOTSET
+
+    runtime_config.reload_config(values=dict(os.environ, HESTIA_LEVELS=""))
+    assert lazy.level == logging.NOTSET
+
+
+def test_get_logger_is_left_alone_without_hestia_levels():
+    env = {k: v for k, v in os.environ.items() if k != "HESTIA_LEVELS"}
+    code = (
+        "import logging, hestia_logger.core.custom_logger;"
+        "assert 'getLogger' not in vars(logging.root.manager)"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
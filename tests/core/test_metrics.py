@@ -0,0 +1,70 @@
+# test_metrics.py
+
+import logging
+import queue
+import pytest
+from hestia_logger.core import metrics
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.register_sink("unit_sink", "queue", queue.Queue())
+    yield sink
+    metrics.unregister_sink(sink)
+
+
+def test_histogram_is_cumulative():
+    histogram = metrics.Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(4.05)
+
+
+def test_stats_reports_registered_sinks(sink):
+    sink.queue.put("pending")
+    sink.observe_queue()
+    sink.record_write(3, 120, 0.002)
+
+    entry = metrics.stats()["unit_sink"]
+    assert entry["queue_depth"] == 1
+    assert entry["queue_high_watermark"] == 1
+    assert entry["records_written"] == 3
+    assert entry["bytes_written"] == 120
+    assert entry["write_latency_seconds"]["count"] == 1
+
+
+def test_prometheus_text_exposition(sink):
+    sink.record_write(2, 64, 0.0003)
+    text = metrics.prometheus_text()
+    assert "# TYPE hestia_records_written_total counter" in text
+    assert 'hestia_records_written_total{sink="unit_sink"} 2' in text
+    assert 'hestia_bytes_written_total{sink="unit_sink"} 64' in text
+    assert 'hestia_write_latency_seconds_bucket{sink="unit_sink",le="+Inf"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_async_queue_worker_records_metrics(tmp_path):
+    from hestia_logger.core import custom_logger
+    from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+    file_handler = BatchRotatingFileHandler(str(tmp_path / "metered.log"), delay=True)
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    queue_handler = custom_logger._wrap_with_async_queue(file_handler, "metered")
+
+    logger = logging.getLogger("metered_logger")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        for i in range(10):
+            logger.warning("metered %d", i)
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    entry = metrics.stats()["metered"]
+    assert entry["records_written"] == 10
+    assert entry["bytes_written"] == (tmp_path / "metered.log").stat().st_size
+    assert entry["queue_depth"] == 0
@@ -0,0 +1,85 @@
+# test_redaction.py
+
+from collections import namedtuple
+
+from hestia_logger.core.redaction import Redactor, default_redactor
+
+
+def _redactor():
+    return Redactor(["password", "*_token", "Api-Key"], ["email", "bearer", "card"])
+
+
+def test_keys_case_insensitive_and_globs():
+    out = _redactor().redact(
+        {"PASSWORD": "p", "refresh_token": "t", "api-key": "k", "user": "bob"}
+    )
+    assert out == {
+        "PASSWORD": "***",
+        "refresh_token": "***",
+        "api-key": "***",
+        "user": "bob",
+    }
+
+
+def test_non_string_keys():
+    data = {1: "one", (2, 3): "pair", None: {"password": "p"}}
+    out = _redactor().redact(data)
+    assert out[1] == "one" and out[(2, 3)] == "pair"
+    assert out[None] == {"password": "***"}
+
+
+def test_value_patterns():
+    redactor = _redactor()
+    assert redactor.redact_text("mail bob@example.com now") == "mail *** now"
+    assert redactor.redact_text("Authorization: Bearer abc.def==") == (
+        "Authorization: ***"
+    )
+    assert redactor.redact_text("card 4111 1111 1111 1111") == "card ***"
+    # Digit runs that fail the Luhn check are left alone
+    assert redactor.redact_text("order 1234567890123") == "order 1234567890123"
+
+
+def test_long_numeric_ids_are_not_cards():
+    from hestia_logger.core.config import LOG_REDACT_PATTERNS
+
+    assert LOG_REDACT_PATTERNS == []  # Opt-in
+    redactor = _redactor()
+    epoch_ms = [1_700_000_000_000 + i * 7_919 for i in range(500)]
+    snowflakes = [(ms - 1_420_070_400_000) << 22 for ms in epoch_ms]
+    for value in epoch_ms + snowflakes:
+        text = f"id {value}"
+        assert redactor.redact_text(text) == text
+        assert default_redactor().redact_text(text) == text
+
+
+def test_copy_on_write():
+    redactor = _redactor()
+    clean = {"a": [1, {"b": "c"}], "d": ("e",), "f": {"g"}}
+    assert redactor.redact(clean) is clean
+
+    shared = {"x": 1}
+    data = {"keep": shared, "nested": [{"password": "p"}, "plain"]}
+    out = redactor.redact(data)
+    assert out is not data and data["nested"][0]["password"] == "p"
+    assert out["keep"] is shared
+    assert out["nested"][0] == {"password": "***"}
+
+
+def test_tuples_and_namedtuples():
+    Point = namedtuple("Point", "x y")
+    out = _redactor().redact({"t": ("a@b.io", 1), "p": Point("a@b.io", 2)})
+    assert out["t"] == ("***", 1)
+    assert out["p"] == Point("***", 2)
+
+
+def test_redact_query():
+    redactor = _redactor()
+    assert redactor.redact_query("q=1&password=x&to=bob%40example.com") == (
+        "q=1&password=***&to=***"
+    )
+    assert redactor.redact_query("q=1&b=2") == "q=1&b=2"
+
+
+def test_default_redactor_covers_legacy_keys():
+    out = default_redactor().redact({"token": "t", "secret": "s", "apikey": "k"})
+    assert set(out.values()) == {"***"}
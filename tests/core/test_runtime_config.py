@@ -0,0 +1,131 @@
+import logging
+import os
+import signal
+import time
+import pytest
+from hestia_logger.core import custom_logger, runtime_config
+from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+
+@pytest.fixture
+def restore_runtime_config():
+    yield
+    runtime_config.reload_config(values=dict(os.environ))
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_runtime_config_parses_and_diffs():
+    base = runtime_config.RuntimeConfig({})
+    other = runtime_config.RuntimeConfig(
+        {
+            "LOG_LEVEL": "debug",
+            "LOG_ROTATION_MAX_BYTES": "oops",
+            "LOG_INDEX_BLOOM_KEYS": "a, b",
+        }
+    )
+    assert other.LOG_LEVEL == logging.DEBUG
+    assert other.LOG_ROTATION_MAX_BYTES == base.LOG_ROTATION_MAX_BYTES
+    assert other.LOG_INDEX_BLOOM_KEYS == ("a", "b")
+    assert base.diff(other) == {"LOG_LEVEL", "LOG_INDEX_BLOOM_KEYS"}
+    with pytest.raises(AttributeError):
+        base.LOG_LEVEL = logging.ERROR
+
+
+def test_reload_notifies_subscribers_with_changes(restore_runtime_config):
+    seen = []
+    runtime_config.subscribe("test", lambda old, new: seen.append(old.diff(new)))
+    try:
+        values = dict(os.environ, LOG_WRITER_BATCH_SIZE="7")
+        assert runtime_config.reload_config(values=values) == {"LOG_WRITER_BATCH_SIZE"}
+        assert runtime_config.reload_config(values=values) == set()
+        assert runtime_config.current().LOG_WRITER_BATCH_SIZE == 7
+        assert seen == [{"LOG_WRITER_BATCH_SIZE"}]
+    finally:
+        runtime_config._SUBSCRIBERS.pop("test")
+
+
+def test_reload_reads_env_file(tmp_path, restore_runtime_config):
+    env_file = tmp_path / "hestia.env"
+    env_file.write_text("LOG_ROTATION_BACKUP_COUNT=9\n")
+    assert "LOG_ROTATION_BACKUP_COUNT" in runtime_config.reload_config(str(env_file))
+    assert runtime_config.current().LOG_ROTATION_BACKUP_COUNT == 9
+
+
+def test_sink_swap_keeps_worker_and_in_flight_records(tmp_path):
+    first = BatchRotatingFileHandler(str(tmp_path / "first.log"), delay=True)
+    second = BatchRotatingFileHandler(str(tmp_path / "second.log"), delay=True)
+    for handler in (first, second):
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    queue_handler = custom_logger._wrap_with_async_queue(first, "swap_test")
+    entry = custom_logger._ASYNC_WORKERS[-1]
+    worker = entry[1]
+
+    logger = logging.getLogger("swap_test")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        for i in range(200):
+            logger.warning(f"before {i}")
+        custom_logger._swap_sink(queue_handler, second)
+        for i in range(200):
+            logger.warning(f"after {i}")
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    before = (tmp_path / "first.log").read_text().splitlines()
+    after = (tmp_path / "second.log").read_text().splitlines()
+    assert before == [f"before {i}" for i in range(200)]
+    assert after == [f"after {i}" for i in range(200)]
+    assert first.stream is None  # Closed by the worker after the swap
+    assert entry[2] is second and worker.is_alive()
+
+
+def test_set_level_temporarily_lowers_service_level():
+    adapter = custom_logger.get_logger("runtime_level_service", log_level=logging.INFO)
+    queue_handler, file_handler = custom_logger._SERVICE_HANDLERS[
+        "runtime_level_service"
+    ]
+
+    custom_logger.set_level("runtime_level_service", "DEBUG", duration=0.1)
+    assert adapter.isEnabledFor(logging.DEBUG)
+    assert queue_handler.level == file_handler.level == logging.DEBUG
+
+    assert _wait_for(lambda: not adapter.isEnabledFor(logging.DEBUG))
+    assert file_handler.level == logging.INFO
+
+
+def test_set_level_rejects_unknown_level_names():
+    custom_logger.get_logger("runtime_typo_service", log_level=logging.INFO)
+    with pytest.raises(ValueError, match="DEBGU"):
+        custom_logger.set_level("runtime_typo_service", "DEBGU")
+    assert logging.getLogger("runtime_typo_service").level == logging.INFO
+
+
+def test_log_level_reload_applies_to_default_loggers(restore_runtime_config):
+    default = custom_logger.get_logger("runtime_default_service")
+    pinned = custom_logger.get_logger("runtime_pinned_service", log_level=logging.ERROR)
+
+    runtime_config.reload_config(values=dict(os.environ, LOG_LEVEL="DEBUG"))
+    assert default.logger.level == logging.DEBUG
+    assert pinned.logger.level == logging.ERROR
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="needs SIGHUP")
+def test_sighup_triggers_reload(tmp_path, restore_runtime_config):
+    env_file = tmp_path / "hestia.env"
+    env_file.write_text("LOG_COMPRESSION_FRAME_KB=32\n")
+    previous = runtime_config.install_reload_signal(str(env_file))
+    try:
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert _wait_for(
+            lambda: runtime_config.current().LOG_COMPRESSION_FRAME_KB == 32
+        )
+    finally:
+        signal.signal(signal.SIGHUP, previous)
@@ -0,0 +1,116 @@
+import logging
+import sys
+import pytest
+from hestia_logger.core import tail_sampling
+from hestia_logger.core.custom_logger import HestiaLoggerAdapter
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def tail_logger():
+    logger = logging.getLogger("tail_sampling_test")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = ListHandler()
+    logger.addHandler(handler)
+    yield HestiaLoggerAdapter(logger, {"metadata": {"environment": "test"}}), handler
+    logger.removeHandler(handler)
+
+
+def test_successful_requests_discard_without_building_records(
+    tail_logger, monkeypatch
+):
+    adapter, handler = tail_logger
+    built = []
+    monkeypatch.setattr(
+        adapter.logger, "makeRecord", lambda *a, **k: built.append(a) or None
+    )
+
+    token = tail_sampling.begin_request("req-ok")
+    adapter.debug("cheap %s", "detail")
+    assert len(tail_sampling.current_buffer().entries) == 1
+    tail_sampling.end_request(token, failed=False)
+
+    assert built == []
+    assert handler.records == []
+    assert tail_sampling.current_buffer() is None
+    assert tail_sampling._in_flight == 0
+
+
+def test_failed_requests_replay_the_buffer(tail_logger):
+    adapter, handler = tail_logger
+    payload = {"message": "step", "attempt": 1}
+
+    token = tail_sampling.begin_request("req-fail")
+    adapter.debug(payload)
+    payload["attempt"] = 2  # Later mutation must not leak into the buffer
+    adapter.debug("value=%d", 42)
+    tail_sampling.end_request(token, failed=True)
+
+    assert [r.levelno for r in handler.records] == [logging.DEBUG, logging.DEBUG]
+    assert handler.records[0].msg["attempt"] == 1
+    assert handler.records[1].getMessage() == "value=42"
+    assert handler.records[0].metadata == {
+        "environment": "test",
+        "request_id": "req-fail",
+        "tail_sampled": True,
+    }
+
+
+def test_ring_buffer_and_global_cap(tail_logger, monkeypatch):
+    adapter, handler = tail_logger
+    monkeypatch.setattr(tail_sampling, "LOG_TAIL_MAX_RECORDS", 5)
+
+    first = tail_sampling.begin_request("req-a")
+    buffer = tail_sampling.current_buffer()
+    for i in range(8):
+        adapter.debug(f"a{i}")
+    assert len(buffer.entries) == 5 and buffer.dropped == 3
+    tail_sampling.end_request(first, failed=True)
+
+    assert [r.getMessage() for r in handler.records] == ["a0", "a1", "a2", "a3", "a4"]
+    assert tail_sampling._in_flight == 0
+
+    token = tail_sampling.begin_request("req-b")
+    buffer = tail_sampling.TailBuffer("req-b", size=2)
+    for i in range(4):
+        buffer.add(adapter.logger, logging.DEBUG, f"b{i}", (), {})
+    assert [entry[2] for entry in buffer.entries] == ["b2", "b3"]
+    buffer.release()
+    tail_sampling.end_request(token, failed=False)
+    assert tail_sampling._in_flight == 0
+
+
+
+def test_failed_request_replays_into_service_log(monkeypatch, tmp_path):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "LOGS_DIR", str(tmp_path))
+    monkeypatch.setattr(custom_logger, "_SERVICE_FILE_SINKS", True)
+    monkeypatch.setattr(HestiaLoggerAdapter, "caller_info", True)
+    logger = custom_logger.get_logger("tail_service", log_level=logging.INFO)
+    seen = ListHandler()
+    seen.setLevel(logging.INFO)  # Replays ignore handler levels
+    logger.logger.addHandler(seen)
+
+    token = tail_sampling.begin_request("req-svc")
+    line = sys._getframe().f_lineno + 1
+    logger.debug("replayed detail")
+    tail_sampling.end_request(token, failed=True)
+    logger.logger.removeHandler(seen)
+    for handler in logger.logger.handlers:
+        handler.flush()
+
+    assert "replayed detail" in (tmp_path / "tail_service.log").read_text()
+    (record,) = seen.records
+    assert (record.pathname, record.lineno) == (__file__, line)
+    assert record.funcName == "test_failed_request_replays_into_service_log"
+    assert record.module == "test_tail_sampling"
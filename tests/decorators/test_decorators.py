@@ -6,6 +6,9 @@ import logging.handlers
 import asyncio
 import pytest
 import importlib
+import pstats
+import cProfile
+import threading
 
 # 1) Monkey-patch file handlers to avoid permission issues
 @pytest.fixture(autouse=True)
@@ -64,6 +67,12 @@ def test_mask_sensitive_data_deep():
     assert out["normal"] == "yes"
 
 
+def test_mask_sensitive_data_keeps_plain_values_by_default():
+    data = {"email": "bob@example.com", "note": "reach bob@example.com"}
+    assert mask_sensitive_data(data) == data
+    assert {"password", "token", "api_key"} <= dec.SENSITIVE_KEYS
+
+
 def test_sanitize_module_name():
     assert sanitize_module_name("__mod__") == "mod"
     assert sanitize_module_name("regular") == "regular"
@@ -89,6 +98,11 @@ def test_log_execution_error(capture_app_logs):
     assert any("boom" in m for m in msgs)
     assert any("traceback" in m for m in msgs)
 
+    entry = next(r.msg for r in capture_app_logs.records if isinstance(r.msg, dict))
+    assert isinstance(entry["traceback"], str)
+    assert entry["traceback"].rstrip().endswith("ValueError: boom")
+    assert entry["exception"]["type"] == "ValueError"
+
 
 @pytest.mark.asyncio
 async def test_log_execution_async(capture_app_logs):
@@ -130,3 +144,167 @@ def test_log_execution_skips_serialization_when_info_disabled(monkeypatch):
     finally:
         service_logger.logger.setLevel(prev_service_level)
         app_logger.logger.setLevel(prev_app_level)
+
+
+def test_log_execution_profiles_sampled_calls(capture_app_logs, monkeypatch, tmp_path):
+    profiling = importlib.import_module("hestia_logger.core.profiling")
+    monkeypatch.setattr(profiling, "_AGGREGATES", {})
+    # Keep every profiled function so the checks below do not depend on ranking
+    monkeypatch.setattr(profiling, "LOG_PROFILE_TOP", 10000)
+
+    def build(n):
+        return [str(i) * 10 for i in range(n)]
+
+    @log_execution(
+        logger_name="unit", profile_sample_rate=1.0, trace_malloc_sample_rate=1.0
+    )
+    def work(n):
+        return len(build(n))
+
+    assert work(5000) == 5000
+
+    completed = [
+        r.msg
+        for r in capture_app_logs.records
+        if isinstance(r.msg, dict) and r.msg.get("status") == "completed"
+    ]
+    fields = completed[-1]
+    (row,) = [row for row in fields["profile"] if row["function"].endswith("(build)")]
+    assert row["calls"] == 1
+    assert all({"calls", "cumulative_ms", "own_ms"} <= set(row) for row in fields["profile"])
+    assert fields["allocations"] and fields["peak_allocated_kb"] > 0
+
+    (summary,) = profiling.dump_profiles(str(tmp_path))
+    assert summary["function"].endswith("work")
+    assert summary["sampled_calls"] == 1
+    dumped = pstats.Stats(str(tmp_path / (summary["file"].rsplit("/", 1)[-1])))
+    assert any(name == "build" for _, _, name in dumped.stats)
+
+
+def test_due_profile_dump_runs_off_the_calling_thread(monkeypatch):
+    profiling = importlib.import_module("hestia_logger.core.profiling")
+    monkeypatch.setattr(profiling, "_AGGREGATES", {})
+    monkeypatch.setattr(profiling, "_last_dump", 0.0)
+    monkeypatch.setattr(profiling, "LOG_PROFILE_DUMP_INTERVAL", 1)
+    dumped = threading.Event()
+    dump_threads = []
+
+    def dump_profiles(directory=None):
+        dump_threads.append(threading.current_thread())
+        dumped.set()
+
+    monkeypatch.setattr(profiling, "dump_profiles", dump_profiles)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    profiler.disable()
+    profiling._aggregate("unit.work", pstats.Stats(profiler))
+
+    assert dumped.wait(5)
+    (dump_thread,) = dump_threads
+    assert dump_thread is not threading.current_thread()
+
+
+def test_log_execution_unsampled_calls_are_not_profiled(capture_app_logs, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("unsampled calls must not be profiled")
+
+    monkeypatch.setattr(dec, "SampledCall", fail)
+    monkeypatch.setattr(dec.random, "random", lambda: 0.5)
+
+    @log_execution(logger_name="unit", profile_sample_rate=0.1)
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    completed = [r.msg for r in capture_app_logs.records if isinstance(r.msg, dict)]
+    assert "profile" not in completed[-1]
+
+
+def test_log_execution_error_records_profile_and_releases_profiler(capture_app_logs):
+    profiling = importlib.import_module("hestia_logger.core.profiling")
+
+    @log_execution(logger_name="unit", profile_sample_rate=1.0)
+    def bad():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        bad()
+
+    errors = [r.msg for r in capture_app_logs.records if r.levelno == logging.ERROR]
+    assert "profile" in errors[-1]
+    assert not profiling._PROFILER_LOCK.locked()
+
+
+def _app_entries(handler):
+    return [r.msg for r in handler.records if isinstance(r.msg, dict)]
+
+
+def test_log_execution_links_nested_calls(capture_app_logs):
+    @log_execution(logger_name="unit")
+    def inner():
+        return 1
+
+    @log_execution(logger_name="unit")
+    def outer():
+        return inner() + 1
+
+    assert outer() == 2
+
+    entries = _app_entries(capture_app_logs)
+    completed = {e["function"]: e for e in entries if e["status"] == "completed"}
+    assert completed["inner"]["parent_span_id"] == completed["outer"]["span_id"]
+    assert completed["inner"]["trace_id"] == completed["outer"]["trace_id"]
+    assert completed["outer"]["parent_span_id"] is None
+    assert "self_duration" in completed["outer"]
+
+
+def test_log_execution_span_tree_emits_one_record(capture_app_logs):
+    @log_execution(logger_name="unit")
+    def leaf(n):
+        if n == 2:
+            raise ValueError("bad leaf")
+        return n
+
+    @log_execution(logger_name="unit")
+    def branch():
+        total = leaf(1)
+        try:
+            leaf(2)
+        except ValueError:
+            pass
+        return total
+
+    @log_execution(logger_name="unit", span_tree=True)
+    def root():
+        return branch() + branch()
+
+    assert root() == 2
+
+    (entry,) = _app_entries(capture_app_logs)
+    assert entry["function"] == "root"
+    assert entry["status"] == "completed"
+    assert len(entry["spans"]) == 2
+    assert all(span["function"].endswith(".branch") for span in entry["spans"])
+    leaves = entry["spans"][0]["children"]
+    assert [leaf["status"] for leaf in leaves] == ["completed", "error"]
+    assert leaves[1]["error"] == "ValueError: bad leaf"
+    branch_node = entry["spans"][0]
+    assert branch_node["total_ms"] >= branch_node["self_ms"]
+
+
+@pytest.mark.asyncio
+async def test_log_execution_span_tree_follows_async_tasks(capture_app_logs):
+    @log_execution(logger_name="unit")
+    async def fetch(n):
+        await asyncio.sleep(0.001)
+        return n
+
+    @log_execution(logger_name="unit", span_tree=True)
+    async def handler():
+        return sum(await asyncio.gather(fetch(1), fetch(2)))
+
+    assert await handler() == 3
+
+    (entry,) = _app_entries(capture_app_logs)
+    assert len(entry["spans"]) == 2
+    assert all(span["function"].endswith("fetch") for span in entry["spans"])
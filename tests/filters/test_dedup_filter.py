@@ -0,0 +1,107 @@
+# test_dedup_filter.py
+
+import logging
+import pytest
+from hestia_logger.filters.dedup_filter import DeduplicationFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def dedup_logger():
+    clock = FakeClock()
+    dedup = DeduplicationFilter(window=5, max_keys=2, clock=clock)
+    handler = ListHandler()
+    logger = logging.getLogger("dedup_test")
+    logger.handlers.clear()
+    logger.filters.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addFilter(dedup)
+    logger.addHandler(handler)
+    yield logger, dedup, handler, clock
+    logger.removeFilter(dedup)
+    logger.removeHandler(handler)
+
+
+def _summaries(handler):
+    return [r.msg for r in handler.records if getattr(r, "hestia_dedup_summary", False)]
+
+
+def test_first_occurrence_passes_and_repeats_are_counted(dedup_logger):
+    logger, dedup, handler, clock = dedup_logger
+    for _ in range(100):
+        logger.error("Database connection lost")
+
+    assert len(handler.records) == 1
+
+    clock.now += 6
+    logger.error("Database connection lost")
+
+    summaries = _summaries(handler)
+    assert len(summaries) == 1
+    assert summaries[0]["repeat_count"] == 99
+    assert summaries[0]["event"] == "log_dedup_summary"
+    assert handler.records[-1].getMessage() == "Database connection lost"
+
+
+def test_key_includes_level_and_exception_type(dedup_logger):
+    logger, _, handler, _ = dedup_logger
+    logger.warning("boom")
+    logger.error("boom")
+    try:
+        raise ValueError("x")
+    except ValueError:
+        logger.exception("boom")
+    assert len(handler.records) == 3
+
+
+def test_exc_info_without_active_exception_does_not_raise(dedup_logger):
+    logger, _, handler, _ = dedup_logger
+    logger.error("no exception", exc_info=True)
+    logger.exception("no exception")
+    assert len(handler.records) == 1
+    assert handler.records[0].exc_info == (None, None, None)
+
+
+def test_lru_eviction_emits_pending_summary(dedup_logger):
+    logger, _, handler, _ = dedup_logger
+    logger.info("a")
+    logger.info("a")
+    logger.info("b")
+    logger.info("c")  # evicts "a" (max_keys=2)
+
+    summaries = _summaries(handler)
+    assert len(summaries) == 1
+    assert summaries[0]["repeat_count"] == 1
+    assert "a" in summaries[0]["message"]
+
+
+def test_flush_reports_open_windows(dedup_logger):
+    logger, dedup, handler, _ = dedup_logger
+    logger.info({"message": "retrying", "attempt": 1})
+    logger.info({"message": "retrying", "attempt": 2})
+    dedup.flush()
+    assert _summaries(handler)[0]["repeat_count"] == 1
+
+
+def test_dicts_without_message_are_not_deduplicated(dedup_logger):
+    logger, _, handler, _ = dedup_logger
+    logger.info({"status": "started"})
+    logger.info({"status": "started"})
+    assert len(handler.records) == 2
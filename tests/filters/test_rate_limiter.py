@@ -0,0 +1,55 @@
+# test_rate_limiter.py
+
+import logging
+import pytest
+from hestia_logger.filters.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_caps_rate_and_refills():
+    clock = FakeClock()
+    limiter = RateLimiter(5, clock=clock)
+    allowed = sum(limiter.allow(logging.INFO) for _ in range(20))
+    assert allowed == 5
+
+    clock.now += 1
+    allowed = sum(limiter.allow(logging.INFO) for _ in range(20))
+    assert allowed == 5
+
+
+def test_levels_have_separate_budgets_and_errors_always_pass():
+    clock = FakeClock()
+    limiter = RateLimiter({"DEBUG": 1, logging.INFO: 2}, clock=clock)
+    assert [limiter.allow(logging.DEBUG) for _ in range(2)] == [True, False]
+    assert [limiter.allow(logging.INFO) for _ in range(3)] == [True, True, False]
+    assert all(limiter.allow(logging.WARNING) for _ in range(10))
+    assert all(limiter.allow(logging.ERROR) for _ in range(100))
+    assert all(limiter.allow(logging.CRITICAL) for _ in range(100))
+
+
+def test_report_is_periodic_and_resets_counts():
+    clock = FakeClock()
+    limiter = RateLimiter(1, report_interval=10, clock=clock)
+    for _ in range(4):
+        limiter.allow(logging.INFO)
+    assert limiter.take_report() is None
+
+    clock.now += 10
+    assert limiter.take_report() == {"INFO": 3}
+    clock.now += 10
+    assert limiter.take_report() is None
+
+
+def test_unknown_level_names_are_rejected():
+    with pytest.raises(ValueError, match="'DEBGU'"):
+        RateLimiter({"info": 5, "DEBGU": 1})
+
+    limiter = RateLimiter({" warning ": 1}, clock=FakeClock())
+    assert [limiter.allow(logging.WARNING) for _ in range(2)] == [True, False]
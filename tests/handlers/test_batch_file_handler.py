@@ -0,0 +1,103 @@
+# test_batch_file_handler.py
+
+import logging
+import pytest
+from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+
+def _record(msg):
+    return logging.LogRecord(
+        name="batch_test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+
+
+@pytest.fixture
+def batch_handler(tmp_path):
+    handler = BatchRotatingFileHandler(
+        str(tmp_path / "batch.log"), maxBytes=64, backupCount=2, delay=True
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    yield handler
+    handler.close()
+
+
+def test_serialize_matches_emitted_line(batch_handler, tmp_path):
+    payload = batch_handler.serialize(_record("héllo"))
+    assert payload == "héllo\n".encode("utf-8")
+
+    batch_handler.handle(_record("first"))
+    batch_handler.write_batch(payload)
+    lines = (tmp_path / "batch.log").read_text(encoding="utf-8").splitlines()
+    assert lines == ["first", "héllo"]
+
+
+def test_write_batch_rotates_on_size(batch_handler, tmp_path):
+    chunk = b"x" * 39 + b"\n"
+    batch_handler.write_batch(chunk)
+    batch_handler.write_batch(chunk)
+
+    assert (tmp_path / "batch.log").read_bytes() == chunk
+    assert (tmp_path / "batch.log.1").read_bytes() == chunk
+
+
+def test_write_batch_ignores_empty_payload(batch_handler, tmp_path):
+    batch_handler.write_batch(b"")
+    assert not (tmp_path / "batch.log").exists()
+
+
+def _durable_handler(tmp_path, durability, fsync_interval=1.0):
+    handler = BatchRotatingFileHandler(
+        str(tmp_path / "durable.log"),
+        delay=True,
+        durability=durability,
+        fsync_interval=fsync_interval,
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def test_durability_none_never_fsyncs(tmp_path):
+    handler = _durable_handler(tmp_path, "none", fsync_interval=0)
+    handler.write_batch(b"a\n")
+    handler.flush()
+    handler.close()
+    assert handler.fsyncs == 0
+    assert handler.idle_flush_interval is None
+
+
+def test_durability_interval(tmp_path):
+    handler = _durable_handler(tmp_path, "interval", fsync_interval=60)
+    handler.write_batch(b"a\n")
+    handler.write_batch(b"b\n")
+    handler.flush()
+    assert handler.fsyncs == 0  # Not due yet
+    handler.close()
+    assert handler.fsyncs == 1  # Tail synced on close
+
+    eager = _durable_handler(tmp_path, "interval", fsync_interval=0)
+    eager.write_batch(b"c\n")
+    eager.write_batch(b"d\n")
+    assert eager.fsyncs == 2
+    eager.close()
+
+
+def test_durability_group_commit_syncs_on_flush(tmp_path):
+    handler = _durable_handler(tmp_path, "group_commit", fsync_interval=60)
+    handler.write_batch(b"a\n")
+    handler.write_batch(b"b\n")
+    handler.flush()
+    handler.flush()  # Nothing new to sync
+    assert handler.fsyncs == 1
+    handler.close()
+    assert (tmp_path / "durable.log").read_bytes() == b"a\nb\n"
+
+
+def test_durability_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        _durable_handler(tmp_path, "always")
@@ -0,0 +1,133 @@
+# test_binary_handler.py
+
+import json
+import logging
+import pytest
+
+pytest.importorskip("msgpack")
+
+from hestia_logger.core.formatters import JSONFormatter
+from hestia_logger.handlers.binary_handler import BinaryLogHandler, iter_binary_records
+
+
+def _record(i, name="binary_service"):
+    return logging.LogRecord(
+        name=name,
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10 + i,
+        msg={"message": f"event {i}", "request_id": f"req-{i}"},
+        args=(),
+        exc_info=None,
+    )
+
+
+def _read(path):
+    with open(path, "rb") as stream:
+        return list(iter_binary_records(stream))
+
+
+def test_round_trip_matches_json_formatter(tmp_path):
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path))
+    records = [_record(i) for i in range(5)]
+    handler.write_batch(b"".join(handler.serialize(r) for r in records))
+    handler.close()
+
+    formatter = JSONFormatter()
+    expected = [json.loads(formatter.format(r)) for r in records]
+    assert _read(path) == expected
+
+
+def test_binary_file_is_smaller_than_json_lines(tmp_path):
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path))
+    records = [_record(i) for i in range(200)]
+    handler.write_batch(b"".join(handler.serialize(r) for r in records))
+    handler.close()
+
+    formatter = JSONFormatter()
+    json_size = sum(len(formatter.format(r)) + 1 for r in records)
+    assert path.stat().st_size < json_size * 0.6
+
+
+def test_rotated_and_reopened_files_are_self_describing(tmp_path):
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path), maxBytes=2048, backupCount=5)
+    for i in range(40):
+        handler.emit(_record(i))
+    handler.close()
+
+    # A new process appends with a fresh dictionary
+    handler = BinaryLogHandler(str(path))
+    handler.emit(_record(99, name="restarted"))
+    handler.close()
+
+    files = sorted(tmp_path.glob("app.hlog.*"), reverse=True) + [path]
+    assert len(files) > 1
+    records = [r for f in files for r in _read(f)]
+    assert [r["message"] for r in records] == [f"event {i}" for i in range(40)] + [
+        "event 99"
+    ]
+    assert records[-1]["service"] == "restarted"
+
+
+def test_truncated_tail_frame_is_ignored(tmp_path):
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path))
+    handler.emit(_record(1))
+    handler.emit(_record(2))
+    handler.close()
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert [r["message"] for r in _read(path)] == ["event 1"]
+
+
+def test_serialization_stays_on_writer_thread(tmp_path, monkeypatch):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "LOG_SERIALIZATION_MODE", "producer")
+    handler = BinaryLogHandler(str(tmp_path / "app.hlog"))
+    queue_handler = custom_logger._wrap_with_async_queue(handler, "binary_unit")
+    assert queue_handler.mode == "worker"
+
+
+def test_failed_write_does_not_orphan_dictionary_ids(tmp_path, monkeypatch):
+    from hestia_logger.handlers.batch_file_handler import BatchRotatingFileHandler
+
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path))
+    handler.emit(_record(0))
+
+    original = BatchRotatingFileHandler.write_batch
+
+    def disk_full(self, payload):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(BatchRotatingFileHandler, "write_batch", disk_full)
+    with pytest.raises(OSError):
+        handler.write_batch(handler.serialize(_record(1, name="new_service")))
+    monkeypatch.setattr(BatchRotatingFileHandler, "write_batch", original)
+
+    handler.emit(_record(2, name="new_service"))
+    handler.close()
+
+    records = _read(path)
+    assert [r["message"] for r in records] == ["event 0", "event 2"]
+    assert records[1]["service"] == "new_service"
+
+
+def test_unknown_dictionary_ids_decode_as_placeholders(tmp_path):
+    import msgpack
+    from hestia_logger.handlers import binary_handler
+
+    path = tmp_path / "app.hlog"
+    path.write_bytes(
+        binary_handler._frame([0, "HSTB", 1])
+        + binary_handler._frame(
+            [2, {7: "value", "level": msgpack.ExtType(1, b"\x00\x00\x00\x12")}]
+        )
+    )
+
+    assert _read(path) == [{"<unknown ref 7>": "value", "level": "<unknown ref 18>"}]
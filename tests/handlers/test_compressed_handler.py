@@ -0,0 +1,107 @@
+# test_compressed_handler.py
+
+import gzip
+import logging
+import time
+import pytest
+from hestia_logger.handlers.compressed_handler import CompressedRotatingFileHandler
+
+
+def _record(i):
+    return logging.LogRecord(
+        name="compressed_test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10,
+        msg=f"compressed record {i:05d} " + "payload " * 8,
+        args=(),
+        exc_info=None,
+    )
+
+
+def _handler(path, **kwargs):
+    handler = CompressedRotatingFileHandler(str(path), **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def test_frames_are_written_once_frame_size_is_reached(tmp_path):
+    path = tmp_path / "app.log.gz"
+    handler = _handler(path, frame_size=4096, frame_interval=60)
+    handler.write_batch(b"".join(handler.serialize(_record(i)) for i in range(5)))
+    assert not path.exists()
+
+    handler.write_batch(b"".join(handler.serialize(_record(i)) for i in range(5, 80)))
+    assert path.exists()
+    handler.close()
+
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    assert len(lines) == 80
+    assert lines[0].startswith("compressed record 00000")
+
+
+def test_completed_frames_survive_a_truncated_tail(tmp_path):
+    path = tmp_path / "app.log.gz"
+    handler = _handler(path, frame_size=1, frame_interval=60)
+    handler.write_batch(handler.serialize(_record(1)))
+    first_frame_end = path.stat().st_size
+    handler.write_batch(handler.serialize(_record(2)))
+    handler.close()
+
+    # Simulate a crash in the middle of writing the second frame
+    truncated = path.read_bytes()[: first_frame_end + 10]
+    with pytest.raises(EOFError):
+        gzip.decompress(truncated)
+    recovered = gzip.decompress(truncated[:first_frame_end]).decode()
+    assert recovered.startswith("compressed record 00001")
+
+
+def test_rotation_uses_compressed_size(tmp_path):
+    path = tmp_path / "app.log.gz"
+    handler = _handler(
+        path, frame_size=1, frame_interval=60, maxBytes=400, backupCount=3
+    )
+    for i in range(30):
+        handler.write_batch(handler.serialize(_record(i)))
+    handler.close()
+
+    backups = sorted(tmp_path.glob("app.log.*.gz"))
+    assert backups, "expected rotated backups"
+    assert all(b.stat().st_size < 400 for b in backups)
+    # Uncompressed the rotated files are well above the compressed limit
+    assert len(gzip.decompress(backups[0].read_bytes())) > 0
+
+
+def test_idle_worker_flushes_partial_frames(tmp_path):
+    from hestia_logger.core import custom_logger
+
+    path = tmp_path / "idle.log.gz"
+    handler = _handler(path, frame_size=1 << 20, frame_interval=0.05)
+    queue_handler = custom_logger._wrap_with_async_queue(handler, "compressed_idle")
+    logger = logging.getLogger("compressed_idle")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        logger.warning("flushed while idle")
+        deadline = time.time() + 2
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        logger.removeHandler(queue_handler)
+        handler.close()
+
+    assert gzip.decompress(path.read_bytes()) == b"flushed while idle\n"
+
+
+def test_zstd_frames_round_trip(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "app.log.zst"
+    handler = _handler(path, compression="zstd", frame_size=1)
+    for i in range(3):
+        handler.write_batch(handler.serialize(_record(i)))
+    handler.close()
+
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        path.read_bytes(), read_across_frames=True
+    )
+    assert reader.read().decode().count("\n") == 3
@@ -0,0 +1,96 @@
+# test_console_handler.py
+
+import importlib
+import io
+import logging
+import sys
+from hestia_logger.handlers.console_handler import (
+    ConsoleFormatter,
+    ConsoleStreamHandler,
+    _supports_color,
+)
+
+# `hestia_logger.handlers.console_handler` is shadowed by the handler instance
+console_module = importlib.import_module("hestia_logger.handlers.console_handler")
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), created=None):
+    record = logging.LogRecord("console_test", level, __file__, 1, msg, args, None)
+    if created is not None:
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+    return record
+
+
+def test_output_matches_the_stdlib_format():
+    record = _record(created=1_700_000_000.25)
+    expected = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    ).format(record)
+    assert ConsoleFormatter().format(record) == expected
+
+
+def test_timestamp_is_formatted_once_per_second(monkeypatch):
+    calls = []
+    original = console_module.time.strftime
+    monkeypatch.setattr(
+        console_module.time, "strftime", lambda *a: calls.append(a) or original(*a)
+    )
+    formatter = ConsoleFormatter()
+    for offset in (0.1, 0.2, 0.9, 1.1):
+        formatter.format(_record(created=1_700_000_000 + offset))
+    assert len(calls) == 2
+
+
+def test_color_prefixes_are_precomputed():
+    formatter = ConsoleFormatter(color=True)
+    line = formatter.format(_record(level=logging.ERROR))
+    assert line.startswith("\x1b[31m") and line.endswith("\x1b[0m")
+    assert "\x1b" not in ConsoleFormatter(color=False).format(_record())
+
+
+def test_exceptions_are_appended():
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = logging.LogRecord(
+            "console_test", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+        )
+    assert "ValueError: bad" in ConsoleFormatter().format(record)
+
+
+def test_color_is_disabled_off_a_tty(monkeypatch):
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    assert not _supports_color(io.StringIO())
+
+    class Tty(io.StringIO):
+        def isatty(self):
+            return True
+
+    if sys.platform != "win32":
+        assert _supports_color(Tty())
+    monkeypatch.setenv("NO_COLOR", "1")
+    assert not _supports_color(Tty())
+
+
+def test_write_batch_handles_text_and_binary_streams():
+    text_stream = io.StringIO()
+    handler = ConsoleStreamHandler(text_stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.write_batch(handler.serialize(_record()) + handler.serialize(_record()))
+    assert text_stream.getvalue() == "hello world\nhello world\n"
+
+    raw = io.BytesIO()
+    wrapped = io.TextIOWrapper(raw, encoding="utf-8")
+    handler = ConsoleStreamHandler(wrapped)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    wrapped.write("first\n")
+    handler.write_batch(handler.serialize(_record(msg="ünïcode", args=())))
+    assert raw.getvalue().decode() == "first\nünïcode\n"
+
+
+def test_root_console_output_goes_through_the_async_queue():
+    from hestia_logger.core import custom_logger
+
+    assert custom_logger.async_console_handler in logging.root.handlers
+    assert custom_logger.console_handler not in logging.root.handlers
@@ -0,0 +1,161 @@
+# test_fluent_handler.py
+
+import gzip
+import io
+import json
+import logging
+import socket
+import threading
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+from hestia_logger.handlers.fluent_handler import FluentForwardHandler
+
+
+class StubForwardServer:
+    """Minimal Fluent Forward server that records decoded messages."""
+
+    def __init__(self, ack=False):
+        self.ack = ack
+        self.messages = []
+        self.connections = 0
+        self._received = threading.Condition()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        unpacker = msgpack.Unpacker(raw=False)
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                unpacker.feed(data)
+                for message in unpacker:
+                    if self.ack and "chunk" in message[2]:
+                        conn.sendall(msgpack.packb({"ack": message[2]["chunk"]}))
+                    with self._received:
+                        self.messages.append(message)
+                        self._received.notify_all()
+
+    def wait_for(self, count, timeout=2.0, entries=False):
+        def received():
+            if entries:
+                return sum(len(_entries(m[1])) for m in self.messages)
+            return len(self.messages)
+
+        with self._received:
+            self._received.wait_for(lambda: received() >= count, timeout)
+        return self.messages
+
+    def close(self):
+        self._sock.close()
+
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord(
+        name="fluent_test",
+        level=level,
+        pathname=__file__,
+        lineno=10,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+
+
+def _entries(blob):
+    return list(msgpack.Unpacker(io.BytesIO(blob), raw=False))
+
+
+@pytest.fixture
+def server():
+    server = StubForwardServer()
+    yield server
+    server.close()
+
+
+def test_batch_is_sent_as_packed_forward(server):
+    handler = FluentForwardHandler(tag="hestia.test", port=server.port)
+    payload = b"".join(
+        handler.serialize(_record({"message": f"m{i}", "event": "e"})) for i in range(3)
+    )
+    handler.write_batch(payload)
+    handler.write_batch(handler.serialize(_record("second batch")))
+    messages = server.wait_for(2)
+    handler.close()
+
+    tag, entries, option = messages[0]
+    assert tag == "hestia.test"
+    assert option == {}
+    decoded = _entries(entries)
+    assert [entry["message"] for _time, entry in decoded] == ["m0", "m1", "m2"]
+    assert decoded[0][0].code == 0  # EventTime extension
+    assert decoded[0][1]["service"] == "fluent_test"
+    assert server.connections == 1  # persistent connection
+
+
+def test_gzip_compression_and_ack():
+    server = StubForwardServer(ack=True)
+    handler = FluentForwardHandler(port=server.port, compress=True, require_ack=True)
+    handler.write_batch(handler.serialize(_record("compressed")))
+    ((tag, entries, option),) = server.wait_for(1)
+    handler.close()
+    server.close()
+
+    assert option["compressed"] == "gzip"
+    assert "chunk" in option
+    ((_time, entry),) = _entries(gzip.decompress(entries))
+    assert entry["message"] == "compressed"
+
+
+def test_falls_back_to_file_when_unreachable(tmp_path):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    fallback = tmp_path / "app.log"
+    handler = FluentForwardHandler(port=port, timeout=0.2, fallback_path=str(fallback))
+    handler.write_batch(
+        handler.serialize(_record("lost?")) + handler.serialize(_record("no"))
+    )
+    handler.close()
+
+    lines = [json.loads(line) for line in fallback.read_text().splitlines()]
+    assert [line["message"] for line in lines] == ["lost?", "no"]
+
+
+def test_works_behind_async_queue(server):
+    from hestia_logger.core import custom_logger
+
+    handler = FluentForwardHandler(port=server.port)
+    queue_handler = custom_logger._wrap_with_async_queue(handler, "fluent_unit")
+    logger = logging.getLogger("fluent_pipeline")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    try:
+        for i in range(20):
+            logger.info({"message": f"queued {i}"})
+        queue_handler.flush()
+    finally:
+        logger.removeHandler(queue_handler)
+
+    messages = server.wait_for(20, entries=True)
+    received = [entry for m in messages for _t, entry in _entries(m[1])]
+    handler.close()
+    assert [entry["message"] for entry in received] == [
+        f"queued {i}" for i in range(20)
+    ]
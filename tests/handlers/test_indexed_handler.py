@@ -0,0 +1,61 @@
+# test_indexed_handler.py
+
+import json
+import logging
+from hestia_logger.core.formatters import JSONFormatter
+from hestia_logger.handlers.indexed_handler import IndexedRotatingFileHandler
+
+
+def _record(i, request_id):
+    return logging.LogRecord(
+        name="indexed_test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10,
+        msg={"message": f"indexed record {i}", "request_id": request_id},
+        args=(),
+        exc_info=None,
+    )
+
+
+def _handler(path, **kwargs):
+    handler = IndexedRotatingFileHandler(str(path), **kwargs)
+    handler.setFormatter(JSONFormatter())
+    return handler
+
+
+def _index(path):
+    return [json.loads(line) for line in open(f"{path}.idx", encoding="utf-8")]
+
+
+def test_index_blocks_cover_the_written_bytes(tmp_path):
+    path = tmp_path / "app.log"
+    handler = _handler(path, interval=4)
+    handler.write_batch(
+        b"".join(handler.serialize(_record(i, f"req-{i}")) for i in range(10))
+    )
+    handler.close()
+
+    blocks = _index(path)
+    assert [block["count"] for block in blocks] == [4, 4, 2]
+    assert blocks[0]["offset"] == 0
+    assert blocks[-1]["end"] == path.stat().st_size
+    assert all(a["end"] == b["offset"] for a, b in zip(blocks, blocks[1:]))
+    assert all(block["first"] <= block["last"] for block in blocks)
+
+    data = path.read_bytes()
+    block = data[blocks[1]["offset"] : blocks[1]["end"]].decode().splitlines()
+    assert json.loads(block[0])["request_id"] == "req-4"
+
+
+def test_rotation_moves_the_index_with_its_log(tmp_path):
+    path = tmp_path / "app.log"
+    handler = _handler(path, interval=2, maxBytes=2000, backupCount=2)
+    for i in range(20):
+        handler.emit(_record(i, f"req-{i}"))
+    handler.close()
+
+    assert (tmp_path / "app.log.1").exists()
+    for log_file in (path, tmp_path / "app.log.1"):
+        blocks = _index(log_file)
+        assert blocks[-1]["end"] == log_file.stat().st_size
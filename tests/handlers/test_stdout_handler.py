@@ -0,0 +1,83 @@
+# test_stdout_handler.py
+
+import json
+import logging
+import os
+import threading
+import pytest
+from hestia_logger.handlers.stdout_handler import StdoutJSONHandler
+
+
+fcntl = pytest.importorskip("fcntl")
+
+
+def _record(msg):
+    return logging.LogRecord("stdout_test", logging.INFO, __file__, 1, msg, (), None)
+
+
+def _read_all(fd):
+    chunks = []
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def test_batches_are_written_as_json_lines():
+    read_fd, write_fd = os.pipe()
+    handler = StdoutJSONHandler(fd=write_fd)
+    handler.write_batch(b"".join(handler.serialize(_record(f"m{i}")) for i in range(3)))
+    handler.emit(_record("single"))
+    os.close(write_fd)
+
+    lines = [json.loads(line) for line in _read_all(read_fd).splitlines()]
+    os.close(read_fd)
+    assert [line["message"] for line in lines] == ["m0", "m1", "m2", "single"]
+    assert lines[0]["service"] == "stdout_test"
+
+
+def test_non_blocking_descriptor_waits_instead_of_failing():
+    read_fd, write_fd = os.pipe()
+    flags = fcntl.fcntl(write_fd, fcntl.F_GETFL)
+    fcntl.fcntl(write_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+    payload = b"x" * 1_000_000 + b"\n"  # Far larger than the pipe buffer
+
+    received = []
+    reader = threading.Thread(target=lambda: received.append(_read_all(read_fd)))
+    reader.start()
+    StdoutJSONHandler(fd=write_fd).write_batch(payload)
+    os.close(write_fd)
+    reader.join(timeout=5)
+    os.close(read_fd)
+
+    assert received == [payload]
+
+
+def test_broken_pipe_disables_the_sink():
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    handler = StdoutJSONHandler(fd=write_fd)
+
+    handler.write_batch(b'{"message": "lost"}\n')
+    handler.write_batch(b'{"message": "also lost"}\n')
+    os.close(write_fd)
+
+    assert handler.broken
+    assert handler.bytes_dropped == len(b'{"message": "lost"}\n') + len(
+        b'{"message": "also lost"}\n'
+    )
+
+
+def test_stdout_mode_turns_off_file_sinks(monkeypatch, tmp_path):
+    from hestia_logger.core import custom_logger
+
+    monkeypatch.setattr(custom_logger, "LOG_OUTPUT", "stdout")
+    monkeypatch.setattr(custom_logger, "_SERVICE_FILE_SINKS", False)
+    monkeypatch.setattr(custom_logger, "LOGS_DIR", str(tmp_path))
+
+    assert isinstance(custom_logger._create_app_sink(), StdoutJSONHandler)
+    logger = custom_logger.get_logger("stdout_mode_service")
+    assert "stdout_mode_service" not in custom_logger._SERVICE_HANDLERS
+    assert logger.logger.handlers == [custom_logger._APP_LOG_HANDLER]
+    assert not (tmp_path / "stdout_mode_service.log").exists()
@@ -125,3 +125,68 @@ def test_middleware_log_file_created_on_first_log(capture_middleware_logs):
             handler.flush()
 
     assert log_path.exists()
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from hestia_logger.middlewares.middleware import setup_metrics_endpoint
+
+    app = FastAPI()
+    setup_metrics_endpoint(app)
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "hestia_records_written_total" in response.text
+
+
+def test_tail_sampling_flushes_debug_only_for_failed_requests(monkeypatch, tmp_path):
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from hestia_logger.core.custom_logger import HestiaLoggerAdapter
+    from hestia_logger.middlewares.middleware import setup_logging_middleware
+
+    monkeypatch.setattr("hestia_logger.middlewares.middleware.LOGS_DIR", str(tmp_path))
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    base = logging.getLogger("tail_sampled_service")
+    base.setLevel(logging.INFO)
+    base.propagate = False
+    base.addHandler(handler)
+    service_logger = HestiaLoggerAdapter(base, {"metadata": {}})
+
+    app = FastAPI()
+    setup_logging_middleware(
+        app, logger_name="tail_middleware", tail_sampling_enabled=True
+    )
+
+    @app.get("/ok")
+    async def ok():
+        service_logger.debug("ok-detail")
+        return {"ok": True}
+
+    @app.get("/fail")
+    async def fail():
+        service_logger.debug("fail-detail")
+        return JSONResponse({"ok": False}, status_code=503)
+
+    @app.get("/boom")
+    def boom():
+        service_logger.debug("boom-detail")
+        raise RuntimeError("boom")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    try:
+        assert client.get("/ok").status_code == 200
+        assert client.get("/fail").status_code == 503
+        assert client.get("/boom").status_code == 500
+    finally:
+        base.removeHandler(handler)
+
+    output = stream.getvalue()
+    assert "ok-detail" not in output
+    assert "DEBUG fail-detail" in output
+    assert "DEBUG boom-detail" in output
@@ -0,0 +1,79 @@
+# test_cli.py
+
+import json
+import logging
+import pytest
+
+pytest.importorskip("msgpack")
+
+from hestia_logger.cli import main
+from hestia_logger.handlers.binary_handler import BinaryLogHandler
+
+
+def test_cat_streams_binary_logs_as_json_lines(tmp_path, capsys):
+    path = tmp_path / "app.hlog"
+    handler = BinaryLogHandler(str(path))
+    for i in range(3):
+        handler.emit(
+            logging.LogRecord(
+                "cli_service", logging.WARNING, __file__, i, f"line {i}", (), None
+            )
+        )
+    handler.close()
+
+    assert main(["cat", str(path)]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == ["line 0", "line 1", "line 2"]
+    assert all(line["level"] == "WARNING" for line in lines)
+
+
+def test_query_filters_json_logs(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    path.write_text(
+        "".join(
+            json.dumps({"timestamp": f"2025-01-0{i}T00:00:00Z", "message": f"m{i}"})
+            + "\n"
+            for i in range(1, 6)
+        )
+    )
+
+    assert (
+        main(["query", str(path), "--since", "2025-01-02", "--until", "2025-01-03"])
+        == 0
+    )
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == ["m2", "m3"]
+
+    assert main(["query", str(path), "--where", "message=m5"]) == 0
+    assert json.loads(capsys.readouterr().out)["message"] == "m5"
+
+
+def test_flight_recovers_records(tmp_path, capsys):
+    from hestia_logger.core.flight_recorder import FlightRecorder
+
+    path = tmp_path / "flight.rec"
+    recorder = FlightRecorder(str(path))
+    for i in range(5):
+        recorder.record("cli_service", logging.DEBUG, f"debug {i}")
+    recorder.close()
+
+    assert main(["flight", str(path), "-n", "2"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == ["debug 3", "debug 4"]
+
+
+def test_flight_reads_every_ring_in_a_directory(tmp_path, capsys):
+    from hestia_logger.core.flight_recorder import FlightRecorder
+
+    for pid in (101, 102):
+        recorder = FlightRecorder(str(tmp_path / f"flight.{pid}.rec"))
+        recorder.record("cli_service", logging.DEBUG, f"from {pid}")
+        recorder.close()
+    (tmp_path / "app.log").write_text("not a ring\n")
+
+    assert main(["flight", str(tmp_path)]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted((line["file"], line["message"]) for line in lines) == [
+        ("flight.101.rec", "from 101"),
+        ("flight.102.rec", "from 102"),
+    ]
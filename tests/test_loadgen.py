@@ -0,0 +1,36 @@
+# test_loadgen.py
+
+import argparse
+
+import pytest
+
+from hestia_logger import loadgen
+
+
+def _options(tmp_path, **overrides):
+    options = vars(loadgen.add_arguments(argparse.ArgumentParser()).parse_args([]))
+    options.update(logs_dir=str(tmp_path), duration=5)
+    options.update(overrides)
+    return options
+
+
+def test_run_reports_every_record_written(tmp_path):
+    report = loadgen.run(
+        _options(tmp_path, records=400, threads=2, async_tasks=2, payload="mixed")
+    )
+
+    assert report["failed_processes"] == 0
+    assert report["produced"] == 400
+    assert report["written"] == 400
+    assert report["lost"] == 0
+    assert report["latency_us"]["p50"] <= report["latency_us"]["p99"]
+    assert report["peak_rss_mb"] > 0
+    assert (tmp_path / "app.log").read_text().count("\n") == 400
+
+
+def test_rate_limits_producers(tmp_path):
+    report = loadgen.run(_options(tmp_path, rate=200, duration=1, payload="string"))
+
+    assert report["lost"] == 0
+    assert report["produced"] == pytest.approx(200, abs=20)
+    assert report["queue_depth"]["timeline"]
@@ -0,0 +1,101 @@
+# test_reader.py
+
+import json
+import logging
+from hestia_logger.core.formatters import JSONFormatter
+from hestia_logger.handlers.indexed_handler import IndexedRotatingFileHandler
+from hestia_logger.reader import BloomFilter, LogReader, log_files, query_logs
+
+
+def _write_log(path, count, interval=10, **kwargs):
+    handler = IndexedRotatingFileHandler(str(path), interval=interval, **kwargs)
+    handler.setFormatter(JSONFormatter())
+    for i in range(count):
+        record = logging.LogRecord(
+            "reader_test", logging.INFO, __file__, i, {"message": f"m{i}"}, (), None
+        )
+        record.msg["request_id"] = f"req-{i}"
+        record.msg["attempt"] = i % 3
+        # Deterministic, strictly increasing timestamps
+        record.created = 1_700_000_000 + i
+        record.msecs = 0
+        handler.emit(record)
+    handler.close()
+
+
+def test_bloom_filter_round_trips():
+    bloom = BloomFilter(1024)
+    bloom.add(b'"req-1"')
+    decoded = BloomFilter.decode(bloom.encode())
+    assert b'"req-1"' in decoded
+    assert b'"req-2"' not in decoded
+
+
+def test_query_by_key_skips_blocks_with_the_bloom(tmp_path):
+    path = tmp_path / "app.log"
+    _write_log(path, 50)
+    reader = LogReader(str(path))
+    size = path.stat().st_size
+    regions = list(reader._regions(size, None, None, {"request_id": "req-42"}))
+    assert len(regions) == 1
+
+    entries = list(reader.query(where={"request_id": "req-42"}))
+    assert [entry["message"] for entry in entries] == ["m42"]
+    assert len(list(reader.query(where={"attempt": "1"}))) == 17
+
+
+def test_query_by_time_range(tmp_path):
+    path = tmp_path / "app.log"
+    _write_log(path, 50)
+    timestamps = [json.loads(line)["timestamp"] for line in open(path)]
+
+    entries = list(query_logs(str(path), since=timestamps[20], until=timestamps[24]))
+    assert [entry["message"] for entry in entries] == [f"m{i}" for i in range(20, 25)]
+
+
+def test_unindexed_tail_is_scanned(tmp_path):
+    path = tmp_path / "app.log"
+    _write_log(path, 10)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"message": "tail", "request_id": "late"}) + "\n")
+
+    entries = list(query_logs(str(path), where={"request_id": "late"}))
+    assert [entry["message"] for entry in entries] == ["tail"]
+
+
+def test_records_between_indexed_blocks_are_scanned(tmp_path):
+    path = tmp_path / "app.log"
+
+    def writer(prefix, count):
+        handler = IndexedRotatingFileHandler(str(path), interval=2)
+        handler.setFormatter(JSONFormatter())
+        for i in range(count):
+            handler.emit(
+                logging.LogRecord(
+                    "reader_test", logging.INFO, __file__, i, f"{prefix}{i}", (), None
+                )
+            )
+        return handler
+
+    # Writer A dies with a4 written but its block never finished
+    crashed = writer("a", 5)
+    crashed.stream.flush()
+    # Writer B appends and indexes its own blocks after the gap
+    writer("b", 3).close()
+
+    messages = [entry["message"] for entry in LogReader(str(path)).query()]
+    assert messages == ["a0", "a1", "a2", "a3", "a4", "b0", "b1", "b2"]
+    assert [entry["message"] for entry in query_logs(str(path), where={})] == messages
+
+
+def test_backups_are_read_oldest_first(tmp_path):
+    path = tmp_path / "app.log"
+    _write_log(path, 60, interval=5, maxBytes=3000, backupCount=5)
+    files = log_files(str(path))
+    assert files[-1] == str(path) and len(files) > 2
+
+    messages = [entry["message"] for entry in query_logs(str(path))]
+    assert messages == [f"m{i}" for i in range(60)]
+    assert [e["message"] for e in query_logs(str(path), include_backups=False)] == [
+        entry["message"] for entry in LogReader(str(path)).query()
+    ]
@@ -0,0 +1,120 @@
+# test_http_client.py
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from hestia_logger.core import metrics
+from hestia_logger.utils import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status = 500 if self.path.startswith("/fail") else 200
+        body = b"x" * 100
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def entries(monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        http_client.requests_logger,
+        "log",
+        lambda level, entry: logged.append((level, entry)),
+    )
+    return logged
+
+
+def test_route_template_collapses_ids():
+    assert (
+        http_client.route_template(
+            "/users/42/orders/3f2b8c1e-9a4d-4f7e-8b2a-1c3d5e7f9a0b"
+        )
+        == "/users/{id}/orders/{id}"
+    )
+    assert http_client.route_template("/health") == "/health"
+
+
+def test_requests_adapter_records_timings_and_reuse(server, entries):
+    session = http_client.instrument_session()
+    for _ in range(2):
+        assert session.get(f"http://{server}/users/7").status_code == 200
+
+    first, second = (entry for _, entry in entries)
+    assert first["route"] == "/users/{id}"
+    assert first["host"] == server
+    assert first["status_code"] == 200
+    assert first["bytes_received"] == 100
+    assert first["connection_reused"] is False
+    assert first["connect_ms"] is not None
+    assert second["connection_reused"] is True
+    assert first["ttfb_ms"] <= first["duration_ms"]
+    assert metrics.http_stats()[server]["requests"] >= 2
+
+
+def test_httpx_transport_logs_errors_and_samples_successes(
+    server, entries, monkeypatch
+):
+    monkeypatch.setattr(http_client, "LOG_HTTP_SUCCESS_SAMPLE_RATE", 0.0)
+    with httpx.Client(transport=http_client.InstrumentedTransport()) as client:
+        client.get(f"http://{server}/ok")
+        client.get(f"http://{server}/fail/9")
+
+    assert len(entries) == 1
+    level, entry = entries[0]
+    assert entry["route"] == "/fail/{id}"
+    assert entry["status_code"] == 500
+    assert level == http_client.logging.ERROR
+    assert metrics.http_stats()[server]["errors"] >= 1
+
+
+def test_async_httpx_transport_records_calls(server, entries):
+    async def fetch():
+        transport = http_client.AsyncInstrumentedTransport()
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(f"http://{server}/a")
+            await client.get(f"http://{server}/b")
+
+    asyncio.run(fetch())
+
+    first, second = (entry for _, entry in entries)
+    assert first["bytes_received"] == 100
+    assert first["connection_reused"] is False
+    assert second["connection_reused"] is True
+
+
+def test_transport_errors_are_recorded(entries):
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    transport = http_client.InstrumentedTransport(httpx.MockTransport(refuse))
+    with httpx.Client(transport=transport) as client:
+        with pytest.raises(httpx.ConnectError):
+            client.get("http://unreachable.invalid/x")
+
+    level, entry = entries[0]
+    assert level == http_client.logging.ERROR
+    assert entry["error"] == "ConnectError: refused"
+    assert metrics.http_stats()["unreachable.invalid"]["errors"] == 1
@@ -0,0 +1,111 @@
+# test_sqlalchemy_logger.py
+
+import logging
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from hestia_logger.utils.sqlalchemy_logger import (
+    fingerprint_statement,
+    instrument_engine,
+)
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+
+    def emit(self, record):
+        self.entries.append((record.levelno, record.msg))
+
+
+@pytest.fixture
+def capture():
+    logger = logging.getLogger("test_sqlalchemy_logger")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = _Capture()
+    logger.addHandler(handler)
+    yield logger, handler.entries
+    logger.removeHandler(handler)
+
+
+@pytest.fixture
+def engine():
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE users (id INTEGER, password TEXT)")
+    yield engine
+    engine.dispose()
+
+
+def test_fingerprint_normalizes_literals_and_placeholders():
+    first = fingerprint_statement("SELECT * FROM t WHERE id = 42 AND name = 'bob'")
+    second = fingerprint_statement("select  * FROM t\nWHERE id = :id AND name = ?")
+    assert first[1] == "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert first[0] != second[0]  # Keyword case is kept
+    assert (
+        fingerprint_statement("SELECT * FROM t WHERE id IN (1, 2, 3)")[1]
+        == fingerprint_statement("SELECT * FROM t WHERE id IN (%s, %s)")[1]
+        == "SELECT * FROM t WHERE id IN (?+)"
+    )
+    assert (
+        fingerprint_statement("INSERT INTO t VALUES (1, 'a'), (2, 'b')")[1]
+        == "INSERT INTO t VALUES (?, ?)"
+    )
+
+
+def test_only_slow_queries_are_logged_with_redacted_parameters(engine, capture):
+    logger, entries = capture
+    instrumentation = instrument_engine(
+        engine, logger=logger, slow_ms=0, report_interval=0
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text("INSERT INTO users VALUES (:id, :password)"),
+            {"id": 1, "password": "hunter2"},
+        )
+    instrumentation.remove()
+
+    level, entry = entries[-1]
+    assert level == logging.WARNING
+    assert entry["event"] == "slow_query"
+    assert entry["statement"] == "INSERT INTO users VALUES (?, ?)"
+    assert entry["parameters"]["password"] == "***"
+
+
+def test_aggregates_expose_repeated_queries(engine, capture):
+    logger, entries = capture
+    instrumentation = instrument_engine(
+        engine, logger=logger, slow_ms=10_000, report_interval=0
+    )
+    with engine.connect() as conn:
+        for user_id in range(25):
+            conn.execute(sqlalchemy.text(f"SELECT * FROM users WHERE id = {user_id}"))
+    instrumentation.remove()
+
+    assert entries == []  # Nothing slow, nothing sampled
+    aggregates = instrumentation.report()
+    top = aggregates[0]
+    assert top["statement"] == "SELECT * FROM users WHERE id = ?"
+    assert top["count"] == 25
+    assert top["latency_seconds"]["count"] == 25
+    assert entries[0][1]["event"] == "sql_aggregate"
+    assert instrumentation.stats() == {}  # New window
+
+
+def test_failed_statements_are_logged(engine, capture):
+    logger, entries = capture
+    instrumentation = instrument_engine(engine, logger=logger, report_interval=0)
+    with engine.connect() as conn:
+        with pytest.raises(sqlalchemy.exc.OperationalError):
+            conn.exec_driver_sql("SELECT * FROM missing")
+    instrumentation.remove()
+
+    level, entry = entries[-1]
+    assert level == logging.ERROR
+    assert entry["event"] == "sql_error"
+    (stats,) = instrumentation.stats().values()
+    assert stats["errors"] == 1